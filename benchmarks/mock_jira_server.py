@@ -0,0 +1,339 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the Jira REST API used by the benchmarks
+
+Implements the endpoints used by create_jira_tasks.py with in-memory storage,
+plus configurable latency, error rate and rate limiting (429) injection.
+"""
+
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+from urllib.parse import parse_qs, urlparse
+
+DEFAULT_ISSUE_TYPES = [("Task", False), ("Story", False), ("Bug", False), ("Epic", False), ("Sub-task", True)]
+LINK_TYPES = [("Blocks", "blocks", "is blocked by"), ("Relates", "relates to", "relates to")]
+
+class MockJiraState:
+    """Issues and counters shared by all request handler threads"""
+    
+    def __init__(self, latency: float = 0.0, latency_jitter: float = 0.0, error_rate: float = 0.0,
+                 rate_429: float = 0.0, retry_after: float = 0.1, seed: Optional[int] = None,
+                 issue_types: Optional[List[tuple]] = None):
+        """
+        Args:
+            latency: Seconds added to every response
+            latency_jitter: Extra random latency, uniformly distributed between 0 and this value
+            error_rate: Fraction of requests answered with a 500 error
+            rate_429: Fraction of requests answered with 429 Too Many Requests
+            retry_after: Retry-After value (seconds) sent with 429 responses
+            seed: Seed for the random generator (for reproducible runs)
+            issue_types: (name, is sub-task) pairs of every project (default: DEFAULT_ISSUE_TYPES)
+        """
+        self.latency = latency
+        self.latency_jitter = latency_jitter
+        self.error_rate = error_rate
+        self.rate_429 = rate_429
+        self.retry_after = retry_after
+        self.random = random.Random(seed)
+        self.issue_types = list(issue_types or DEFAULT_ISSUE_TYPES)
+        self.lock = threading.Lock()
+        self.issues = {}  # Maps issue keys to their fields
+        self.links = set()  # (link type, outward issue key, inward issue key) of the created links
+        self.counter = 0
+        self.requests = 0
+        self.responses = {}  # Maps status codes to their count
+    
+    def next_key(self, fields: Dict) -> str:
+        with self.lock:
+            self.counter += 1
+            project = (fields.get('project') or {}).get('key', 'PROJECT')
+            key = f"{project}-{self.counter}"
+            self.issues[key] = fields
+            return key
+    
+    def roll(self) -> Optional[int]:
+        """Decide whether the current request gets an injected error"""
+        with self.lock:
+            self.requests += 1
+            value = self.random.random()
+            delay = self.latency + self.random.uniform(0, self.latency_jitter)
+        time.sleep(delay)
+        if value < self.rate_429:
+            return 429
+        if value < self.rate_429 + self.error_rate:
+            return 500
+        return None
+    
+    def createmeta(self, project_key: str) -> Dict:
+        """createmeta document of a project (every project has the same issue types)"""
+        def field(name: str, required: bool = False, default: bool = False, custom: Optional[str] = None) -> Dict:
+            schema = {"custom": custom} if custom else {}
+            return {"name": name, "required": required, "hasDefaultValue": default, "schema": schema}
+        
+        issue_types = []
+        for number, (name, subtask) in enumerate(self.issue_types, start=1):
+            issue_types.append({"id": str(10000 + number), "name": name, "subtask": subtask, "fields": {
+                "summary": field("Summary", required=True),
+                "issuetype": field("Issue Type", required=True),
+                "project": field("Project", required=True),
+                "description": field("Description"),
+                "assignee": field("Assignee"),
+                "reporter": field("Reporter", required=True, default=True),
+                "parent": field("Parent", required=subtask),
+                "labels": field("Labels"),
+                "components": field("Components"),
+                "customfield_10020": field("Sprint", custom="com.pyxis.greenhopper.jira:gh-sprint"),
+            }})
+        return {"projects": [{"key": project_key, "issuetypes": issue_types}]}
+    
+    def count(self, status: int):
+        with self.lock:
+            self.responses[status] = self.responses.get(status, 0) + 1
+
+class MockJiraHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server_version = "MockJira/1.0"
+    disable_nagle_algorithm = True  # Headers and body are written separately
+    
+    def log_message(self, format, *args):
+        pass
+    
+    @property
+    def state(self) -> MockJiraState:
+        return self.server.state
+    
+    def send_json(self, status: int, body=None, headers: Optional[Dict] = None):
+        data = b"" if body is None or status == 304 else json.dumps(body).encode('utf-8')
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+        self.state.count(status)
+    
+    def read_json(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        data = self.rfile.read(length) if length else b""
+        return json.loads(data) if data else None
+    
+    def handle_method(self, method: str):
+        body = self.read_json() if method in ("POST", "PUT") else None
+        injected = self.state.roll()
+        if injected == 429:
+            return self.send_json(429, {"errorMessages": ["Rate limit exceeded."]},
+                                  {"Retry-After": str(self.state.retry_after)})
+        if injected:
+            return self.send_json(injected, {"errorMessages": ["Injected server error."]})
+        
+        url = urlparse(self.path)
+        path = url.path
+        query = parse_qs(url.query)
+        handler = getattr(self, f"{method.lower()}_{self.route(path)}", None)
+        if handler is None:
+            return self.send_json(404, {"errorMessages": [f"No mock for {method} {path}"]})
+        handler(path, query, body)
+    
+    @staticmethod
+    def route(path: str) -> str:
+        if path.endswith("/issue/createmeta"):
+            return "createmeta"
+        if path.endswith("/user/search"):
+            return "user_search"
+        if path.endswith("/issue/bulk"):
+            return "issue_bulk"
+        if path.endswith("/search"):
+            return "search"
+        if path.endswith("/issueLink"):
+            return "issue_link"
+        if path.endswith("/issueLinkType"):
+            return "issue_link_type"
+        if path.endswith("/issue"):
+            return "issue"
+        if re.search(r"/issue/[^/]+$", path):
+            return "issue_key"
+        return "unknown"
+    
+    def do_GET(self):
+        self.handle_method("GET")
+    
+    def do_POST(self):
+        self.handle_method("POST")
+    
+    def do_PUT(self):
+        self.handle_method("PUT")
+    
+    def do_DELETE(self):
+        self.handle_method("DELETE")
+    
+    def get_user_search(self, path, query, body):
+        email = query.get("query", [""])[0]
+        self.send_json(200, [{"accountId": f"mock-{email}", "emailAddress": email}])
+    
+    def get_createmeta(self, path, query, body):
+        project_key = query.get("projectKeys", ["PROJECT"])[0]
+        meta = self.state.createmeta(project_key)
+        etag = '"' + hashlib.sha1(json.dumps(meta, sort_keys=True).encode('utf-8')).hexdigest() + '"'
+        if self.headers.get("If-None-Match") == etag:
+            return self.send_json(304, headers={"ETag": etag})
+        self.send_json(200, meta, {"ETag": etag})
+    
+    def issue_errors(self, fields: Dict) -> Dict:
+        """Field errors Jira would report for the fields of a new issue (empty if it can be created)"""
+        issue_type = (fields.get("issuetype") or {}).get("name")
+        if issue_type not in [name for name, _ in self.state.issue_types]:
+            return {"issuetype": "Specify a valid issue type"}
+        return {}
+    
+    def post_issue(self, path, query, body):
+        errors = self.issue_errors(body["fields"])
+        if errors:
+            return self.send_json(400, {"errorMessages": [], "errors": errors})
+        key = self.state.next_key(body["fields"])
+        self.send_json(201, {"id": key.rsplit("-", 1)[1], "key": key, "self": f"/rest/api/3/issue/{key}"})
+    
+    def post_issue_bulk(self, path, query, body):
+        issues = []
+        errors = []
+        for number, update in enumerate(body.get("issueUpdates", [])):
+            element_errors = self.issue_errors(update["fields"])
+            if element_errors:
+                errors.append({"status": 400, "elementErrors": {"errorMessages": [], "errors": element_errors},
+                               "failedElementNumber": number})
+                continue
+            key = self.state.next_key(update["fields"])
+            issues.append({"id": key.rsplit("-", 1)[1], "key": key, "self": f"/rest/api/3/issue/{key}"})
+        # 201 when at least one issue was created, 400 when all of them failed
+        self.send_json(400 if errors and not issues else 201, {"issues": issues, "errors": errors})
+    
+    def get_issue_link_type(self, path, query, body):
+        self.send_json(200, {"issueLinkTypes": [
+            {"id": str(10000 + number), "name": name, "outward": outward, "inward": inward}
+            for number, (name, outward, inward) in enumerate(LINK_TYPES)
+        ]})
+    
+    def post_issue_link(self, path, query, body):
+        link_type = body["type"]["name"]
+        outward, inward = body["outwardIssue"]["key"], body["inwardIssue"]["key"]
+        if link_type not in [name for name, _, _ in LINK_TYPES]:
+            return self.send_json(404, {"errorMessages": [f"No issue link type with name '{link_type}' found."]})
+        with self.state.lock:
+            found = outward in self.state.issues and inward in self.state.issues
+            if found:
+                self.state.links.add((link_type, outward, inward))  # An existing link is not duplicated
+        if not found:
+            return self.send_json(404, {"errorMessages": ["Issue does not exist"]})
+        self.send_json(201)
+    
+    def put_issue_key(self, path, query, body):
+        key = path.rsplit("/", 1)[1]
+        with self.state.lock:
+            fields = self.state.issues.get(key)
+            if fields is not None:
+                fields.update((body or {}).get("fields", {}))
+        if fields is None:
+            return self.send_json(404, {"errorMessages": ["Issue does not exist"]})
+        self.send_json(204)
+    
+    def delete_issue_key(self, path, query, body):
+        key = path.rsplit("/", 1)[1]
+        delete_subtasks = query.get("deleteSubtasks", ["false"])[0] == "true"
+        subtask_types = {name for name, subtask in self.state.issue_types if subtask}
+        with self.state.lock:
+            found = key in self.state.issues
+            subtasks = [child for child, fields in self.state.issues.items()
+                        if (fields.get("parent") or {}).get("key") == key
+                        and (fields.get("issuetype") or {}).get("name") in subtask_types]
+            if found and (delete_subtasks or not subtasks):
+                for child in [key] + subtasks:
+                    del self.state.issues[child]
+        if not found:
+            return self.send_json(404, {"errorMessages": ["Issue does not exist"]})
+        if subtasks and not delete_subtasks:
+            return self.send_json(400, {"errorMessages": [
+                "You must specify the 'deleteSubtasks' parameter to delete this issue and all its subtasks."]})
+        self.send_json(204)
+    
+    def get_search(self, path, query, body):
+        start_at = int(query.get("startAt", ["0"])[0])
+        max_results = int(query.get("maxResults", ["50"])[0])
+        project = re.search(r'project\s*=\s*"?([A-Za-z0-9_]+)', query.get("jql", [""])[0])
+        with self.state.lock:
+            items = list(self.state.issues.items())
+        if project:
+            items = [(key, fields) for key, fields in items if key.rsplit("-", 1)[0] == project.group(1)]
+        page = []
+        for key, fields in items[start_at:start_at + max_results]:
+            issue_type = fields.get("issuetype") or {}
+            page.append({"key": key, "fields": {
+                "summary": fields.get("summary"),
+                "description": fields.get("description"),
+                "parent": fields.get("parent"),
+                "issuetype": dict(issue_type, subtask=issue_type.get("name", "").lower() in ("sub-task", "subtask")),
+            }})
+        self.send_json(200, {"startAt": start_at, "maxResults": max_results,
+                             "total": len(items), "issues": page})
+
+class MockHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 1024  # The default backlog of 5 drops connections of highly concurrent clients
+
+class MockJiraServer:
+    """Runs the mock Jira API on a background thread"""
+    
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, **options):
+        """
+        Args:
+            host: Interface to listen on
+            port: Port to listen on (0: any free port)
+            **options: Options passed to MockJiraState (latency, error_rate, rate_429, ...)
+        """
+        self.state = MockJiraState(**options)
+        self.httpd = MockHTTPServer((host, port), MockJiraHandler)
+        self.httpd.state = self.state
+        self.thread = None
+    
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+    
+    def start(self) -> "MockJiraServer":
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+    
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+    
+    def __enter__(self):
+        return self.start()
+    
+    def __exit__(self, *exc_info):
+        self.stop()
+
+if __name__ == "__main__":
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Run a local mock of the Jira REST API")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--latency", type=float, default=0.05, help="Seconds added to every response")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of 500 responses")
+    parser.add_argument("--rate-429", type=float, default=0.0, help="Fraction of 429 responses")
+    args = parser.parse_args()
+    
+    server = MockJiraServer(port=args.port, latency=args.latency, error_rate=args.error_rate,
+                            rate_429=args.rate_429)
+    print(f"Mock Jira listening on {server.url} (Ctrl-C to stop)")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,325 @@
+#!/usr/bin/env python3
+"""
+Benchmarks for the Jira task creator
+
+Runs the tasks file parser, payload building, the creation engines and the full command line
+tool against a local mock Jira server and writes a JSON report with parse
+time, issues/sec, request latency percentiles and peak memory use.
+
+Every scenario runs in its own process so peak RSS is measured per scenario.
+
+Usage:
+    python benchmarks/run_benchmarks.py --sizes 10,1000,10000 --output report.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from multiprocessing import get_context
+from typing import Dict, List, Optional
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(BENCHMARK_DIR)
+sys.path.insert(0, REPO_DIR)
+sys.path.insert(0, BENCHMARK_DIR)
+
+import create_jira_tasks as jira  # noqa: E402
+from mock_jira_server import MockJiraServer  # noqa: E402
+
+REPORT_VERSION = 1
+SCENARIOS = ("parse", "payload", "pipeline", "concurrent", "bulk", "async", "cli")
+
+def generate_tasks_file(path: str, count: int, fanout: int = 0, description_lines: int = 3,
+                        assignees: int = 0) -> Dict:
+    """
+    Write a synthetic tasks file
+    
+    Args:
+        path: Path of the file to write
+        count: Total number of tasks (parents and subtasks)
+        fanout: Number of subtasks (PARENT-n) following each parent task
+        description_lines: Number of description lines per task
+        assignees: Number of distinct ASSIGNEE emails spread over the tasks (0: none)
+    
+    Returns:
+        Dictionary with the number of 'parents' and 'subtasks' written and the file 'bytes'
+    """
+    parents = subtasks = 0
+    with open(path, 'w', encoding='utf-8') as f:
+        while parents + subtasks < count:
+            parents += 1
+            tasks = [(f"Task {parents}", None)]
+            for child in range(min(fanout, count - parents - subtasks)):
+                tasks.append((f"Task {parents}.{child + 1}", parents))
+            for summary, parent_ref in tasks:
+                if parent_ref:
+                    subtasks += 1
+                    f.write(f"PARENT: PARENT-{parent_ref}\n")
+                if assignees:
+                    f.write(f"ASSIGNEE: user{(parents + subtasks) % assignees}@example.com\n")
+                f.write(f"{summary}\n")
+                for line in range(description_lines):
+                    f.write(f"Description line {line + 1} of {summary}, with some filler text to parse.\n")
+                f.write("---\n")
+    return {"parents": parents, "subtasks": subtasks, "bytes": os.path.getsize(path)}
+
+def percentile(values: List[float], pct: float) -> Optional[float]:
+    """Nearest-rank percentile of a list of values (None if empty)"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, int(round(pct / 100.0 * len(ordered) + 0.5)) - 1))
+    return ordered[rank]
+
+def peak_rss_mb() -> Optional[float]:
+    """Peak resident set size of the current process in MB (None where unsupported)"""
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+class TimedJiraClient(jira.JiraClient):
+    """JiraClient recording the latency of every request (retries included)"""
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.latencies = []
+        self.latency_lock = threading.Lock()
+    
+    def request(self, method: str, path: str, **kwargs):
+        start = time.perf_counter()
+        try:
+            return super().request(method, path, **kwargs)
+        finally:
+            elapsed = time.perf_counter() - start
+            with self.latency_lock:
+                self.latencies.append(elapsed)
+
+def latency_stats(latencies: List[float]) -> Dict:
+    """Request count and p50/p99 latency in milliseconds"""
+    def ms(value):
+        return None if value is None else round(value * 1000, 2)
+    return {"requests": len(latencies), "p50_ms": ms(percentile(latencies, 50)),
+            "p99_ms": ms(percentile(latencies, 99))}
+
+def bench_parse(tasks_file: str, options: Dict) -> Dict:
+    """Time parsing the whole tasks file"""
+    start = time.perf_counter()
+    tasks = jira.parse_tasks_file(tasks_file)
+    elapsed = time.perf_counter() - start
+    return {"tasks": len(tasks), "parse_seconds": round(elapsed, 4),
+            "tasks_per_sec": round(len(tasks) / elapsed, 1) if elapsed else None}
+
+def bench_payload(tasks_file: str, options: Dict) -> Dict:
+    """Time building and serializing the create request of every task (no HTTP)"""
+    tasks = jira.parse_tasks_file(tasks_file)
+    start = time.perf_counter()
+    size = 0
+    for task in tasks:
+        fields = jira.build_issue_fields(task['summary'], task['description'], "bench-account",
+                                         parent_key="BENCH-1" if jira.is_subtask(task) else None,
+                                         project_key="BENCH")
+        size += len(jira.encode_json({"fields": fields}))
+    elapsed = time.perf_counter() - start
+    return {"tasks": len(tasks), "payload_seconds": round(elapsed, 4),
+            "payloads_per_sec": round(len(tasks) / elapsed, 1) if elapsed else None,
+            "payload_bytes": size, "json_encoder": "orjson" if jira.orjson else "json"}
+
+def bench_pipeline(tasks_file: str, options: Dict) -> Dict:
+    """Time parsing the file and encoding every payload with the process pool (iter_tasks_parallel)"""
+    processes = options["parse_workers"] or os.cpu_count() or 1
+    start = time.perf_counter()
+    count = 0
+    size = 0
+    for task in jira.iter_tasks_parallel(tasks_file, processes):
+        prepared = task.get('payload') or jira.prepare_issue_payload(task)
+        size += len(prepared)
+        count += 1
+    elapsed = time.perf_counter() - start
+    return {"tasks": count, "pipeline_seconds": round(elapsed, 4),
+            "tasks_per_sec": round(count / elapsed, 1) if elapsed else None,
+            "processes": processes, "payload_bytes": size}
+
+def bench_create(tasks_file: str, options: Dict, bulk: bool) -> Dict:
+    """Create every task of the file in the mock Jira with one of the creation engines"""
+    server_options = options["server"]
+    with MockJiraServer(**server_options) as server:
+        client = TimedJiraClient(base_url=server.url, email="bench@example.com", api_token="token",
+                                 project_key="BENCH", pool_size=max(options["workers"], 10))
+        quiet = lambda message: None  # noqa: E731
+        start = time.perf_counter()
+        with client:
+            if bulk:
+                tasks = jira.parse_tasks_file(tasks_file)
+                outcome = jira.create_issues_in_bulk(tasks, max_workers=options["workers"], log=quiet,
+                                                     client=client)
+            else:
+                outcome = jira.create_issues_concurrently(jira.iter_tasks(tasks_file),
+                                                          max_workers=options["workers"], log=quiet,
+                                                          client=client)
+        elapsed = time.perf_counter() - start
+        responses = dict(server.state.responses)
+    
+    created = len(outcome["created_issues"])
+    result = {"tasks": len(outcome["results"]), "created": created, "failed": len(outcome["failed_issues"]),
+              "seconds": round(elapsed, 4), "issues_per_sec": round(created / elapsed, 1) if elapsed else None,
+              "responses": {str(status): count for status, count in sorted(responses.items())}}
+    result.update(latency_stats(client.latencies))
+    return result
+
+def bench_async(tasks_file: str, options: Dict) -> Dict:
+    """Create every task of the file in the mock Jira with the asyncio client"""
+    import asyncio
+    import create_jira_tasks_async as jira_async
+    
+    if jira_async.available_backend() is None:
+        return {"skipped": "aiohttp or httpx is not installed"}
+    
+    # Keep every latency (attempts, not retried requests) for exact percentiles
+    metrics = jira.RunMetrics(window=sys.maxsize)
+    
+    async def run(url):
+        async with jira_async.AsyncJiraClient(url, "bench@example.com", "token", "BENCH",
+                                              concurrency=options["concurrency"], metrics=metrics) as client:
+            start = time.perf_counter()
+            outcome = await jira_async.create_issues_async(jira.iter_tasks(tasks_file), client,
+                                                           log=lambda message: None)
+            return outcome, time.perf_counter() - start, client.backend
+    
+    with MockJiraServer(**options["server"]) as server:
+        outcome, elapsed, backend = asyncio.run(run(server.url))
+        responses = dict(server.state.responses)
+    
+    created = len(outcome["created_issues"])
+    result = {"tasks": len(outcome["results"]), "created": created, "failed": len(outcome["failed_issues"]),
+              "backend": backend, "seconds": round(elapsed, 4),
+              "issues_per_sec": round(created / elapsed, 1) if elapsed else None,
+              "responses": {str(status): count for status, count in sorted(responses.items())}}
+    latencies = [latency for stats in metrics.endpoints.values() for latency in stats['latencies']]
+    result.update(latency_stats(latencies))
+    return result
+
+def bench_cli(tasks_file: str, options: Dict) -> Dict:
+    """Run create_jira_tasks.py end to end (main()) against the mock Jira"""
+    with MockJiraServer(**options["server"]) as server, tempfile.TemporaryDirectory() as tmp:
+        env = dict(os.environ, JIRA_BASE_URL=server.url, JIRA_PROJECT_KEY="BENCH", JIRA_API_TOKEN="token",
+                   JIRA_EMAIL="bench@example.com", TASKS_FILE=tasks_file,
+                   JIRA_USER_CACHE=os.path.join(tmp, "users.json"),
+                   JIRA_METADATA_CACHE=os.path.join(tmp, "createmeta.json"),
+                   JIRA_ISSUE_STORE=os.path.join(tmp, "issues.db"))
+        command = [sys.executable, os.path.join(REPO_DIR, "create_jira_tasks.py"), "--no-journal",
+                   "--workers", str(options["workers"])]
+        start = time.perf_counter()
+        completed = subprocess.run(command, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+        elapsed = time.perf_counter() - start
+        created = server.state.counter
+    
+    try:
+        import resource
+        child_rss = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+        child_rss = round(child_rss / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+    except ImportError:
+        child_rss = None
+    return {"exit_code": completed.returncode, "created": created, "seconds": round(elapsed, 4),
+            "issues_per_sec": round(created / elapsed, 1) if elapsed else None,
+            "cli_peak_rss_mb": child_rss,
+            "stderr": completed.stderr.decode('utf-8', 'replace')[-2000:] or None}
+
+def run_scenario(scenario: str, tasks_file: str, options: Dict) -> Dict:
+    """Run one scenario (called in a fresh process)"""
+    if scenario == "parse":
+        result = bench_parse(tasks_file, options)
+    elif scenario == "payload":
+        result = bench_payload(tasks_file, options)
+    elif scenario == "pipeline":
+        result = bench_pipeline(tasks_file, options)
+    elif scenario == "cli":
+        result = bench_cli(tasks_file, options)
+    elif scenario == "async":
+        result = bench_async(tasks_file, options)
+    else:
+        result = bench_create(tasks_file, options, bulk=scenario == "bulk")
+    result["peak_rss_mb"] = peak_rss_mb()
+    return result
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the Jira task creator against a local mock Jira")
+    parser.add_argument("--sizes", default="10,1000,10000",
+                        help="Comma separated numbers of tasks to generate (default: 10,1000,10000)")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS),
+                        help=f"Comma separated scenarios to run (default: {','.join(SCENARIOS)})")
+    parser.add_argument("--fanout", type=int, default=5, help="Subtasks per parent task (default: 5)")
+    parser.add_argument("--description-lines", type=int, default=3, help="Description lines per task (default: 3)")
+    parser.add_argument("--assignees", type=int, default=0, help="Distinct ASSIGNEE emails in the file (default: 0)")
+    parser.add_argument("--workers", type=int, default=jira.MAX_WORKERS,
+                        help=f"Issues created in parallel (default: {jira.MAX_WORKERS})")
+    parser.add_argument("--parse-workers", type=int, default=0,
+                        help="Processes of the pipeline scenario (default: 0, one per CPU)")
+    parser.add_argument("--concurrency", type=int, default=64,
+                        help="Requests in flight for the async scenario (default: 64)")
+    parser.add_argument("--latency", type=float, default=0.02, help="Mock server latency in seconds (default: 0.02)")
+    parser.add_argument("--latency-jitter", type=float, default=0.01, help="Extra random latency in seconds (default: 0.01)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of 500 responses (default: 0)")
+    parser.add_argument("--rate-429", type=float, default=0.0, help="Fraction of 429 responses (default: 0)")
+    parser.add_argument("--retry-after", type=float, default=0.1, help="Retry-After sent with 429 responses (default: 0.1)")
+    parser.add_argument("--seed", type=int, default=1, help="Seed for the injected errors (default: 1)")
+    parser.add_argument("--output", help="Write the JSON report to this file instead of stdout")
+    args = parser.parse_args()
+    
+    sizes = [int(size) for size in args.sizes.split(",") if size.strip()]
+    scenarios = [name.strip() for name in args.scenarios.split(",") if name.strip()]
+    unknown = [name for name in scenarios if name not in SCENARIOS]
+    if unknown:
+        parser.error(f"unknown scenario(s): {', '.join(unknown)}")
+    
+    options = {
+        "workers": args.workers,
+        "parse_workers": args.parse_workers,
+        "concurrency": args.concurrency,
+        "server": {"latency": args.latency, "latency_jitter": args.latency_jitter, "error_rate": args.error_rate,
+                   "rate_429": args.rate_429, "retry_after": args.retry_after, "seed": args.seed},
+    }
+    report = {
+        "version": REPORT_VERSION,
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "config": dict(options, sizes=sizes, fanout=args.fanout, description_lines=args.description_lines,
+                       assignees=args.assignees),
+        "results": [],
+    }
+    
+    context = get_context("spawn")
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in sizes:
+            tasks_file = os.path.join(tmp, f"tasks_{size}.txt")
+            generated = generate_tasks_file(tasks_file, size, fanout=args.fanout,
+                                            description_lines=args.description_lines, assignees=args.assignees)
+            for scenario in scenarios:
+                print(f"Running {scenario} with {size} task(s)...", file=sys.stderr)
+                # Not a multiprocessing.Pool: its daemonic workers cannot start the pipeline's processes
+                with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+                    result = executor.submit(run_scenario, scenario, tasks_file, options).result()
+                report["results"].append(dict({"scenario": scenario, "size": size}, file=generated, **result))
+    
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(output + "\n")
+        print(f"Report written to {args.output}", file=sys.stderr)
+    else:
+        print(output)
+
+if __name__ == "__main__":
+    main()
@@ -6,23 +6,87 @@ Script to create Jira tasks via REST API
 import requests
 import json
 import base64
+import csv
 import os
 import sys
-from typing import List, Dict, Optional
+import argparse
+import io
+import itertools
+import threading
+import time
+import queue
+import random
+import re
+import signal
+from collections import deque
+from datetime import datetime, timezone
+from functools import lru_cache
+from email.utils import parsedate_to_datetime
+from requests.adapters import HTTPAdapter
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import Callable, Iterable, Iterator, List, Dict, Optional, Tuple, Union
+
+# Optional dependency: faster JSON encoding of request payloads
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Tasks file readers, task index, run journal, issue store and scheduler have their own modules;
+# their names are also available from this one (from create_jira_tasks import ...)
+from jira_issue_store import ISSUE_STORE_FILE, STORE_BATCH_SIZE, STORE_FLUSH_INTERVAL, IssueStore, export_issues
+from jira_run_journal import (JOURNAL_SUFFIX, JOURNAL_FSYNC_EVERY, JOURNAL_FSYNC_INTERVAL, RunJournal,
+                              TaskFingerprinter, task_fingerprints)
+from jira_task_index import INDEX_SUFFIX, INDEX_BLOCK_SIZE, TaskIndex, TaskList, open_task_index
+from jira_task_readers import (
+    DEFAULT_LINK_TYPE, DEFAULT_LINK_TYPES, ISSUE_TYPES, ISSUE_KEY_PATTERN, TASK_READERS, TaskFileError, TaskReader,
+    TextTaskReader, CsvTaskReader, JsonLinesTaskReader, YamlTaskReader, add_task_components, add_task_labels,
+    apply_task_directive, check_tasks_file, is_subtask, iter_tasks, new_task, parse_task_lines, parse_task_link,
+    parse_tasks_file, read_task_directive, register_task_reader, set_task_parent, task_from_record, task_reader,
+)
+from jira_task_scheduler import TaskGraph, TaskScheduler
 
 # Configuration - Can be set via environment variables or updated here
 JIRA_BASE_URL = os.getenv("JIRA_BASE_URL", "https://your-domain.atlassian.net")
 PROJECT_KEY = os.getenv("JIRA_PROJECT_KEY", "PROJECT")  # Default project key
 API_TOKEN = os.getenv("JIRA_API_TOKEN", "YOUR_API_TOKEN_HERE")
 EMAIL = os.getenv("JIRA_EMAIL", "your-email@example.com")  # Your Jira email address (needed for authentication)
-TASKS_FILE = os.getenv("TASKS_FILE", "tasks.txt")  # Path to the tasks file
+TASKS_FILE = os.getenv("TASKS_FILE", "tasks.txt")  # Path to the tasks file (.txt, .csv, .jsonl or .yaml)
+MAX_WORKERS = int(os.getenv("JIRA_MAX_WORKERS", "8"))  # Number of issues created in parallel
+PARSE_WORKERS = int(os.getenv("JIRA_PARSE_WORKERS", "1"))  # Processes parsing the tasks file (0: one per CPU)
+BULK_BATCH_SIZE = 50  # Maximum number of issues Jira accepts per bulk create request
+REQUEST_TIMEOUT = float(os.getenv("JIRA_REQUEST_TIMEOUT", "30"))  # Seconds before a request is abandoned
+MAX_RETRIES = int(os.getenv("JIRA_MAX_RETRIES", "5"))  # Retries for throttled or transient failures
+BACKOFF_BASE = 0.5  # Seconds - first retry waits up to this long, doubling on every attempt
+BACKOFF_MAX = 60.0  # Seconds - upper bound for a single backoff delay
+THROTTLE_STATUS_CODES = (429, 503)  # Jira is asking us to slow down
+TRANSIENT_STATUS_CODES = (502, 504)  # Gateway errors, only retried for idempotent requests
+IDEMPOTENT_METHODS = ("GET", "HEAD", "PUT", "DELETE", "OPTIONS")
+SEARCH_PAGE_SIZE = 100  # Issues fetched per JQL search request
+USER_CACHE_FILE = os.getenv("JIRA_USER_CACHE", os.path.join(os.path.expanduser("~"), ".jira_task_creator", "users.json"))
+USER_CACHE_TTL = float(os.getenv("JIRA_USER_CACHE_TTL", str(7 * 24 * 3600)))  # Seconds an account ID stays cached
+METADATA_CACHE_FILE = os.getenv("JIRA_METADATA_CACHE", os.path.join(os.path.expanduser("~"), ".jira_task_creator", "createmeta.json"))
+METADATA_CACHE_TTL = float(os.getenv("JIRA_METADATA_CACHE_TTL", str(24 * 3600)))  # Seconds before cached project metadata is revalidated
+SUMMARY_MAX_LENGTH = 255  # Longest summary Jira accepts
+TASK_FIELDS = ("project", "issuetype", "summary", "description", "parent", "assignee", "labels", "components")  # Fields set from the tasks file
+SPRINT_FIELD = os.getenv("JIRA_SPRINT_FIELD", "customfield_10020")  # Sprint field ID, when createmeta does not name it
+SPRINT_FIELD_SCHEMA = "com.pyxis.greenhopper.jira:gh-sprint"  # Custom field type of the Sprint field
+METRICS_WINDOW = 500  # Latest request latencies kept per endpoint for the p50/p95 figures
+METRICS_RATE_WINDOW = 200  # Latest finished tasks used to compute issues/sec and the ETA
+STATUS_INTERVAL = 0.5  # Seconds between two refreshes of the CLI status line
+DRAIN_TIMEOUT = float(os.getenv("JIRA_DRAIN_TIMEOUT", "30"))  # Seconds a cancelled run waits for requests already sent
+CONTROL_POLL_INTERVAL = 0.5  # Seconds between two checks for pause, resume or cancel while waiting
+ADF_CACHE_SIZE = 4096  # Converted descriptions kept in memory (generated imports repeat them a lot)
+PARSE_CHUNK_BYTES = 4 * 1024 * 1024  # Size of the pieces a tasks file is split into for parallel parsing
 
-def get_auth_headers():
+def get_auth_headers(email: Optional[str] = None, api_token: Optional[str] = None):
     """Get authentication headers for API requests"""
-    if EMAIL:
-        auth_string = f"{EMAIL}:{API_TOKEN}"
+    email = EMAIL if email is None else email
+    api_token = API_TOKEN if api_token is None else api_token
+    if email:
+        auth_string = f"{email}:{api_token}"
     else:
-        auth_string = f"api_token:{API_TOKEN}"
+        auth_string = f"api_token:{api_token}"
     
     auth_bytes = auth_string.encode('ascii')
     auth_b64 = base64.b64encode(auth_bytes).decode('ascii')
@@ -33,373 +97,3417 @@ def get_auth_headers():
         "Authorization": f"Basic {auth_b64}"
     }
 
-def get_user_account_id(email: str) -> Optional[str]:
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
     """
-    Get Jira user account ID from email address
+    Parse a Retry-After header
     
     Args:
-        email: User's email address
+        value: Header value, either a number of seconds or an HTTP date
     
     Returns:
-        Account ID if found, None otherwise
+        Number of seconds to wait, or None if the header is missing or invalid
     """
-    url = f"{JIRA_BASE_URL}/rest/api/3/user/search"
-    headers = get_auth_headers()
-    params = {"query": email}
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+def parse_reset_time(value: Optional[str]) -> Optional[float]:
+    """
+    Parse an X-RateLimit-Reset header
     
+    Args:
+        value: ISO 8601 timestamp or number of seconds
+    
+    Returns:
+        Seconds until the rate limit window resets, or None if unknown
+    """
+    if not value:
+        return None
     try:
-        response = requests.get(url, headers=headers, params=params)
-        response.raise_for_status()
-        users = response.json()
-        
-        if users and len(users) > 0:
-            # Find exact email match
-            for user in users:
-                if user.get('emailAddress', '').lower() == email.lower():
-                    return user.get('accountId')
-            # If no exact match, return first result
-            if users[0].get('accountId'):
-                return users[0].get('accountId')
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        reset_at = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
         return None
-    except requests.exceptions.RequestException as e:
-        print(f"Error getting user account ID: {e}")
-        if hasattr(e, 'response') and hasattr(e.response, 'text'):
-            print(f"Response: {e.response.text}")
+    if reset_at.tzinfo is None:
+        reset_at = reset_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (reset_at - datetime.now(timezone.utc)).total_seconds())
+
+def backoff_delay(attempt: int) -> float:
+    """Exponential backoff with full jitter for the given retry attempt (0-based)"""
+    return random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * (2 ** attempt)))
+
+class RateLimiter:
+    """
+    Schedules requests so a run stays within the rate Jira allows.
+    
+    Combines a token bucket, sized from the X-RateLimit-* headers Jira sends
+    back, with an adaptive concurrency limit: every throttled response halves
+    the number of requests allowed in flight and pauses new requests for the
+    Retry-After period, and every window of successful requests raises the
+    limit by one again (up to max_concurrency).
+    
+    acquire() blocks the calling thread; event loops use try_acquire() and
+    wait on their own (see create_jira_tasks_async.AsyncJiraClient), the
+    state of the limiter is the same.
+    """
+    
+    def __init__(self, max_concurrency: int = MAX_WORKERS, rate: Optional[float] = None,
+                 capacity: Optional[float] = None):
+        """
+        Args:
+            max_concurrency: Highest number of requests allowed in flight
+            rate: Requests per second (None: unlimited until Jira reports a limit)
+            capacity: Size of the token bucket (default: one second worth of requests)
+        """
+        self._condition = threading.Condition()
+        self.max_concurrency = max(1, max_concurrency)
+        self.concurrency = self.max_concurrency
+        self.in_flight = 0
+        self.rate = rate
+        self.capacity = capacity or rate or 0
+        self._tokens = self.capacity
+        self._last_refill = time.monotonic()
+        self._paused_until = 0.0
+        self._successes = 0
+    
+    def _refill(self, now: float):
+        if self.rate:
+            self._tokens = min(self.capacity, self._tokens + (now - self._last_refill) * self.rate)
+        self._last_refill = now
+    
+    def _try_acquire(self) -> Optional[float]:
+        now = time.monotonic()
+        if now < self._paused_until:
+            return self._paused_until - now
+        if self.in_flight >= self.concurrency:
+            return None
+        self._refill(now)
+        if self.rate and self._tokens < 1:
+            return (1 - self._tokens) / self.rate
+        if self.rate:
+            self._tokens -= 1
+        self.in_flight += 1
+        return 0
+    
+    def try_acquire(self) -> Optional[float]:
+        """
+        Take the right to send a request if it may be sent now, without blocking
+        
+        Returns:
+            0 if the request may be sent (call release() once it finished), otherwise
+            the seconds to wait before trying again (None: until a request is released)
+        """
+        with self._condition:
+            return self._try_acquire()
+    
+    def acquire(self):
+        """Block until a request may be sent"""
+        with self._condition:
+            while True:
+                delay = self._try_acquire()
+                if delay == 0:
+                    return
+                self._condition.wait(delay)
+    
+    def release(self, success: bool = True):
+        """Signal that a request acquired with acquire() has finished"""
+        with self._condition:
+            self.in_flight -= 1
+            if success and self.concurrency < self.max_concurrency:
+                self._successes += 1
+                # Additive increase: one more slot per full window of successful requests
+                if self._successes >= self.concurrency:
+                    self._successes = 0
+                    self.concurrency += 1
+            self._condition.notify_all()
+    
+    def throttled(self, delay: float):
+        """
+        Record that Jira throttled a request
+        
+        Args:
+            delay: Seconds to wait before sending anything else
+        """
+        with self._condition:
+            now = time.monotonic()
+            # Responses to requests that were already in flight belong to the same
+            # throttling event and must not shrink the concurrency limit again
+            if now >= self._paused_until:
+                self.concurrency = max(1, self.concurrency // 2)
+                self._successes = 0
+            self._paused_until = max(self._paused_until, now + delay)
+            self._condition.notify_all()
+    
+    def update_from_headers(self, headers):
+        """
+        Size the token bucket from the X-RateLimit-* headers of a response
+        
+        Args:
+            headers: Response headers
+        """
+        limit = headers.get("X-RateLimit-Limit")
+        if not limit:
+            return
+        try:
+            limit = float(limit)
+            remaining = headers.get("X-RateLimit-Remaining")
+            remaining = float(remaining) if remaining is not None else None
+            fill_rate = headers.get("X-RateLimit-FillRate")
+            interval = float(headers.get("X-RateLimit-Interval-Seconds") or 1)
+        except ValueError:
+            return
+        
+        rate = None
+        if fill_rate:
+            try:
+                rate = float(fill_rate) / max(interval, 0.001)
+            except ValueError:
+                rate = None
+        if rate is None:
+            reset = parse_reset_time(headers.get("X-RateLimit-Reset"))
+            if reset and remaining is not None:
+                rate = max(remaining, 1) / max(reset, 1)
+            else:
+                rate = limit / max(interval, 0.001)
+        
+        with self._condition:
+            self._refill(time.monotonic())
+            if self.rate is None:
+                self._tokens = limit
+            self.rate = rate
+            self.capacity = limit
+            if remaining is not None:
+                self._tokens = min(self._tokens, remaining)
+            self._tokens = min(self._tokens, self.capacity)
+
+def percentile(values: List[float], pct: float) -> Optional[float]:
+    """Nearest-rank percentile of a list of values (None if empty)"""
+    if not values:
         return None
+    ordered = sorted(values)
+    rank = int(round(pct / 100.0 * len(ordered) + 0.5)) - 1
+    return ordered[max(0, min(len(ordered) - 1, rank))]
+
+def endpoint_name(method: str, path: str) -> str:
+    """Group a request under its endpoint name, e.g. PUT /rest/api/3/issue/{key}"""
+    path = path.split("?", 1)[0]
+    path = re.sub(r"/issue/(?!(?:bulk|createmeta)$)[^/]+", "/issue/{key}", path)
+    return f"{method.upper()} {path}"
 
-def delete_jira_issue(issue_key: str) -> bool:
+class RunMetrics:
     """
-    Delete a Jira issue
+    Live statistics of a run, shared by all worker threads.
+    
+    JiraClient reports every request (in flight, latency, status, retries)
+    and RunResults reports every finished task. snapshot() turns that into
+    throughput, rolling p50/p95 latency per endpoint and an ETA, for the CLI
+    status line, the GUI progress panel and the JSON dump at the end.
+    """
+    
+    def __init__(self, window: int = METRICS_WINDOW, rate_window: int = METRICS_RATE_WINDOW):
+        """
+        Args:
+            window: Latest request latencies kept per endpoint
+            rate_window: Latest finished tasks used for issues/sec and the ETA
+        """
+        self._lock = threading.Lock()
+        self.window = window
+        self.started = time.monotonic()
+        self.in_flight = 0
+        self.endpoints = {}  # Maps endpoint names to their counters and latencies
+        self.tasks_total = 0
+        self.total_known = False  # False while the tasks file is still being parsed
+        self.created = 0
+        self.skipped = 0
+        self.failed = 0
+        self._finished_at = deque(maxlen=rate_window)
+    
+    def _endpoint(self, endpoint: str) -> Dict:
+        stats = self.endpoints.get(endpoint)
+        if stats is None:
+            stats = {'requests': 0, 'errors': 0, 'retries': 0, 'throttled': 0,
+                     'latencies': deque(maxlen=self.window)}
+            self.endpoints[endpoint] = stats
+        return stats
+    
+    def request_started(self) -> float:
+        """Record a request being sent and return its start time"""
+        with self._lock:
+            self.in_flight += 1
+        return time.monotonic()
+    
+    def request_finished(self, endpoint: str, started: float, status: Optional[int] = None):
+        """
+        Record the end of a request (one attempt)
+        
+        Args:
+            endpoint: Endpoint name (see endpoint_name)
+            started: Value returned by request_started
+            status: HTTP status, or None if no response was received
+        """
+        elapsed = time.monotonic() - started
+        with self._lock:
+            self.in_flight -= 1
+            stats = self._endpoint(endpoint)
+            stats['requests'] += 1
+            stats['latencies'].append(elapsed)
+            if status is None or status >= 400:
+                stats['errors'] += 1
+    
+    def retried(self, endpoint: str, throttled: bool = False):
+        """Record that a request is sent again"""
+        with self._lock:
+            stats = self._endpoint(endpoint)
+            stats['retries'] += 1
+            if throttled:
+                stats['throttled'] += 1
+    
+    def set_total(self, total: int, final: bool = True):
+        """Set the number of tasks of the run (final=False while it may still grow)"""
+        with self._lock:
+            self.tasks_total = total
+            self.total_known = final
+    
+    def task_finished(self, outcome: str):
+        """
+        Record a finished task
+        
+        Args:
+            outcome: 'created', 'skipped' or 'failed'
+        """
+        with self._lock:
+            setattr(self, outcome, getattr(self, outcome) + 1)
+            self._finished_at.append(time.monotonic())
+    
+    def snapshot(self) -> Dict:
+        """
+        Returns:
+            JSON-serializable dictionary with the current statistics
+        """
+        def ms(value):
+            return None if value is None else round(value * 1000, 1)
+        
+        with self._lock:
+            now = time.monotonic()
+            elapsed = now - self.started
+            done = self.created + self.skipped + self.failed
+            finished_at = list(self._finished_at)
+            endpoints = {}
+            all_latencies = []
+            for endpoint, stats in sorted(self.endpoints.items()):
+                latencies = list(stats['latencies'])
+                all_latencies.extend(latencies)
+                endpoints[endpoint] = {
+                    'requests': stats['requests'], 'errors': stats['errors'],
+                    'retries': stats['retries'], 'throttled': stats['throttled'],
+                    'p50_ms': ms(percentile(latencies, 50)), 'p95_ms': ms(percentile(latencies, 95)),
+                }
+            snapshot = {
+                'elapsed_seconds': round(elapsed, 2),
+                'in_flight': self.in_flight,
+                'tasks_total': self.tasks_total,
+                'total_known': self.total_known,
+                'tasks_done': done,
+                'created': self.created,
+                'skipped': self.skipped,
+                'failed': self.failed,
+            }
+        
+        # Rate of the latest tasks, so the ETA follows throttling and recoveries
+        rate = None
+        if len(finished_at) == self._finished_at.maxlen and now > finished_at[0]:
+            rate = (len(finished_at) - 1) / (now - finished_at[0])
+        elif done and elapsed > 0:
+            rate = done / elapsed
+        remaining = snapshot['tasks_total'] - done
+        snapshot.update({
+            'issues_per_sec': round(rate, 2) if rate else 0.0,
+            'eta_seconds': round(remaining / rate, 1) if rate and snapshot['total_known'] else None,
+            'requests': sum(stats['requests'] for stats in endpoints.values()),
+            'retries': sum(stats['retries'] for stats in endpoints.values()),
+            'throttled': sum(stats['throttled'] for stats in endpoints.values()),
+            'p50_ms': ms(percentile(all_latencies, 50)),
+            'p95_ms': ms(percentile(all_latencies, 95)),
+            'endpoints': endpoints,
+        })
+        return snapshot
+
+def format_metrics(snapshot: Dict) -> str:
+    """One-line summary of a RunMetrics snapshot"""
+    total = snapshot['tasks_total'] if snapshot['total_known'] else f"{snapshot['tasks_total']}+"
+    parts = [f"[{snapshot['tasks_done']}/{total}]",
+             f"{snapshot['issues_per_sec']:.1f} issues/s",
+             f"{snapshot['in_flight']} in flight"]
+    if snapshot['p50_ms'] is not None:
+        parts.append(f"p50 {snapshot['p50_ms']:.0f} ms / p95 {snapshot['p95_ms']:.0f} ms")
+    if snapshot['retries']:
+        parts.append(f"{snapshot['retries']} retries ({snapshot['throttled']} throttled)")
+    if snapshot['failed']:
+        parts.append(f"{snapshot['failed']} failed")
+    if snapshot['eta_seconds'] is not None:
+        eta = int(snapshot['eta_seconds'])
+        parts.append(f"ETA {eta // 3600}:{eta // 60 % 60:02d}:{eta % 60:02d}")
+    return " | ".join(parts)
+
+class StatusLine:
+    """
+    Status line redrawn in place below the log output of the CLI.
+    
+    Only drawn when the stream is a terminal. Log lines must go through
+    log() so the status line is erased before and redrawn after them.
+    """
+    
+    def __init__(self, metrics: RunMetrics, stream=None, interval: float = STATUS_INTERVAL):
+        self.metrics = metrics
+        self.stream = stream or sys.stderr
+        self.interval = interval
+        self.enabled = hasattr(self.stream, "isatty") and self.stream.isatty()
+        self._lock = threading.RLock()  # Reentrant: signal handlers log from the main thread
+        self._stop = threading.Event()
+        self._thread = None
+        self._line = ""
+        self._width = 0
+    
+    def _clear(self):
+        if self._width:
+            self.stream.write("\r" + " " * self._width + "\r")
+            self._width = 0
+    
+    def _draw(self, refresh: bool = True):
+        if refresh:
+            self._line = format_metrics(self.metrics.snapshot())
+        self.stream.write("\r" + self._line)
+        self.stream.flush()
+        self._width = len(self._line)
+    
+    def log(self, message: str):
+        """Print a log line above the status line"""
+        with self._lock:
+            if self.enabled:
+                self._clear()
+                self.stream.flush()
+            print(message, flush=self.enabled)
+            if self.enabled and self._thread:
+                self._draw(refresh=False)
+    
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            with self._lock:
+                self._draw()
+    
+    def start(self):
+        if self.enabled:
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+    
+    def stop(self):
+        """Stop refreshing and erase the status line"""
+        if self._thread:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+            with self._lock:
+                self._clear()
+                self.stream.flush()
+    
+    def __enter__(self):
+        self.start()
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.stop()
+
+class JiraClient:
+    """
+    Connection to a Jira site shared by all REST calls of a run.
+    
+    Owns a single requests.Session so TCP/TLS connections are kept alive and
+    reused, with a connection pool large enough for all worker threads. The
+    authentication headers are computed once when the client is created.
+    Every request goes through a RateLimiter and is retried with jittered
+    exponential backoff (or the Retry-After delay) when Jira throttles it.
+    Latency, status and retries of every request are reported to .metrics.
+    """
+    
+    def __init__(self, base_url: Optional[str] = None, email: Optional[str] = None,
+                 api_token: Optional[str] = None, project_key: Optional[str] = None,
+                 pool_size: Optional[int] = None, timeout: float = REQUEST_TIMEOUT,
+                 max_retries: int = MAX_RETRIES, rate_limiter: Optional[RateLimiter] = None,
+                 metrics: Optional[RunMetrics] = None):
+        """
+        Args:
+            base_url: Jira base URL (default: JIRA_BASE_URL)
+            email: Email used for authentication (default: EMAIL)
+            api_token: API token used for authentication (default: API_TOKEN)
+            project_key: Project in which issues are created (default: PROJECT_KEY)
+            pool_size: Maximum number of pooled connections (default: MAX_WORKERS, at least 10)
+            timeout: Timeout in seconds for every request
+            max_retries: Number of retries for throttled or transient failures
+            rate_limiter: Scheduler shared by all requests (default: one sized to pool_size)
+            metrics: Statistics the requests are reported to (default: a new RunMetrics)
+        """
+        self.base_url = (base_url or JIRA_BASE_URL).rstrip('/')
+        self.project_key = project_key or PROJECT_KEY
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.metadata = None  # ProjectMetadata of the project, once loaded by preflight_check
+        
+        pool_size = pool_size or max(MAX_WORKERS, 10)
+        self.pool_size = pool_size
+        self.rate_limiter = rate_limiter or RateLimiter(max_concurrency=pool_size)
+        self.metrics = metrics or RunMetrics()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session = requests.Session()
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers.update(get_auth_headers(email, api_token))
+    
+    def request(self, method: str, path: str, idempotent: Optional[bool] = None, **kwargs) -> requests.Response:
+        """
+        Send a request to the Jira REST API
+        
+        Throttled responses (429/503) are retried for every method. Gateway
+        errors and connection failures are only retried for idempotent
+        methods, so a POST that may have reached Jira is never sent twice.
+        
+        Args:
+            method: HTTP method (GET, POST, PUT, DELETE)
+            path: Path relative to the base URL (e.g., "/rest/api/3/issue")
+            idempotent: Whether sending the request twice is harmless (default: depends on the method)
+            **kwargs: Extra arguments passed to requests (params, data, ...)
+        
+        Returns:
+            The response (status is not checked)
+        """
+        kwargs.setdefault("timeout", self.timeout)
+        url = f"{self.base_url}{path}"
+        if idempotent is None:
+            idempotent = method.upper() in IDEMPOTENT_METHODS
+        endpoint = endpoint_name(method, path)
+        
+        attempt = 0
+        while True:
+            self.rate_limiter.acquire()
+            started = self.metrics.request_started()
+            try:
+                response = self.session.request(method, url, **kwargs)
+            except requests.exceptions.RequestException as e:
+                self.metrics.request_finished(endpoint, started)
+                self.rate_limiter.release(success=False)
+                retryable = isinstance(e, requests.exceptions.ConnectTimeout) or (
+                    idempotent and isinstance(e, (requests.exceptions.ConnectionError,
+                                                  requests.exceptions.Timeout)))
+                if not retryable or attempt >= self.max_retries:
+                    raise
+                self.metrics.retried(endpoint)
+                time.sleep(backoff_delay(attempt))
+                attempt += 1
+                continue
+            
+            self.metrics.request_finished(endpoint, started, response.status_code)
+            self.rate_limiter.update_from_headers(response.headers)
+            status = response.status_code
+            retryable = status in THROTTLE_STATUS_CODES or (idempotent and status in TRANSIENT_STATUS_CODES)
+            if not retryable or attempt >= self.max_retries:
+                self.rate_limiter.release(success=status < 400)
+                return response
+            
+            delay = parse_retry_after(response.headers.get("Retry-After"))
+            if delay is None:
+                delay = backoff_delay(attempt)
+            else:
+                # Spread the retries of all waiting threads a little
+                delay += random.uniform(0, min(1.0, delay * 0.1 + 0.05))
+            if status in THROTTLE_STATUS_CODES:
+                self.rate_limiter.throttled(delay)
+            self.metrics.retried(endpoint, throttled=status in THROTTLE_STATUS_CODES)
+            self.rate_limiter.release(success=False)
+            response.close()
+            time.sleep(delay)
+            attempt += 1
+    
+    def for_target(self, base_url: str, project_key: str) -> "JiraClient":
+        """
+        Create a client for another Jira site or project
+        
+        The new client uses the same credentials, settings and metrics, but
+        has its own connection pool and rate limiter.
+        """
+        client = JiraClient(base_url, project_key=project_key, pool_size=self.pool_size,
+                            timeout=self.timeout, max_retries=self.max_retries, metrics=self.metrics)
+        client.session.headers.update(self.session.headers)
+        return client
+    
+    def close(self):
+        """Close all pooled connections"""
+        self.session.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
+
+class JiraClients:
+    """
+    Clients of a run, one per (Jira site, project) pair.
+    
+    Tasks without PROJECT: or SITE: directive use the default client. Other
+    targets get a client on first use (default.for_target), so every target
+    has its own connection pool and rate limiter and they all work in parallel.
+    """
+    
+    def __init__(self, default):
+        """
+        Args:
+            default: Client of the run configuration (JiraClient or AsyncJiraClient)
+        """
+        self.default = default
+        self._clients = {(default.base_url, default.project_key): default}
+        self._lock = threading.Lock()
+    
+    def get(self, base_url: Optional[str] = None, project_key: Optional[str] = None):
+        """Get the client of a Jira site and project (default: those of the default client)"""
+        key = ((base_url or self.default.base_url).rstrip('/'), project_key or self.default.project_key)
+        with self._lock:
+            client = self._clients.get(key)
+            if client is None:
+                client = self.default.for_target(*key)
+                self._clients[key] = client
+            return client
+    
+    def for_task(self, task: Dict, parent=None):
+        """
+        Get the client a task is created with
+        
+        Args:
+            task: Task as returned by iter_tasks
+            parent: Client of the parent task, for tasks pointing at another task of the file
+                    (PARENT-n or an ID: children are always created next to their parent)
+        """
+        if parent is not None:
+            return parent
+        return self.get(task.get('site'), task.get('project'))
+    
+    def for_tasks(self, tasks: List[Dict]) -> List:
+        """Get the client of every task of a parsed file (see for_task)"""
+        graph = TaskGraph.from_tasks(tasks)
+        clients = [None] * len(tasks)
+        for index in graph.order():
+            parent = graph.parents[index]
+            clients[index] = self.for_task(tasks[index], clients[parent] if parent is not None else None)
+        # Tasks whose parent is missing or part of a cycle
+        return [client or self.for_task(task) for client, task in zip(clients, tasks)]
+    
+    def all(self) -> List:
+        """All clients created so far, the default client first"""
+        with self._lock:
+            return list(self._clients.values())
+    
+    def close(self):
+        """Close the connections of every client"""
+        for client in self.all():
+            client.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
+
+_default_client = None
+_default_client_lock = threading.Lock()
+
+def get_default_client() -> JiraClient:
+    """Get the client built from the module configuration, creating it on first use"""
+    global _default_client
+    with _default_client_lock:
+        if _default_client is None:
+            _default_client = JiraClient()
+        return _default_client
+
+def match_user_account_id(users: List[Dict], email: str) -> Optional[str]:
+    """
+    Pick the account ID of a user from the results of a user search
     
     Args:
-        issue_key: Issue key (e.g., PROJECT-123)
+        users: Users returned by /rest/api/3/user/search
+        email: Email address that was searched
     
     Returns:
-        True if successful, False otherwise
+        Account ID of the user with that exact email, else of the first result (None if empty)
+    """
+    if users and len(users) > 0:
+        # Find exact email match
+        for user in users:
+            if user.get('emailAddress', '').lower() == email.lower():
+                return user.get('accountId')
+        # If no exact match, return first result
+        if users[0].get('accountId'):
+            return users[0].get('accountId')
+    return None
+
+def get_user_account_id(email: str, client: Optional[JiraClient] = None) -> Optional[str]:
+    """
+    Get Jira user account ID from email address
+    
+    Args:
+        email: User's email address
+        client: Client used for the request (default: get_default_client())
+    
+    Returns:
+        Account ID if found, None otherwise
     """
-    url = f"{JIRA_BASE_URL}/rest/api/3/issue/{issue_key}"
-    headers = get_auth_headers()
+    client = client or get_default_client()
+    params = {"query": email}
     
     try:
-        response = requests.delete(url, headers=headers)
+        response = client.request("GET", "/rest/api/3/user/search", params=params)
         response.raise_for_status()
-        return True
+        return match_user_account_id(response.json(), email)
     except requests.exceptions.RequestException as e:
-        print(f"Error deleting issue {issue_key}: {e}")
+        print(f"Error getting user account ID: {e}")
         if hasattr(e, 'response') and hasattr(e.response, 'text'):
             print(f"Response: {e.response.text}")
-        return False
+        return None
 
-def create_jira_issue(summary: str, description: str, assignee_account_id: Optional[str] = None, issue_type: str = "Task", parent_key: Optional[str] = None) -> Dict:
+class JsonCache:
     """
-    Create a Jira issue using the REST API
-    
-    Args:
-        summary: Issue summary/title
-        description: Issue description
-        assignee_account_id: Account ID of the assignee (optional)
-        issue_type: Type of issue (default: Task)
-        parent_key: Parent issue key for subtasks (e.g., "PROJECT-123") - if provided, creates a subtask
+    Entries with a timestamp, kept in memory and persisted to a JSON file.
     
-    Returns:
-        Response from Jira API
+    The file is read on first use and only written by save() when entries
+    changed. The cache is optional: an unreadable file is treated as empty
+    and write errors are ignored.
     """
-    url = f"{JIRA_BASE_URL}/rest/api/3/issue"
-    headers = get_auth_headers()
-    
-    # If parent_key is provided, this is a subtask
-    is_subtask = parent_key is not None
-    
-    payload = {
-        "fields": {
-            "project": {
-                "key": PROJECT_KEY
-            },
-            "summary": summary,
-            "description": {
-                "type": "doc",
-                "version": 1,
-                "content": [
-                    {
-                        "type": "paragraph",
-                        "content": [
-                            {
-                                "type": "text",
-                                "text": description
-                            }
-                        ]
-                    }
-                ]
-            },
-            "issuetype": {
-                "name": "Sub-task" if is_subtask else issue_type
-            }
-        }
-    }
     
-    # Add parent for subtasks
-    if is_subtask:
-        payload["fields"]["parent"] = {
-            "key": parent_key
-        }
+    def __init__(self, path: Optional[str], ttl: float):
+        """
+        Args:
+            path: JSON file the cache is loaded from and saved to (None: memory only)
+            ttl: Seconds an entry stays fresh
+        """
+        self.path = path
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._entries = None
+        self._dirty = False
     
-    # Add assignee if provided
-    if assignee_account_id:
-        payload["fields"]["assignee"] = {
-            "accountId": assignee_account_id
-        }
+    def _load(self):
+        if self._entries is not None:
+            return
+        self._entries = {}
+        if self.path and os.path.exists(self.path):
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    self._entries = json.load(f)
+            except (OSError, ValueError):
+                self._entries = {}
     
-    try:
-        response = requests.post(url, headers=headers, data=json.dumps(payload))
-        response.raise_for_status()
-        return response.json()
-    except requests.exceptions.RequestException as e:
-        error_details = {
-            'error': str(e),
-            'status_code': None,
-            'response_text': None,
-            'error_messages': [],
-            'errors': {}
-        }
-        if hasattr(e, 'response') and e.response is not None:
-            error_details['status_code'] = e.response.status_code
-            error_details['response_text'] = e.response.text
+    def _get(self, key: str) -> Optional[Dict]:
+        with self._lock:
+            self._load()
+            return self._entries.get(key)
+    
+    def _set(self, key: str, entry: Dict):
+        with self._lock:
+            self._load()
+            self._entries[key] = dict(entry, time=time.time())
+            self._dirty = True
+    
+    def fresh(self, entry: Optional[Dict]) -> bool:
+        """Check whether an entry is younger than the TTL"""
+        return bool(entry) and time.time() - entry.get('time', 0) <= self.ttl
+    
+    def save(self):
+        """Write the cache to disk if it changed (errors are ignored, the cache is optional)"""
+        with self._lock:
+            if not self.path or not self._dirty:
+                return
             try:
-                response_json = e.response.json()
-                error_details['error_messages'] = response_json.get('errorMessages', [])
-                error_details['errors'] = response_json.get('errors', {})
-            except json.JSONDecodeError:
+                os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+                temp_path = self.path + ".tmp"
+                with open(temp_path, 'w', encoding='utf-8') as f:
+                    json.dump(self._entries, f)
+                os.replace(temp_path, self.path)
+                self._dirty = False
+            except OSError:
                 pass
-        return {'error': error_details}
 
-def parse_tasks_file(file_path: str) -> List[Dict[str, str]]:
+class UserCache(JsonCache):
     """
-    Parse tasks from a text file.
+    Cache of email -> account ID lookups, kept in memory and persisted to disk.
     
-    Format:
-    - Tasks are separated by "---" on its own line
-    - First line of each task is the summary
-    - Following lines until the next "---" are the description
-    - To create a subtask, add "PARENT: ISSUE-KEY" line before the summary
-      - Use actual issue key: "PARENT: PROJECT-123"
-      - Use placeholder for auto-link: "PARENT: PARENT-1" (refers to 1st parent task)
-      - Use placeholder: "PARENT: PARENT-2" (refers to 2nd parent task), etc.
-    - Empty lines are preserved in descriptions
+    Entries expire after ttl seconds. Only successful lookups are cached, so a
+    user that was not found is looked up again on the next run.
+    """
     
-    Args:
-        file_path: Path to the tasks file
+    def __init__(self, path: Optional[str] = USER_CACHE_FILE, ttl: float = USER_CACHE_TTL):
+        """
+        Args:
+            path: JSON file the cache is loaded from and saved to (None: memory only)
+            ttl: Seconds before a cached account ID is looked up again
+        """
+        super().__init__(path, ttl)
     
-    Returns:
-        List of task dictionaries with 'summary', 'description', and optionally 'parent_key' or 'parent_ref' keys
-    """
-    if not os.path.exists(file_path):
-        print(f"Error: Tasks file '{file_path}' not found.")
-        print(f"Please create a tasks.txt file with your tasks.")
-        sys.exit(1)
+    @staticmethod
+    def _key(base_url: str, email: str) -> str:
+        return f"{base_url.rstrip('/')}|{email.strip().lower()}"
     
-    tasks = []
-    current_task = None
+    def get(self, base_url: str, email: str) -> Optional[str]:
+        """Get a cached account ID, or None if unknown or expired"""
+        entry = self._get(self._key(base_url, email))
+        return entry.get('account_id') if self.fresh(entry) else None
     
-    with open(file_path, 'r', encoding='utf-8') as f:
-        lines = f.readlines()
+    def set(self, base_url: str, email: str, account_id: str):
+        """Store an account ID"""
+        self._set(self._key(base_url, email), {'account_id': account_id})
+
+class MetadataCache(JsonCache):
+    """
+    Cache of the createmeta of every project, kept in memory and persisted to disk.
     
-    for line in lines:
-        line = line.rstrip('\n\r')
-        
-        # Check if this is a task separator
-        if line.strip() == "---":
-            # Save previous task if exists
-            if current_task and current_task.get('summary'):
-                tasks.append(current_task)
-            # Start new task
-            current_task = {"summary": "", "description": "", "parent_key": None, "parent_ref": None}
-        else:
-            # First non-empty line after separator (or start of file)
-            if current_task is None:
-                current_task = {"summary": "", "description": "", "parent_key": None, "parent_ref": None}
-            
-            # Check if this is a PARENT directive
-            if line.strip().upper().startswith("PARENT:"):
-                parent_value = line.strip()[7:].strip()  # Remove "PARENT:" prefix
-                if parent_value:
-                    # Check if it's a placeholder (PARENT-1, PARENT-2, etc.)
-                    if parent_value.upper().startswith("PARENT-"):
-                        try:
-                            # Extract number (e.g., "PARENT-1" -> 1)
-                            parent_num = int(parent_value.split('-')[1])
-                            current_task["parent_ref"] = parent_num  # Store reference number
-                        except (ValueError, IndexError):
-                            # Invalid format, treat as actual key
-                            current_task["parent_key"] = parent_value
-                    else:
-                        # Actual issue key
-                        current_task["parent_key"] = parent_value
-                continue
-            
-            if not current_task["summary"] and line.strip():
-                # This is the summary line (skip if we already processed a PARENT line)
-                if not line.strip().upper().startswith("PARENT:"):
-                    current_task["summary"] = line.strip()
-            elif current_task["summary"]:
-                # This is part of the description
-                if current_task["description"]:
-                    current_task["description"] += "\n" + line
-                else:
-                    current_task["description"] = line
+    Fresh entries are used without a request. Older entries are revalidated
+    with their ETag, so an unchanged project costs a 304 response instead of
+    the whole (often large) createmeta document.
+    """
     
-    # Don't forget the last task
-    if current_task and current_task.get('summary'):
-        tasks.append(current_task)
+    def __init__(self, path: Optional[str] = METADATA_CACHE_FILE, ttl: float = METADATA_CACHE_TTL):
+        """
+        Args:
+            path: JSON file the cache is loaded from and saved to (None: memory only)
+            ttl: Seconds before cached metadata is revalidated
+        """
+        super().__init__(path, ttl)
     
-    # Clean up descriptions (remove leading/trailing whitespace)
-    for task in tasks:
-        task["description"] = task["description"].strip()
+    @staticmethod
+    def _key(base_url: str, project_key: str) -> str:
+        return f"{base_url.rstrip('/')}|{project_key.upper()}"
+    
+    def get(self, base_url: str, project_key: str) -> Optional[Dict]:
+        """Get the cached entry of a project ('etag', 'data' and 'time'), even if it is not fresh"""
+        return self._get(self._key(base_url, project_key))
     
-    return tasks
+    def set(self, base_url: str, project_key: str, data: Dict, etag: Optional[str] = None):
+        """Store the metadata of a project (ProjectMetadata.to_dict) with the ETag of its response"""
+        self._set(self._key(base_url, project_key), {'etag': etag, 'data': data})
 
-def validate_config():
-    """Validate that required configuration is present"""
-    errors = []
+def resolve_account_ids(emails: Iterable[str], client: Optional[JiraClient] = None,
+                        cache: Optional[UserCache] = None, max_workers: int = MAX_WORKERS,
+                        log: Callable[[str], None] = print) -> Dict[str, Optional[str]]:
+    """
+    Resolve the account IDs of several users at once
+    
+    Every distinct email is looked up only once: cached entries are used
+    directly and the remaining ones are looked up concurrently.
+    
+    Args:
+        emails: Email addresses (duplicates and case differences are ignored)
+        client: Client used for the lookups (default: get_default_client())
+        cache: Cache of previous lookups (optional)
+        max_workers: Maximum number of lookups sent at the same time
+        log: Function used to report progress
     
-    if not EMAIL or EMAIL == "your-email@example.com":
-        errors.append("EMAIL is not set. Please update it in the script or set JIRA_EMAIL environment variable.")
+    Returns:
+        Dictionary mapping lower-case emails to account IDs (None if not found)
+    """
+    client = client or get_default_client()
+    account_ids = {}
+    missing = []
+    for email in sorted({email.strip().lower() for email in emails if email and email.strip()}):
+        account_id = cache.get(client.base_url, email) if cache else None
+        if account_id:
+            account_ids[email] = account_id
+        else:
+            missing.append(email)
     
-    if not API_TOKEN or API_TOKEN == "YOUR_API_TOKEN_HERE":
-        errors.append("API_TOKEN is not set. Please update it in the script or set JIRA_API_TOKEN environment variable.")
+    if missing:
+        log(f"Looking up account ID(s) for {len(missing)} user(s)...")
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+            found = executor.map(lambda email: get_user_account_id(email, client=client), missing)
+            for email, account_id in zip(missing, found):
+                account_ids[email] = account_id
+                if account_id and cache:
+                    cache.set(client.base_url, email, account_id)
+        if cache:
+            cache.save()
     
+    return account_ids
+
+def report_task_errors(file_path: str, errors: List[str]):
+    """Print the problems found in a tasks file and exit if there are any"""
     if errors:
-        print("Configuration errors found:")
+        print(f"Error: {len(errors)} problem(s) in tasks file '{file_path}':")
         for error in errors:
             print(f"  - {error}")
-        print("\nPlease update the configuration and try again.")
         sys.exit(1)
 
-def main():
-    """Create all Jira tasks"""
+def read_task_checks(file_path: str, processes: int = 1, preflight: bool = True,
+                     warn: Optional[Callable[[str], None]] = None
+                     ) -> Tuple["TaskGraph", Optional["PreflightCheck"], List[str]]:
+    """
+    Read what the checks before a run need from a tasks file, in one pass
     
-    # Validate configuration
-    validate_config()
+    The parent links (TaskGraph), the kinds of tasks checked against their
+    project (PreflightCheck) and the emails of the ASSIGNEE directives are
+    all gathered while the file is parsed once, so a large file is only
+    parsed again to create its issues.
     
-    # Get user account ID for assignment
-    print(f"Getting account ID for {EMAIL}...")
-    assignee_account_id = get_user_account_id(EMAIL)
-    if assignee_account_id:
-        print(f"  ✓ Found account ID: {assignee_account_id}\n")
-    else:
-        print(f"  ⚠ Could not find account ID. Issues will be created without assignment.\n")
+    Args:
+        file_path: Path to the tasks file
+        processes: Number of processes parsing the file (see iter_tasks_parallel)
+        preflight: Also gather the tasks for preflight_check
+        warn: Called with a message for every task of the file that is skipped (see TaskReader.parse)
     
-    # Parse tasks from file
-    print(f"Reading tasks from: {TASKS_FILE}")
-    tasks = parse_tasks_file(TASKS_FILE)
+    Returns:
+        (graph of the whole file, PreflightCheck or None, distinct assignee emails in order of first appearance)
     
-    if not tasks:
-        print("No tasks found in the file. Please add tasks to the file.")
-        sys.exit(1)
+    Raises:
+        TaskFileError: The file cannot be read
+    """
+    graph = TaskGraph()
+    check = PreflightCheck() if preflight else None
+    assignees = {}
+    for task in iter_tasks_parallel(file_path, processes, prepare=False, warn=warn):
+        graph.add(task)
+        if check:
+            check.add(task)
+        if task['assignee']:
+            assignees.setdefault(task['assignee'].lower(), task['assignee'])
+    return graph, check, list(assignees.values())
+
+class ProjectMetadata:
+    """
+    Issue types of a project and the fields they require, from createmeta.
     
-    # Separate parent tasks from subtasks
-    parent_tasks = []
-    subtasks = []
-    parent_keys_map = {}  # Maps parent_ref (1, 2, 3...) to actual issue keys
+    Lets tasks be checked before anything is created, and gives the issue
+    type names the project really uses (e.g. "Subtask" instead of "Sub-task").
+    """
     
-    for task in tasks:
-        if task.get('parent_ref') is not None:
-            subtasks.append(task)
-        elif task.get('parent_key'):
-            subtasks.append(task)
-        else:
-            parent_tasks.append(task)
+    def __init__(self, project_key: str, issue_types: List[Dict], sprint_field: Optional[str] = None):
+        """
+        Args:
+            project_key: Key of the project
+            issue_types: Issue types with 'name', 'subtask', 'fields' (IDs of the fields on the
+                         create screen, None if unknown) and 'required' (field ID -> name)
+            sprint_field: ID of the Sprint field, if one of the issue types has it on its create screen
+        """
+        self.project_key = project_key
+        self.issue_types = issue_types
+        self.sprint_field = sprint_field
+        self._by_name = {issue_type['name'].lower(): issue_type for issue_type in issue_types}
+        self.subtask_type = next((issue_type['name'] for issue_type in issue_types if issue_type['subtask']), None)
     
-    print(f"Found {len(parent_tasks)} parent task(s) and {len(subtasks)} subtask(s)")
-    print(f"Creating tasks in Jira project {PROJECT_KEY}...")
-    print(f"Jira URL: {JIRA_BASE_URL}\n")
+    @classmethod
+    def from_createmeta(cls, project_key: str, response: Dict) -> Optional["ProjectMetadata"]:
+        """
+        Read the project from a GET /rest/api/3/issue/createmeta response
+        
+        Returns:
+            The metadata, or None if the project is not part of the response
+            (it does not exist or the user cannot create issues in it)
+        """
+        for project in response.get('projects', []):
+            if project.get('key', '').upper() != project_key.upper():
+                continue
+            issue_types = []
+            sprint_field = None
+            for issue_type in project.get('issuetypes', []):
+                fields = issue_type.get('fields')
+                for field_id, field in (fields or {}).items():
+                    if (field.get('schema') or {}).get('custom') == SPRINT_FIELD_SCHEMA:
+                        sprint_field = field_id
+                issue_types.append({
+                    'name': issue_type.get('name', ''),
+                    'subtask': bool(issue_type.get('subtask')),
+                    'fields': sorted(fields) if fields is not None else None,
+                    'required': {field_id: field.get('name', field_id) for field_id, field in (fields or {}).items()
+                                 if field.get('required') and not field.get('hasDefaultValue')},
+                })
+            return cls(project.get('key', project_key), issue_types, sprint_field)
+        return None
     
-    created_issues = []
-    failed_issues = []
+    @classmethod
+    def from_dict(cls, data: Dict) -> "ProjectMetadata":
+        """Rebuild metadata saved with to_dict"""
+        return cls(data['project_key'], data['issue_types'], data.get('sprint_field'))
     
-    # First, create all parent tasks and store their keys
-    print("=" * 60)
-    print("Creating Parent Tasks")
-    print("=" * 60)
-    for i, task in enumerate(parent_tasks, 1):
-        print(f"[{i}/{len(parent_tasks)}] Creating: {task['summary']}")
-        result = create_jira_issue(task['summary'], task['description'], assignee_account_id)
+    def to_dict(self) -> Dict:
+        """Get a JSON-serializable copy (see MetadataCache)"""
+        return {'project_key': self.project_key, 'issue_types': self.issue_types, 'sprint_field': self.sprint_field}
+    
+    def issue_type(self, name: Optional[str], has_parent: bool) -> Optional[Dict]:
+        """
+        Find the issue type used for a task
         
-        if result and 'key' in result:
-            issue_key = result['key']
-            issue_url = f"{JIRA_BASE_URL}/browse/{issue_key}"
-            print(f"  ✓ Created: {issue_key} - {issue_url}")
-            created_issues.append(issue_key)
-            # Store the parent key by its position (1-based index)
-            parent_keys_map[i] = issue_key
-        else:
-            print(f"  ✗ Failed to create issue")
-            if result and 'error' in result:
-                error_info = result['error']
-                if 'error_messages' in error_info:
-                    for msg in error_info['error_messages']:
-                        print(f"    Error: {msg}")
-            failed_issues.append(task['summary'])
-        print()
-    
-    # Then, create all subtasks using parent keys
-    if subtasks:
-        print("=" * 60)
-        print("Creating Subtasks")
-        print("=" * 60)
-        for i, task in enumerate(subtasks, 1):
-            # Determine parent key
-            parent_key = None
-            if task.get('parent_ref') is not None:
-                # Use placeholder reference
-                parent_ref = task['parent_ref']
-                parent_key = parent_keys_map.get(parent_ref)
-                if not parent_key:
-                    print(f"[{i}/{len(subtasks)}] Creating: {task['summary']}")
-                    print(f"  ✗ Failed: Parent task #{parent_ref} was not created successfully")
-                    failed_issues.append(task['summary'])
-                    continue
-            elif task.get('parent_key'):
-                # Use explicit parent key
-                parent_key = task['parent_key']
-            
-            task_type = "Subtask" if parent_key else "Task"
-            parent_info = f" (Parent: {parent_key})" if parent_key else ""
-            print(f"[{i}/{len(subtasks)}] Creating {task_type}: {task['summary']}{parent_info}")
-            
-            result = create_jira_issue(task['summary'], task['description'], assignee_account_id, parent_key=parent_key)
+        Args:
+            name: Issue type of the task (TYPE: directive, case-insensitive), None for the default
+            has_parent: Whether the task has a parent (the default is then the sub-task type)
+        """
+        if name:
+            return self._by_name.get(name.lower())
+        if has_parent:
+            return self._by_name.get(self.subtask_type.lower()) if self.subtask_type else None
+        return self._by_name.get("task")
+    
+    def resolve(self, name: Optional[str], has_parent: bool) -> Optional[str]:
+        """Get the exact name of the issue type used for a task (None if the project has no such type)"""
+        issue_type = self.issue_type(name, has_parent)
+        return issue_type['name'] if issue_type else None
+    
+    def problems(self, name: Optional[str], has_parent: bool, has_description: bool,
+                 extra_fields: Tuple[str, ...] = ()) -> List[str]:
+        """
+        Describe why tasks of an issue type could not be created in the project
         
-            if result and 'key' in result:
-                issue_key = result['key']
-                issue_url = f"{JIRA_BASE_URL}/browse/{issue_key}"
-                print(f"  ✓ Created: {issue_key} - {issue_url}")
-                created_issues.append(issue_key)
-            else:
-                print(f"  ✗ Failed to create issue")
-                if result and 'error' in result:
-                    error_info = result['error']
-                    if 'error_messages' in error_info:
-                        for msg in error_info['error_messages']:
-                            print(f"    Error: {msg}")
-                failed_issues.append(task['summary'])
-            print()
-    
-    # Summary
-    print("=" * 60)
-    print("SUMMARY")
-    print("=" * 60)
-    print(f"Successfully created: {len(created_issues)} issues")
-    print(f"  - Parent tasks: {len(parent_tasks)}")
-    print(f"  - Subtasks: {len(subtasks)}")
-    if created_issues:
-        print("\nCreated issues:")
-        for key in created_issues:
-            print(f"  - {key}")
+        Args:
+            name: Issue type of the tasks (None for the default)
+            has_parent: Whether the tasks have a parent
+            has_description: Whether the tasks have a description
+            extra_fields: Other fields the tasks set ("labels", "components", "sprint")
+        """
+        issue_type = self.issue_type(name, has_parent)
+        if issue_type is None:
+            available = ", ".join(issue_type['name'] for issue_type in self.issue_types) or "none"
+            if name:
+                return [f"Issue type '{name}' does not exist in project {self.project_key} (available: {available})"]
+            default = "sub-task" if has_parent else "'Task'"
+            return [f"Project {self.project_key} has no {default} issue type, set one with TYPE: "
+                    f"(available: {available})"]
+        
+        label = f"Issue type '{issue_type['name']}' of project {self.project_key}"
+        problems = []
+        if issue_type['subtask'] and not has_parent:
+            problems.append(f"{label} is a sub-task type and needs a PARENT")
+        missing = [field_name for field_id, field_name in issue_type['required'].items()
+                   if field_id not in TASK_FIELDS]
+        if missing:
+            problems.append(f"{label} requires field(s) that cannot be set from a tasks file: {', '.join(missing)}")
+        fields = issue_type['fields']
+        if fields is not None:
+            if has_parent and "parent" not in fields:
+                problems.append(f"{label} cannot have a parent")
+            if has_description and "description" not in fields:
+                problems.append(f"{label} has no description field on its create screen")
+            for field in extra_fields:
+                field_id = (self.sprint_field or SPRINT_FIELD) if field == "sprint" else field
+                if field_id not in fields:
+                    problems.append(f"{label} has no {field} field on its create screen")
+        return problems
+
+def createmeta_params(project_key: str) -> Dict:
+    """Query parameters of the createmeta request of a project"""
+    return {"projectKeys": project_key, "expand": "projects.issuetypes.fields"}
+
+def read_project_metadata(client, cache: Optional[MetadataCache], entry: Optional[Dict], status_code: Optional[int],
+                          etag: Optional[str] = None, text: Optional[str] = None) -> Optional[ProjectMetadata]:
+    """
+    Turn the answer to a createmeta request into metadata, updating the cache
     
-    if failed_issues:
-        print(f"\nFailed to create: {len(failed_issues)} issues")
-        for summary in failed_issues:
-            print(f"  - {summary}")
+    Args:
+        client: Client of the project (JiraClient or AsyncJiraClient)
+        cache: Cache the metadata is stored in (optional)
+        entry: Cached entry the request was revalidating, if any
+        status_code: Status of the response (None if the request failed)
+        etag: ETag header of the response
+        text: Body of the response
+    
+    Returns:
+        The metadata, or None if it is not available (the cached metadata
+        is still used when Jira could not be asked)
+    """
+    if status_code == 304 and entry:
+        data = entry['data']
+        etag = etag or entry.get('etag')
+    elif status_code is not None and status_code < 400:
+        try:
+            metadata = ProjectMetadata.from_createmeta(client.project_key, json.loads(text or "{}"))
+        except (ValueError, AttributeError):
+            metadata = None
+        if metadata is None:
+            return None
+        data = metadata.to_dict()
+    else:
+        return ProjectMetadata.from_dict(entry['data']) if entry else None
+    
+    if cache:
+        cache.set(client.base_url, client.project_key, data, etag)
+    return ProjectMetadata.from_dict(data)
 
-if __name__ == "__main__":
-    main()
+def load_project_metadata(client: JiraClient, cache: Optional[MetadataCache] = None) -> Optional[ProjectMetadata]:
+    """
+    Get the issue types and fields of the project of a client
+    
+    Fresh cached metadata is used without a request; older metadata is
+    revalidated with a conditional request (If-None-Match).
+    
+    Args:
+        client: Client of the project
+        cache: Cache of previous requests (optional)
+    
+    Returns:
+        The metadata, or None if it is not available
+    """
+    entry = cache.get(client.base_url, client.project_key) if cache else None
+    if cache and cache.fresh(entry):
+        return ProjectMetadata.from_dict(entry['data'])
+    
+    headers = {"If-None-Match": entry['etag']} if entry and entry.get('etag') else {}
+    try:
+        response = client.request("GET", "/rest/api/3/issue/createmeta", params=createmeta_params(client.project_key),
+                                  headers=headers)
+    except requests.exceptions.RequestException:
+        return read_project_metadata(client, cache, entry, None)
+    return read_project_metadata(client, cache, entry, response.status_code, response.headers.get("ETag"),
+                                 response.text)
+
+def format_positions(count: int, indexes: List[int]) -> str:
+    """Describe the tasks a problem applies to, e.g. "task(s) #2, #5 and 10 more\""""
+    positions = ", ".join(f"#{index + 1}" for index in indexes)
+    more = count - len(indexes)
+    return f"task(s) {positions}" + (f" and {more} more" if more > 0 else "")
 
+class PreflightCheck:
+    """
+    Checks every task of a file against the metadata of its project.
+    
+    The file is read once and reduced to its distinct combinations of
+    target, issue type, parent and description, so even very large files are
+    checked in a few dictionary lookups. Tasks pointing at another task of
+    the file are checked against the project of that task (they are created
+    next to it, see JiraClients.for_task).
+    """
+    
+    MAX_POSITIONS = 5  # Tasks listed per problem
+    
+    def __init__(self, tasks: Iterable[Dict] = (), graph: Optional["TaskGraph"] = None):
+        """
+        Args:
+            tasks: Tasks of the file, in file order (more can be given to add)
+            graph: Parent links of the same tasks, if they are all given (see link)
+        """
+        self.targets = {}  # Maps the (site, project) pair of tasks to a number
+        self.long_summaries = [0, []]  # Count and first indexes of the tasks whose summary is too long
+        self.bad_sprints = [0, []]  # Count and first indexes of the tasks whose SPRINT is not a sprint ID
+        self.usages = {}  # Maps (target number, issue type, has parent, has description, fields) to a count and first indexes
+        self._kinds = {}  # Maps the (target number, issue type, ...) kinds of tasks to a number
+        self._task_kinds = []  # Kind number of every task
+        for task in tasks:
+            self.add(task)
+        if graph is not None:
+            self.link(graph)
+    
+    def add(self, task: Dict):
+        """Add the next task of the file"""
+        index = len(self._task_kinds)
+        target = self.targets.setdefault((task.get('site'), task.get('project')), len(self.targets))
+        fields = tuple(field for field in ("labels", "components", "sprint") if task.get(field))
+        kind = (target, task.get('type'), is_subtask(task), bool(task['description']), fields)
+        self._task_kinds.append(self._kinds.setdefault(kind, len(self._kinds)))
+        if len(task['summary']) > SUMMARY_MAX_LENGTH:
+            self._count(self.long_summaries, index)
+        if task.get('sprint') and not task['sprint'].isdigit():
+            self._count(self.bad_sprints, index)
+    
+    def link(self, graph: "TaskGraph"):
+        """
+        Count the tasks of every kind, once all tasks are added
+        
+        Args:
+            graph: Parent links of the tasks (see read_task_checks)
+        """
+        kinds = list(self._kinds)
+        task_targets = [kinds[kind][0] for kind in self._task_kinds]
+        for index in graph.order():
+            parent = graph.parents[index]
+            if parent is not None:
+                task_targets[index] = task_targets[parent]
+        self.usages = {}
+        for index, kind in enumerate(self._task_kinds):
+            key = (task_targets[index],) + kinds[kind][1:]
+            self._count(self.usages.setdefault(key, [0, []]), index)
+    
+    def _count(self, usage: List, index: int):
+        usage[0] += 1
+        if len(usage[1]) < self.MAX_POSITIONS:
+            usage[1].append(index)
+    
+    def errors(self, metadata: Dict[tuple, Optional[ProjectMetadata]]) -> List[str]:
+        """
+        Describe the problems found
+        
+        Args:
+            metadata: Maps the (site, project) pairs of self.targets to the metadata of their
+                      project (tasks of targets without metadata are only checked locally)
+        """
+        errors = []
+        if self.long_summaries[0]:
+            errors.append(f"Summary longer than {SUMMARY_MAX_LENGTH} characters "
+                          f"({format_positions(*self.long_summaries)})")
+        if self.bad_sprints[0]:
+            errors.append(f"SPRINT must be the numeric ID of a sprint ({format_positions(*self.bad_sprints)})")
+        
+        targets = list(self.targets)
+        problems = {}
+        for (target, issue_type, has_parent, has_description, fields), usage in self.usages.items():
+            project = metadata.get(targets[target])
+            if project is None:
+                continue
+            for problem in project.problems(issue_type, has_parent, has_description, fields):
+                merged = problems.setdefault(problem, [0, []])
+                merged[0] += usage[0]
+                merged[1] = sorted(merged[1] + usage[1])[:self.MAX_POSITIONS]
+        errors.extend(f"{problem} ({format_positions(*usage)})" for problem, usage in problems.items())
+        return errors
+
+def preflight_check(tasks: Union[Iterable[Dict], PreflightCheck], graph: "TaskGraph", clients: JiraClients,
+                    cache: Optional[MetadataCache] = None, max_workers: int = MAX_WORKERS,
+                    log: Callable[[str], None] = print) -> List[str]:
+    """
+    Check every task against the metadata of its project before anything is created
+    
+    The metadata of every project is loaded once, concurrently, and kept on
+    its client (.metadata), so issues are then sent with the issue type names
+    the project uses.
+    
+    Args:
+        tasks: Tasks of the file, in file order, or a PreflightCheck they were added to (see read_task_checks)
+        graph: Parent links of the same tasks
+        clients: Clients of the run
+        cache: Cache of the project metadata (optional)
+        max_workers: Maximum number of createmeta requests sent at the same time
+        log: Function used to report projects whose metadata is not available
+    
+    Returns:
+        Problems found (tasks of projects without metadata are only checked locally)
+    """
+    check = tasks if isinstance(tasks, PreflightCheck) else PreflightCheck(tasks)
+    check.link(graph)
+    targets = [clients.get(site, project) for site, project in check.targets]
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(targets)))) as executor:
+        loaded = list(executor.map(lambda client: load_project_metadata(client, cache), targets))
+    if cache:
+        cache.save()
+    
+    for client, metadata in zip(targets, loaded):
+        client.metadata = metadata
+        if metadata is None:
+            log(f"  ⚠ Could not load the issue types of project {client.project_key} ({client.base_url}), "
+                f"its tasks are checked by Jira only")
+    return check.errors(dict(zip(check.targets, loaded)))
+
+def task_assignee(task: Dict, assignee_account_id: Optional[str],
+                  account_ids: Optional[Dict[str, Optional[str]]]) -> Optional[str]:
+    """
+    Get the account ID a task is assigned to
+    
+    Args:
+        task: Parsed task
+        assignee_account_id: Default assignee for tasks without an ASSIGNEE directive
+        account_ids: Account IDs returned by resolve_account_ids
+    
+    Returns:
+        Account ID, or None to leave the issue unassigned
+    """
+    email = task.get('assignee')
+    if email:
+        return (account_ids or {}).get(email.strip().lower())
+    return assignee_account_id
+
+def delete_jira_issue(issue_key: str, client: Optional[JiraClient] = None, delete_subtasks: bool = False,
+                      missing_ok: bool = False, log: Callable[[str], None] = print) -> bool:
+    """
+    Delete a Jira issue
+    
+    Args:
+        issue_key: Issue key (e.g., PROJECT-123)
+        client: Client used for the request (default: get_default_client())
+        delete_subtasks: Also delete the subtasks of the issue (Jira refuses otherwise)
+        missing_ok: Consider an issue that does not exist (404) as deleted
+        log: Function used to report errors
+    
+    Returns:
+        True if successful, False otherwise
+    """
+    client = client or get_default_client()
+    params = {"deleteSubtasks": "true"} if delete_subtasks else None
+    
+    try:
+        response = client.request("DELETE", f"/rest/api/3/issue/{issue_key}", params=params)
+        if missing_ok and response.status_code == 404:
+            return True
+        response.raise_for_status()
+        return True
+    except requests.exceptions.RequestException as e:
+        log(f"Error deleting issue {issue_key}: {e}")
+        if hasattr(e, 'response') and hasattr(e.response, 'text'):
+            log(f"Response: {e.response.text}")
+        return False
+
+# Lightweight markdown understood in descriptions
+_ADF_FENCE = re.compile(r"^\s*```\s*([\w+#.-]*)\s*$")
+_ADF_BULLET = re.compile(r"^\s*[-*+]\s+(.*)$")
+_ADF_ORDERED = re.compile(r"^\s*\d+[.)]\s+(.*)$")
+_ADF_INLINE = re.compile(r"\[([^\]\n]+)\]\((https?://[^)\s]+)\)|`([^`\n]+)`|(https?://[^\s<>()\[\]]+[^\s<>()\[\].,;:!?'\"])")
+
+def encode_json(payload) -> bytes:
+    """Serialize a request payload to UTF-8 JSON (with orjson when installed)"""
+    if orjson is not None:
+        return orjson.dumps(payload)
+    return json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode('utf-8')
+
+def inline_to_adf(text: str) -> List[Dict]:
+    """
+    Convert one line of text to ADF text nodes
+    
+    [label](https://...) and bare http(s) URLs become links, `code` gets a code mark.
+    """
+    if '`' not in text and '://' not in text:
+        return [{"type": "text", "text": text}]
+    nodes = []
+    position = 0
+    for match in _ADF_INLINE.finditer(text):
+        if match.start() > position:
+            nodes.append({"type": "text", "text": text[position:match.start()]})
+        label, href, code, url = match.groups()
+        if code is not None:
+            nodes.append({"type": "text", "text": code, "marks": [{"type": "code"}]})
+        else:
+            nodes.append({"type": "text", "text": label or url,
+                          "marks": [{"type": "link", "attrs": {"href": href or url}}]})
+        position = match.end()
+    if position < len(text):
+        nodes.append({"type": "text", "text": text[position:]})
+    return nodes
+
+@lru_cache(maxsize=ADF_CACHE_SIZE)
+def text_to_adf(description: str) -> Dict:
+    """
+    Convert a task description to an Atlassian Document Format document
+    
+    Blank lines separate paragraphs and line breaks inside a paragraph are
+    kept. Lines starting with "-", "*" or "+" form bullet lists, lines
+    starting with "1." or "1)" ordered lists, and ``` fences code blocks.
+    Results are cached and shared, so they must not be modified.
+    
+    Args:
+        description: Task description
+    
+    Returns:
+        ADF document for the "description" field
+    """
+    content = []
+    paragraph = []  # Inline nodes of the paragraph being read
+    list_node = None  # List being read
+    lines = iter(description.split("\n"))
+    
+    def end_paragraph():
+        if paragraph:
+            content.append({"type": "paragraph", "content": paragraph[:]})
+            paragraph.clear()
+    
+    for line in lines:
+        stripped = line.strip()
+        if not stripped:
+            end_paragraph()
+            list_node = None
+            continue
+        
+        # Only lines starting with a markup character can be a fence or a list item
+        first = stripped[0]
+        fence = _ADF_FENCE.match(line) if first == '`' else None
+        if fence:
+            end_paragraph()
+            list_node = None
+            code = []
+            for code_line in lines:
+                closing = _ADF_FENCE.match(code_line)
+                if closing and not closing.group(1):
+                    break
+                code.append(code_line)
+            block = {"type": "codeBlock"}
+            if fence.group(1):
+                block["attrs"] = {"language": fence.group(1)}
+            if code:
+                block["content"] = [{"type": "text", "text": "\n".join(code)}]
+            content.append(block)
+            continue
+        
+        bullet = _ADF_BULLET.match(line) if first in '-*+' else None
+        ordered = _ADF_ORDERED.match(line) if first.isdigit() else None
+        if bullet or ordered:
+            end_paragraph()
+            list_type = "bulletList" if bullet else "orderedList"
+            if list_node is None or list_node["type"] != list_type:
+                list_node = {"type": list_type, "content": []}
+                content.append(list_node)
+            item = (bullet or ordered).group(1)
+            list_node["content"].append({"type": "listItem", "content": [
+                {"type": "paragraph", "content": inline_to_adf(item)}
+            ]})
+            continue
+        
+        list_node = None
+        if paragraph:
+            paragraph.append({"type": "hardBreak"})
+        paragraph.extend(inline_to_adf(stripped))
+    end_paragraph()
+    
+    return {"type": "doc", "version": 1, "content": content}
+
+@lru_cache(maxsize=1024)
+def issue_skeleton(project_key: str, issue_type: Optional[str], parent_key: Optional[str]) -> Dict:
+    """
+    Get the fields shared by every issue of a project, issue type and parent
+    
+    Results are cached and shared, so they must not be modified.
+    """
+    if not issue_type:
+        issue_type = "Sub-task" if parent_key is not None else "Task"
+    fields = {
+        "project": {"key": project_key},
+        "issuetype": {"name": issue_type},
+    }
+    if parent_key is not None:
+        fields["parent"] = {"key": parent_key}
+    return fields
+
+def build_issue_fields(summary: str, description: str, assignee_account_id: Optional[str] = None, issue_type: Optional[str] = None, parent_key: Optional[str] = None, project_key: Optional[str] = None, fields: Optional[Dict] = None) -> Dict:
+    """
+    Build the "fields" object used to create a Jira issue
+    
+    The description is converted to ADF with text_to_adf. Nested objects are
+    shared between issues (see issue_skeleton), so the result is meant to be
+    serialized, not modified in place.
+    
+    Args:
+        summary: Issue summary/title
+        description: Issue description (lightweight markdown, see text_to_adf)
+        assignee_account_id: Account ID of the assignee (optional)
+        issue_type: Type of issue (default: Task, or Sub-task when parent_key is given)
+        parent_key: Parent issue key (e.g., "PROJECT-123") - creates a subtask unless issue_type says otherwise
+        project_key: Project in which the issue is created (default: PROJECT_KEY)
+        fields: Other fields to set, e.g. labels, components and sprint (see task_fields)
+    
+    Returns:
+        Fields dictionary for the create issue payload
+    """
+    extra_fields = fields
+    fields = dict(issue_skeleton(project_key or PROJECT_KEY, issue_type, parent_key))
+    fields["summary"] = summary
+    fields["description"] = text_to_adf(description)
+    
+    # Add assignee if provided
+    if assignee_account_id:
+        fields["assignee"] = {
+            "accountId": assignee_account_id
+        }
+    if extra_fields:
+        fields.update(extra_fields)
+    
+    return fields
+
+def sprint_field(client) -> str:
+    """Get the ID of the Sprint field of the project of a client (JiraClient or AsyncJiraClient)"""
+    if client.metadata is not None and client.metadata.sprint_field:
+        return client.metadata.sprint_field
+    return SPRINT_FIELD
+
+def task_fields(task: Dict, client) -> Optional[Dict]:
+    """
+    Get the fields set by the LABELS, COMPONENT and SPRINT lines of a task
+    
+    Args:
+        task: Parsed task
+        client: Client the task is created with (gives the ID of the Sprint field)
+    
+    Returns:
+        Fields to add to the create issue payload, or None if the task sets none
+    """
+    fields = {}
+    if task.get('labels'):
+        fields["labels"] = task['labels']
+    if task.get('components'):
+        fields["components"] = [{"name": name} for name in task['components']]
+    if task.get('sprint'):
+        sprint = task['sprint']
+        fields[sprint_field(client)] = int(sprint) if sprint.isdigit() else sprint
+    return fields or None
+
+def prepare_issue_payload(task: Dict) -> bytes:
+    """
+    Encode the parts of a create issue request that only depend on the task
+    
+    The summary and the converted description are the expensive part of a
+    payload; issue_payload completes them with the project, issue type,
+    parent and assignee once those are known.
+    
+    Args:
+        task: Parsed task
+    
+    Returns:
+        The "summary" and "description" members of the fields object, as JSON without braces
+    """
+    return encode_json({"summary": task['summary'], "description": text_to_adf(task['description'])})[1:-1]
+
+def issue_payload(summary: str, description: str, assignee_account_id: Optional[str] = None,
+                  issue_type: Optional[str] = None, parent_key: Optional[str] = None,
+                  project_key: Optional[str] = None, prepared: Optional[bytes] = None,
+                  fields: Optional[Dict] = None) -> bytes:
+    """
+    Encode the body of a create issue request ({"fields": ...})
+    
+    Args:
+        summary, description, assignee_account_id, issue_type, parent_key, project_key, fields:
+            See build_issue_fields
+        prepared: Summary and description encoded in advance by prepare_issue_payload
+                  (summary and description are then ignored)
+    """
+    if prepared is None:
+        return encode_json({"fields": build_issue_fields(summary, description, assignee_account_id, issue_type,
+                                                         parent_key, project_key=project_key, fields=fields)})
+    extra_fields = fields
+    fields = dict(issue_skeleton(project_key or PROJECT_KEY, issue_type, parent_key))
+    if assignee_account_id:
+        fields["assignee"] = {"accountId": assignee_account_id}
+    if extra_fields:
+        fields.update(extra_fields)
+    return b'{"fields":' + encode_json(fields)[:-1] + b',' + prepared + b'}}'
+
+def resolve_issue_type(client, issue_type: Optional[str], parent_key: Optional[str]) -> Optional[str]:
+    """
+    Get the issue type name sent for a task
+    
+    Uses the names of the project (see ProjectMetadata.resolve) once its
+    metadata is loaded, so "story" becomes "Story" and tasks with a parent
+    get the sub-task type of the project. Otherwise the type is sent as is
+    (the defaults of issue_skeleton apply).
+    
+    Args:
+        client: Client of the project (JiraClient or AsyncJiraClient)
+        issue_type: Issue type of the task (None for the default)
+        parent_key: Parent issue key, if any
+    """
+    if client.metadata is None:
+        return issue_type
+    return client.metadata.resolve(issue_type, parent_key is not None) or issue_type
+
+def get_error_details(e: requests.exceptions.RequestException) -> Dict:
+    """
+    Extract status code and Jira error messages from a failed request
+    
+    Args:
+        e: Exception raised by requests
+    
+    Returns:
+        Dictionary with 'error', 'status_code', 'response_text', 'error_messages' and 'errors'
+    """
+    if hasattr(e, 'response') and e.response is not None:
+        return build_error_details(str(e), e.response.status_code, e.response.text)
+    return build_error_details(str(e))
+
+def build_error_details(message: str, status_code: Optional[int] = None,
+                        response_text: Optional[str] = None) -> Dict:
+    """
+    Build the error dictionary of a failed request (see get_error_details)
+    
+    Args:
+        message: Error message
+        status_code: HTTP status of the response, if any
+        response_text: Body of the response, parsed for Jira error messages if it is JSON
+    """
+    error_details = {
+        'error': message,
+        'status_code': status_code,
+        'response_text': response_text,
+        'error_messages': [],
+        'errors': {}
+    }
+    if response_text:
+        try:
+            response_json = json.loads(response_text)
+            error_details['error_messages'] = response_json.get('errorMessages', [])
+            error_details['errors'] = response_json.get('errors', {})
+        except (json.JSONDecodeError, ValueError, AttributeError):
+            pass
+    return error_details
+
+def create_jira_issue(summary: str, description: str, assignee_account_id: Optional[str] = None, issue_type: Optional[str] = None, parent_key: Optional[str] = None, client: Optional[JiraClient] = None, prepared: Optional[bytes] = None, fields: Optional[Dict] = None) -> Dict:
+    """
+    Create a Jira issue using the REST API
+    
+    Args:
+        summary: Issue summary/title
+        description: Issue description
+        assignee_account_id: Account ID of the assignee (optional)
+        issue_type: Type of issue (default: Task, or Sub-task when parent_key is given)
+        parent_key: Parent issue key (e.g., "PROJECT-123") - creates a subtask unless issue_type says otherwise
+        client: Client used for the request (default: get_default_client())
+        prepared: Summary and description encoded by prepare_issue_payload (optional)
+        fields: Other fields to set, e.g. labels, components and sprint (see task_fields)
+    
+    Returns:
+        Response from Jira API
+    """
+    client = client or get_default_client()
+    
+    issue_type = resolve_issue_type(client, issue_type, parent_key)
+    payload = issue_payload(summary, description, assignee_account_id, issue_type, parent_key,
+                            project_key=client.project_key, prepared=prepared, fields=fields)
+    
+    try:
+        response = client.request("POST", "/rest/api/3/issue", data=payload)
+        response.raise_for_status()
+        return response.json()
+    except requests.exceptions.RequestException as e:
+        return {'error': get_error_details(e)}
+
+def bulk_payload(issues: List[Union[Dict, bytes]]) -> bytes:
+    """
+    Encode the body of a bulk create request
+    
+    Args:
+        issues: Fields dictionaries built by build_issue_fields, or bodies encoded by issue_payload
+    """
+    if not any(isinstance(issue, bytes) for issue in issues):
+        return encode_json({"issueUpdates": [{"fields": fields} for fields in issues]})
+    encoded = (issue if isinstance(issue, bytes) else encode_json({"fields": issue}) for issue in issues)
+    return b'{"issueUpdates":[' + b','.join(encoded) + b']}'
+
+def create_jira_issues_bulk(issue_fields: List[Union[Dict, bytes]], client: Optional[JiraClient] = None) -> List[Dict]:
+    """
+    Create up to BULK_BATCH_SIZE Jira issues with a single bulk create request
+    
+    Args:
+        issue_fields: List of fields dictionaries built by build_issue_fields
+                      (or request bodies encoded by issue_payload)
+        client: Client used for the request (default: get_default_client())
+    
+    Returns:
+        One result per input element, in the same order. Each result looks like
+        the one returned by create_jira_issue: either contains 'key' or 'error'.
+    """
+    client = client or get_default_client()
+    
+    try:
+        response = client.request("POST", "/rest/api/3/issue/bulk", data=bulk_payload(issue_fields))
+    except requests.exceptions.RequestException as e:
+        return [{'error': get_error_details(e)} for _ in issue_fields]
+    
+    return bulk_create_results(len(issue_fields), response.status_code, response.text, response.url)
+
+def bulk_create_results(count: int, status_code: int, response_text: str, url: str) -> List[Dict]:
+    """
+    Map the response of a bulk create request back to the issues of the request
+    
+    Args:
+        count: Number of issues in the request
+        status_code: HTTP status of the response
+        response_text: Body of the response
+        url: URL of the request (for error messages)
+    
+    Returns:
+        One result per issue of the request, as described in create_jira_issues_bulk
+    """
+    try:
+        response_json = json.loads(response_text)
+    except ValueError:
+        response_json = None
+    
+    # Jira answers 201 when at least one issue was created, 400 when all of them failed.
+    # Both carry an "issues" list (created issues, in request order) and an "errors" list
+    # where each entry points at the request element it belongs to.
+    if (status_code not in (200, 201, 400) or not isinstance(response_json, dict)
+            or (status_code == 400 and not response_json.get('errors'))):
+        error_details = build_error_details(f"{status_code} Error for url: {url}", status_code, response_text)
+        return [{'error': error_details} for _ in range(count)]
+    
+    element_errors = {}
+    for error in response_json.get('errors', []):
+        element = error.get('elementErrors', {})
+        element_errors[error.get('failedElementNumber')] = {
+            'error': f"Bulk create failed with status {error.get('status')}",
+            'status_code': error.get('status'),
+            'response_text': None,
+            'error_messages': element.get('errorMessages', []),
+            'errors': element.get('errors', {})
+        }
+    
+    created = iter(response_json.get('issues', []))
+    results = []
+    for position in range(count):
+        if position in element_errors:
+            results.append({'error': element_errors[position]})
+            continue
+        issue = next(created, None)
+        if issue is None:
+            results.append({'error': {
+                'error': "Bulk create returned fewer issues than requested",
+                'status_code': status_code, 'response_text': response_text,
+                'error_messages': [], 'errors': {}
+            }})
+        else:
+            results.append(issue)
+    return results
+
+def update_jira_issue(issue_key: str, fields: Dict, client: Optional[JiraClient] = None) -> Dict:
+    """
+    Update fields of an existing Jira issue
+    
+    Args:
+        issue_key: Issue key (e.g., PROJECT-123)
+        fields: Fields to set (same format as build_issue_fields)
+        client: Client used for the request (default: get_default_client())
+    
+    Returns:
+        {'key': issue_key} if successful, {'error': ...} otherwise
+    """
+    client = client or get_default_client()
+    
+    try:
+        response = client.request("PUT", f"/rest/api/3/issue/{issue_key}", data=encode_json({"fields": fields}))
+        response.raise_for_status()
+        return {'key': issue_key}
+    except requests.exceptions.RequestException as e:
+        return {'error': get_error_details(e)}
+
+def read_link_types(status_code: Optional[int], text: Optional[str] = None) -> List[Tuple[str, str, str]]:
+    """
+    Read the answer to GET /rest/api/3/issueLinkType
+    
+    Returns:
+        (name, outward, inward) of every link type of the site, or DEFAULT_LINK_TYPES
+        if the request failed
+    """
+    if status_code is None or status_code >= 400:
+        return DEFAULT_LINK_TYPES
+    try:
+        link_types = [(link_type['name'], link_type.get('outward', ''), link_type.get('inward', ''))
+                      for link_type in json.loads(text or "{}").get('issueLinkTypes', [])]
+    except (ValueError, AttributeError, KeyError, TypeError):
+        return DEFAULT_LINK_TYPES
+    return link_types or DEFAULT_LINK_TYPES
+
+def load_link_types(client: JiraClient) -> List[Tuple[str, str, str]]:
+    """Get the link types of the site of a client (see read_link_types)"""
+    try:
+        response = client.request("GET", "/rest/api/3/issueLinkType")
+    except requests.exceptions.RequestException:
+        return read_link_types(None)
+    return read_link_types(response.status_code, response.text)
+
+def resolve_link_type(phrase: str, link_types: List[Tuple[str, str, str]]) -> Optional[Tuple[str, bool]]:
+    """
+    Find the link type meant by the link type of a LINK line
+    
+    Args:
+        phrase: Name ("Blocks"), outward ("blocks") or inward ("is blocked by") description, any case
+        link_types: Link types of the site (see read_link_types)
+    
+    Returns:
+        Name of the link type and whether the phrase is its inward description
+        (the task is then the outward end), or None if the site has no such link type
+    """
+    phrase = " ".join(phrase.split()).lower()
+    for name, outward, inward in link_types:
+        if phrase in (name.lower(), outward.lower()):
+            return name, False
+    for name, outward, inward in link_types:
+        if phrase == inward.lower():
+            return name, True
+    return None
+
+def link_payload(link_type: str, inward: bool, issue_key: str, target_key: str) -> bytes:
+    """
+    Encode the body of a create issue link request
+    
+    Jira shows the outward description ("blocks") on the outwardIssue and
+    the inward one ("is blocked by") on the inwardIssue, so "A blocks B" is
+    sent with A as outwardIssue.
+    
+    Args:
+        link_type: Name of the link type
+        inward: Whether the LINK line used the inward description (see resolve_link_type)
+        issue_key: Issue of the task with the LINK line
+        target_key: Issue it is linked to
+    """
+    outward_key, inward_key = (target_key, issue_key) if inward else (issue_key, target_key)
+    return encode_json({"type": {"name": link_type}, "outwardIssue": {"key": outward_key},
+                        "inwardIssue": {"key": inward_key}})
+
+def create_issue_link(payload: bytes, client: Optional[JiraClient] = None) -> Dict:
+    """
+    Link two issues
+    
+    Jira does not duplicate a link that already exists, so the request is
+    retried like an idempotent one.
+    
+    Args:
+        payload: Request body encoded by link_payload
+        client: Client used for the request (default: get_default_client())
+    
+    Returns:
+        {} if successful, {'error': ...} otherwise
+    """
+    client = client or get_default_client()
+    
+    try:
+        response = client.request("POST", "/rest/api/3/issueLink", idempotent=True, data=payload)
+        response.raise_for_status()
+        return {}
+    except requests.exceptions.RequestException as e:
+        return {'error': get_error_details(e)}
+
+def search_issues(jql: str, fields: Optional[List[str]] = None, client: Optional[JiraClient] = None,
+                  page_size: int = SEARCH_PAGE_SIZE) -> List[Dict]:
+    """
+    Run a JQL search and return every matching issue
+    
+    Args:
+        jql: JQL query (e.g., 'project = "PROJECT"')
+        fields: Fields to return for each issue (default: summary, description, parent, issuetype)
+        client: Client used for the requests (default: get_default_client())
+        page_size: Number of issues requested per page
+    
+    Returns:
+        List of issues as returned by /rest/api/3/search
+    
+    Raises:
+        requests.exceptions.RequestException: If a page could not be fetched
+    """
+    client = client or get_default_client()
+    fields = fields or ["summary", "description", "parent", "issuetype"]
+    issues = []
+    start_at = 0
+    
+    while True:
+        params = {
+            "jql": jql,
+            "startAt": start_at,
+            "maxResults": page_size,
+            "fields": ",".join(fields)
+        }
+        response = client.request("GET", "/rest/api/3/search", params=params)
+        response.raise_for_status()
+        page = response.json()
+        page_issues = page.get('issues', [])
+        issues.extend(page_issues)
+        start_at += len(page_issues)
+        if not page_issues or start_at >= page.get('total', 0):
+            return issues
+
+def adf_to_text(node) -> str:
+    """
+    Extract the plain text of an Atlassian Document Format description
+    
+    Args:
+        node: ADF document (or any ADF node), a plain string or None
+    
+    Returns:
+        Text content with one line per block node
+    """
+    if node is None:
+        return ""
+    if isinstance(node, str):
+        return node
+    if node.get('type') == 'text':
+        return node.get('text', '')
+    if node.get('type') == 'hardBreak':
+        return "\n"
+    children = [adf_to_text(child) for child in node.get('content', [])]
+    if node.get('type') in ('doc', 'bulletList', 'orderedList', 'listItem', 'blockquote'):
+        return "\n".join(children)
+    return "".join(children)
+
+def split_tasks_file(file_path: str, chunk_bytes: int = PARSE_CHUNK_BYTES) -> List[Tuple[int, int]]:
+    """
+    Split a tasks file into byte ranges that can be parsed independently
+    
+    Every range but the first starts at a line accepted by the reader of
+    the file (a "---" separator line for text files, any line for JSON
+    Lines), so it holds whole tasks. A task larger than chunk_bytes stays
+    in one range.
+    
+    Args:
+        file_path: Path to the tasks file
+        chunk_bytes: Approximate size of a range
+    
+    Returns:
+        (start, end) byte offsets covering the whole file, in file order
+    """
+    reader = task_reader(file_path)
+    size = os.path.getsize(file_path)
+    ranges = []
+    start = 0
+    with open(file_path, 'rb') as f:
+        while start < size:
+            end = size
+            if start + chunk_bytes < size:
+                f.seek(start + chunk_bytes)
+                f.readline()  # Rest of a line cut in the middle
+                while True:
+                    line_start = f.tell()
+                    line = f.readline()
+                    if not line:
+                        break
+                    if reader.at_boundary(line):
+                        end = line_start
+                        break
+            ranges.append((start, end))
+            start = end
+    return ranges
+
+def parse_tasks_chunk(file_path: str, start: int, end: int, prepare: bool = True) -> Tuple[List[Dict], List[str]]:
+    """
+    Parse the tasks of a byte range of a tasks file (run in a worker process)
+    
+    Args:
+        file_path: Path to the tasks file
+        start: Offset of the range (see split_tasks_file)
+        end: Offset of the end of the range
+        prepare: Also encode the payload of every task ('payload' key, see prepare_issue_payload)
+    
+    Returns:
+        (tasks of the range in file order, messages about skipped tasks)
+    """
+    with open(file_path, 'rb') as f:
+        f.seek(start)
+        data = f.read(end - start)
+    reader = task_reader(file_path)
+    warnings = []
+    tasks = list(reader.parse(io.StringIO(data.decode(reader.encoding), newline=reader.newline), warnings.append))
+    if prepare:
+        for task in tasks:
+            task['payload'] = prepare_issue_payload(task)
+    return tasks, warnings
+
+def iter_tasks_parallel(file_path: str, processes: Optional[int] = None, prepare: bool = True,
+                        chunk_bytes: int = PARSE_CHUNK_BYTES,
+                        warn: Optional[Callable[[str], None]] = None) -> Iterator[Dict]:
+    """
+    Parse a tasks file with a pool of processes, yielding tasks in file order
+    
+    The file is split on "---" lines (split_tasks_file) and every piece is
+    parsed, and its payloads encoded, by a worker process. Only a few pieces
+    per process are read ahead, so memory stays bounded when the network is
+    slower than parsing. PARENT-n and ID references are resolved by the
+    consumer (TaskGraph), which sees the tasks in file order. Files of
+    formats that cannot be split (CSV, YAML, see TaskReader) are parsed in
+    this process.
+    
+    Args:
+        file_path: Path to the tasks file
+        processes: Number of worker processes (None or 0: one per CPU; 1: parse in this process with iter_tasks)
+        prepare: Encode the payload of every task in the workers ('payload' key)
+        chunk_bytes: Approximate size of the piece parsed by a worker at a time
+        warn: Called with a message for every task that is skipped (see TaskReader.parse)
+    
+    Yields:
+        Task dictionaries (see iter_tasks)
+    """
+    processes = processes or os.cpu_count() or 1
+    if processes == 1 or not task_reader(file_path).splittable:
+        yield from iter_tasks(file_path, warn)
+        return
+    
+    ranges = iter(split_tasks_file(file_path, chunk_bytes))
+    with ProcessPoolExecutor(max_workers=processes) as executor:
+        pending = deque(executor.submit(parse_tasks_chunk, file_path, start, end, prepare)
+                        for start, end in itertools.islice(ranges, processes * 2))
+        try:
+            while pending:
+                tasks, warnings = pending.popleft().result()
+                for start, end in itertools.islice(ranges, 1):
+                    pending.append(executor.submit(parse_tasks_chunk, file_path, start, end, prepare))
+                for message in warnings if warn else ():
+                    warn(message)
+                yield from tasks
+        finally:
+            for future in pending:
+                future.cancel()
+
+def validate_config(config: Optional["ImportConfig"] = None):
+    """Validate that required configuration is present (default: the configuration of this module)"""
+    errors = (config or ImportConfig()).errors()
+    
+    if errors:
+        print("Configuration errors found:")
+        for error in errors:
+            print(f"  - {error}")
+        print("\nPlease update the configuration and try again.")
+        sys.exit(1)
+
+def format_error_lines(result: Optional[Dict]) -> List[str]:
+    """
+    Turn the error dict returned by create_jira_issue into printable lines
+    
+    Args:
+        result: Result returned by create_jira_issue
+    
+    Returns:
+        List of error lines (may be empty)
+    """
+    lines = []
+    if result and 'error' in result:
+        error_info = result['error']
+        if isinstance(error_info, str):
+            return [f"Error: {error_info}"]
+        for msg in error_info.get('error_messages') or []:
+            lines.append(f"Error: {msg}")
+        for key, value in (error_info.get('errors') or {}).items():
+            lines.append(f"{key}: {value}")
+    return lines
+
+class RunResults:
+    """
+    Collects per-task results of a run and logs progress as they arrive.
+    
+    Results are stored by task index, so the final lists are in input order
+    no matter in which order the issues were actually created. When a journal
+    is given, created issues are recorded in it and tasks already present in
+    it are reported as resumed instead of being created again.
+    
+    Tasks can be given up front or added one by one with add() while the
+    tasks file is still being parsed. Finished tasks are reported to metrics.
+    
+    Tasks created in another site or project than the one of the run pass
+    the client they use as target to resumed_key() and record().
+    
+    When a store is given, every created issue is also added to it.
+    """
+    
+    def __init__(self, tasks: Optional[List[Dict]] = None, log: Callable[[str], None] = print,
+                 base_url: Optional[str] = None, project_key: Optional[str] = None,
+                 journal: Optional[RunJournal] = None, existing: Optional[Dict[int, str]] = None,
+                 metrics: Optional[RunMetrics] = None, store: Optional[IssueStore] = None):
+        self.tasks = []
+        self.metrics = metrics
+        self.store = store
+        self.log = log
+        self.base_url = base_url or JIRA_BASE_URL
+        self.project_key = project_key or PROJECT_KEY
+        self.journal = journal
+        self.results = []
+        self.sites = {}  # Maps the indexes of tasks whose issue exists to its (site, project), if not those of the run
+        self.parent_keys_map = {}  # Maps parent_ref (1, 2, 3...) to actual issue keys
+        self.done_count = 0
+        self.parsing = True  # False once every task has been added
+        self.graph = TaskGraph()
+        self.fingerprinter = TaskFingerprinter(self.graph) if journal else None
+        self._previous = {}  # Maps (site, project) to the issues recorded in the journal for it
+        self.existing = existing or {}  # Maps task indexes to issues found in Jira (sync mode)
+        self.previous_for(self.base_url, self.project_key)
+        if tasks is not None:
+            for task in tasks:
+                self.add(task)
+            self.finish_adding()
+    
+    def add(self, task: Dict) -> int:
+        """Add the next task of the run and return its index"""
+        self.tasks.append(task)
+        self.results.append(None)
+        self.graph.add(task)
+        if self.fingerprinter:
+            self.fingerprinter.add(task)
+        if self.metrics:
+            self.metrics.set_total(len(self.tasks), final=False)
+        return len(self.tasks) - 1
+    
+    def finish_adding(self):
+        """Signal that every task of the run has been added"""
+        self.parsing = False
+        if self.fingerprinter:
+            self.fingerprinter.finish()
+        if self.metrics:
+            self.metrics.set_total(len(self.tasks))
+    
+    def _progress(self) -> str:
+        total = f"{len(self.tasks)}+" if self.parsing else f"{len(self.tasks)}"
+        return f"[{self.done_count}/{total}]"
+    
+    def previous_for(self, base_url: str, project_key: str) -> Dict[str, str]:
+        """Get the issues a previous run created in a site and project (fingerprint -> key)"""
+        target = (base_url, project_key)
+        if target not in self._previous:
+            self._previous[target] = self.journal.completed(base_url, project_key) if self.journal else {}
+            if self._previous[target]:
+                where = project_key if base_url == self.base_url else f"{project_key} ({base_url})"
+                self.log(f"Resuming: {len(self._previous[target])} issue(s) in {where} already recorded "
+                         f"in {self.journal.path}")
+        return self._previous[target]
+    
+    def resumed_key(self, index: int, target=None) -> Optional[str]:
+        """
+        Get the key of an issue that already exists for a task (previous run or sync), if any
+        
+        Args:
+            index: Task index
+            target: Client the task is created with (default: site and project of the run)
+        """
+        if index in self.existing:
+            return self.existing[index]
+        if not self.journal:
+            return None
+        previous = (self.previous_for(target.base_url, target.project_key) if target
+                    else self.previous_for(self.base_url, self.project_key))
+        fingerprint = self.fingerprinter.fingerprints[index]
+        return previous.get(fingerprint) if previous and fingerprint else None
+    
+    def skip(self, index: int, issue_key: str, target=None):
+        """Mark a task as already existing in Jira (target: client of the task, see record)"""
+        if target and (target.base_url, target.project_key) != (self.base_url, self.project_key):
+            self.sites[index] = (target.base_url, target.project_key)
+        self.done_count += 1
+        if self.metrics:
+            self.metrics.task_finished('skipped')
+        self.results[index] = {'key': issue_key, 'error': None, 'resumed': True}
+        reason = "Already exists" if index in self.existing else "Already created"
+        self.log(f"{self._progress()} ↷ {reason}: {issue_key} - {self.tasks[index]['summary']}")
+    
+    def record(self, index: int, result: Optional[Dict], parent_ref: Optional[int] = None,
+               parent_key: Optional[str] = None, target=None) -> Optional[str]:
+        """
+        Store the result of create_jira_issue for a task and return the created key
+        
+        Args:
+            index: Task index
+            result: Result returned by create_jira_issue
+            parent_ref: PARENT-n number of the task if it is a parent task (for the journal)
+            parent_key: Parent issue key the task was created under (for the journal)
+            target: Client the task was created with (default: site and project of the run)
+        """
+        base_url = target.base_url if target else self.base_url
+        project_key = target.project_key if target else self.project_key
+        task = self.tasks[index]
+        self.done_count += 1
+        created = bool(result and 'key' in result)
+        if self.metrics:
+            self.metrics.task_finished('created' if created else 'failed')
+        
+        if created:
+            issue_key = result['key']
+            self.results[index] = {'key': issue_key, 'error': None}
+            if (base_url, project_key) != (self.base_url, self.project_key):
+                self.sites[index] = (base_url, project_key)
+            if self.journal:
+                self.journal.record(self.fingerprinter.fingerprints[index], issue_key, base_url, project_key,
+                                    task['summary'], parent_ref=parent_ref, parent_key=parent_key)
+            if self.store:
+                self.store.record(base_url, project_key, issue_key, task['summary'],
+                                  parent_key=parent_key, issue_type=task.get('type'))
+            issue_url = f"{base_url}/browse/{issue_key}"
+            self.log(f"{self._progress()} ✓ Created: {issue_key} - {task['summary']} - {issue_url}")
+            return issue_key
+        
+        self.results[index] = {'key': None, 'error': result.get('error') if result else None}
+        self.log(f"{self._progress()} ✗ Failed: {task['summary']}")
+        for line in format_error_lines(result):
+            self.log(f"    {line}")
+        return None
+    
+    def fail(self, index: int, message: str):
+        """Mark a task as failed without sending it to Jira"""
+        self.record(index, {'error': message})
+    
+    def links(self) -> List[Dict]:
+        """
+        Get the LINK lines of the tasks whose issue exists, with the issue keys of both ends
+        
+        Returns:
+            Dictionaries with 'key' (issue of the task), 'type' and 'target' (as written in the
+            file), 'target_key' (None if the linked task has no issue), 'base_url' and
+            'project_key' (where the issue of the task is) and 'target_base_url'
+        """
+        links = []
+        for index, task in enumerate(self.tasks):
+            result = self.results[index]
+            if not task.get('links') or not result or not result['key']:
+                continue
+            base_url, project_key = self.sites.get(index, (self.base_url, self.project_key))
+            for link_type, target in task['links']:
+                reference = TaskGraph.link_reference(target)
+                if reference is None:
+                    target_key, target_base_url = target.upper(), base_url
+                else:
+                    target_index = self.graph.names.get(reference)
+                    target_result = self.results[target_index] if target_index is not None else None
+                    target_key = target_result['key'] if target_result else None
+                    target_base_url = self.sites.get(target_index, (self.base_url,))[0]
+                links.append({'key': result['key'], 'type': link_type, 'target': target, 'target_key': target_key,
+                              'base_url': base_url, 'project_key': project_key,
+                              'target_base_url': target_base_url})
+        return links
+    
+    def outcome(self) -> Dict:
+        """
+        Returns:
+            Dictionary with 'results' (one entry per task, in input order, None
+            for tasks not sent because the run was cancelled), 'created_issues',
+            'resumed_issues', 'failed_issues', 'cancelled_issues',
+            'parent_keys_map', 'parent_count', 'subtask_count', 'links'
+            (LINK lines to create, see links()) and 'metrics' (RunMetrics
+            snapshot, if metrics are collected)
+        """
+        subtask_count = sum(1 for task in self.tasks if is_subtask(task))
+        outcome = {
+            'results': self.results,
+            'created_issues': [r['key'] for r in self.results if r and r['key'] and not r.get('resumed')],
+            'resumed_issues': [r['key'] for r in self.results if r and r.get('resumed')],
+            'failed_issues': [task['summary'] for task, r in zip(self.tasks, self.results)
+                              if r and not r['key']],
+            'cancelled_issues': [task['summary'] for task, r in zip(self.tasks, self.results) if r is None],
+            'parent_keys_map': self.parent_keys_map,
+            'parent_count': len(self.tasks) - subtask_count,
+            'subtask_count': subtask_count,
+            'links': self.links(),
+        }
+        if self.metrics:
+            outcome['metrics'] = self.metrics.snapshot()
+        return outcome
+
+class RunControl:
+    """
+    Pause, resume and cancel requests for a run, safe to use from any thread
+    (GUI buttons, signal handlers).
+    
+    The creation engines stop sending new requests while the run is paused
+    or once it is cancelled; issues already sent are still handled, so they
+    end up in the results and in the journal. After cancel(), requests in
+    flight are waited for until drain_timeout seconds have passed.
+    """
+    
+    def __init__(self, drain_timeout: float = DRAIN_TIMEOUT):
+        """
+        Args:
+            drain_timeout: Seconds to wait for requests already sent once the run is cancelled
+        """
+        self.drain_timeout = drain_timeout
+        self._resumed = threading.Event()
+        self._resumed.set()
+        self._cancelled = threading.Event()
+        self._cancel_time = None
+    
+    def pause(self):
+        """Stop sending new requests until resume()"""
+        if not self.cancelled:
+            self._resumed.clear()
+    
+    def resume(self):
+        """Send requests again after pause()"""
+        self._resumed.set()
+    
+    def cancel(self):
+        """Stop sending new requests for good (also ends a pause)"""
+        if self._cancel_time is None:
+            self._cancel_time = time.monotonic()
+        self._cancelled.set()
+        self._resumed.set()
+    
+    @property
+    def paused(self) -> bool:
+        return not self._resumed.is_set()
+    
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+    
+    @property
+    def dispatching(self) -> bool:
+        """Whether new requests may be sent"""
+        return self._resumed.is_set() and not self._cancelled.is_set()
+    
+    def wait_resumed(self, timeout: float = CONTROL_POLL_INTERVAL) -> bool:
+        """Wait until the run is resumed or cancelled (returns False on timeout)"""
+        return self._resumed.wait(timeout)
+    
+    def wait_timeout(self) -> float:
+        """Seconds to wait for requests in flight before checking again (0 once the drain deadline passed)"""
+        if self._cancel_time is None:
+            return CONTROL_POLL_INTERVAL
+        remaining = self._cancel_time + self.drain_timeout - time.monotonic()
+        return max(0.0, min(CONTROL_POLL_INTERVAL, remaining))
+    
+    def next_done(self, completed: queue.Queue):
+        """Wait for the next finished future put in completed (None once the drain deadline passed)"""
+        while True:
+            timeout = self.wait_timeout()
+            if timeout <= 0:
+                return None
+            try:
+                return completed.get(timeout=timeout)
+            except queue.Empty:
+                pass
+
+def drain_expired(run: RunResults, indexes: Iterable[int]):
+    """Report the tasks whose request got no answer before the drain deadline of a cancelled run"""
+    indexes = list(indexes)
+    if not indexes:
+        return
+    run.log(f"⚠ {len(indexes)} request(s) got no answer before the drain deadline; their issues may still "
+            f"be created in Jira without being recorded (use sync mode on the next run to avoid duplicates)")
+    for index in indexes:
+        run.record(index, {'error': "No answer before the drain deadline of the cancelled run, "
+                                    "the issue may exist anyway"})
+
+def create_issues_concurrently(tasks: Iterable[Dict], assignee_account_id: Optional[str] = None,
+                               max_workers: int = MAX_WORKERS,
+                               log: Callable[[str], None] = print,
+                               client: Optional[JiraClient] = None,
+                               journal: Optional[RunJournal] = None,
+                               existing: Optional[Dict[int, str]] = None,
+                               account_ids: Optional[Dict[str, Optional[str]]] = None,
+                               clients: Optional[JiraClients] = None,
+                               priorities: Optional[List[int]] = None,
+                               control: Optional[RunControl] = None,
+                               store: Optional[IssueStore] = None) -> Dict:
+    """
+    Create tasks of any hierarchy depth using a bounded pool of worker threads.
+    
+    Tasks without parent in the file (and tasks with an explicit parent key)
+    are ready as soon as they are read; a task pointing at another task
+    (PARENT-n or an ID) is ready as soon as that task has been created, so
+    parents are always created before their children (see TaskScheduler).
+    Progress lines are logged as issues complete; the returned lists are
+    always in input order.
+    
+    tasks may be a generator such as iter_tasks(): issues are then sent while
+    the file is still being parsed, and parsing pauses whenever too many
+    issues are waiting for a free worker.
+    
+    Tasks with a PROJECT: or SITE: directive are created with their own
+    client from clients; all targets share the same pool of workers.
+    
+    control pauses the run (nothing is sent and reading stops, answers of
+    issues already sent are still handled) or cancels it: no more tasks are
+    read or sent, issues already sent are waited for (up to the drain
+    deadline) and the tasks left are reported as cancelled.
+    
+    Args:
+        tasks: Tasks as returned by parse_tasks_file or iter_tasks
+        assignee_account_id: Account ID of the assignee for tasks without ASSIGNEE (optional)
+        max_workers: Maximum number of issues created at the same time
+        log: Function used to report progress (print for the CLI, GUI log for the GUI)
+        client: Client shared by all worker threads (default: get_default_client())
+        journal: Journal used to skip tasks created by a previous run and record new ones
+        existing: Task indexes mapped to issues that already exist in Jira (see plan_sync)
+        account_ids: Account IDs of ASSIGNEE emails (see resolve_account_ids)
+        clients: Clients of other sites and projects (default: created from client)
+        priorities: TaskGraph.heights() of the whole file, to create the longest chains first
+                    (computed here when tasks is a list)
+        control: Pause, resume and cancel requests for the run
+        store: Issue store the created issues are added to
+    
+    Returns:
+        Dictionary described in RunResults.outcome
+    """
+    client = client or get_default_client()
+    clients = clients or JiraClients(client)
+    if priorities is None and isinstance(tasks, list):
+        priorities = TaskGraph.from_tasks(tasks).heights()
+    max_workers = max(1, max_workers)
+    max_pending = max_workers * 4  # Ready issues waiting for a worker before parsing pauses
+    run = RunResults(None, log, client.base_url, client.project_key, journal, existing, client.metrics, store)
+    scheduler = TaskScheduler(run, clients, priorities)
+    completed = queue.Queue()  # Futures are put here by the worker threads when they finish
+    
+    executor = ThreadPoolExecutor(max_workers=max_workers)
+    futures = {}
+    
+    def submit_ready():
+        # Keep every worker busy with the most important ready tasks (none while paused or cancelled)
+        while len(futures) < max_workers and (control is None or control.dispatching):
+            batch = scheduler.pop()
+            if not batch:
+                return
+            index, parent_key, target = batch[0]
+            task = run.tasks[index]
+            future = executor.submit(create_jira_issue, task['summary'], task['description'],
+                                     task_assignee(task, assignee_account_id, account_ids),
+                                     task.get('type'), parent_key=parent_key, client=target,
+                                     prepared=task.pop('payload', None), fields=task_fields(task, target))
+            futures[future] = index
+            future.add_done_callback(completed.put)
+    
+    def handle(future):
+        index = futures.pop(future)
+        try:
+            result = future.result()
+        except Exception as e:
+            result = {'error': str(e)}
+        scheduler.record(index, result)
+    
+    def handle_next() -> bool:
+        # Handle the next finished issue and refill the pool; False once the drain deadline passed
+        future = control.next_done(completed) if control else completed.get()
+        if future is None:
+            return False
+        handle(future)
+        submit_ready()
+        return True
+    
+    try:
+        for task in tasks:
+            # Nothing is read while paused, but answers of issues already sent are handled
+            while control and control.paused:
+                if not futures:
+                    control.wait_resumed()
+                elif not handle_next():
+                    break
+            if control and control.cancelled:
+                break
+            scheduler.add(task)
+            
+            # Handle finished issues right away so their children can start,
+            # and wait for the pool to catch up if too much work is queued
+            while not completed.empty():
+                handle(completed.get())
+            submit_ready()
+            while futures and len(futures) + scheduler.ready_count >= max_pending:
+                if not handle_next():
+                    break
+        else:
+            # Tasks pointing at a PARENT-n that does not exist (or at each other) can never be created
+            scheduler.finish()
+        submit_ready()
+        while futures or (control and control.paused and scheduler.ready_count):
+            if not futures:
+                control.wait_resumed()
+                submit_ready()
+            elif not handle_next():
+                break
+        drain_expired(run, futures.values())
+    finally:
+        # Requests still running after the drain deadline are not waited for
+        executor.shutdown(wait=not futures)
+    
+    return run.outcome()
+
+def create_issues_in_bulk(tasks: Iterable[Dict], assignee_account_id: Optional[str] = None,
+                          batch_size: int = BULK_BATCH_SIZE, max_workers: int = MAX_WORKERS,
+                          log: Callable[[str], None] = print,
+                          client: Optional[JiraClient] = None,
+                          journal: Optional[RunJournal] = None,
+                          existing: Optional[Dict[int, str]] = None,
+                          account_ids: Optional[Dict[str, Optional[str]]] = None,
+                          clients: Optional[JiraClients] = None,
+                          control: Optional[RunControl] = None,
+                          store: Optional[IssueStore] = None) -> Dict:
+    """
+    Create tasks of any hierarchy depth with Jira's bulk create endpoint.
+    
+    Tasks are sent in batches of up to batch_size issues, taken from the
+    tasks that are ready (see TaskScheduler): top-level tasks first, then
+    every child as soon as its parent batch has been created. Up to
+    max_workers batches are sent in parallel; a batch never mixes tasks of
+    different sites or projects. A generator of tasks is read completely
+    before anything is sent, so the longest chains are always created first.
+    
+    Args:
+        tasks: Tasks as returned by parse_tasks_file or iter_tasks
+        assignee_account_id: Account ID of the assignee for tasks without ASSIGNEE (optional)
+        batch_size: Number of issues per bulk request (Jira accepts at most 50)
+        max_workers: Maximum number of bulk requests sent at the same time
+        log: Function used to report progress
+        client: Client shared by all worker threads (default: get_default_client())
+        journal: Journal used to skip tasks created by a previous run and record new ones
+        existing: Task indexes mapped to issues that already exist in Jira (see plan_sync)
+        account_ids: Account IDs of ASSIGNEE emails (see resolve_account_ids)
+        clients: Clients of other sites and projects (default: created from client)
+        control: Pause, resume and cancel requests for the run (see create_issues_concurrently)
+        store: Issue store the created issues are added to
+    
+    Returns:
+        Dictionary described in RunResults.outcome
+    """
+    client = client or get_default_client()
+    clients = clients or JiraClients(client)
+    tasks = list(tasks)
+    batch_size = max(1, min(batch_size, BULK_BATCH_SIZE))
+    max_workers = max(1, max_workers)
+    run = RunResults(None, log, client.base_url, client.project_key, journal, existing, client.metrics, store)
+    scheduler = TaskScheduler(run, clients, TaskGraph.from_tasks(tasks).heights())
+    for task in tasks:
+        scheduler.add(task)
+    scheduler.finish()
+    
+    executor = ThreadPoolExecutor(max_workers=max_workers)
+    futures = {}
+    try:
+        while True:
+            while len(futures) < max_workers and (control is None or control.dispatching):
+                batch = scheduler.pop(batch_size)
+                if not batch:
+                    break
+                issue_fields = [
+                    issue_payload(tasks[index]['summary'], tasks[index]['description'],
+                                  task_assignee(tasks[index], assignee_account_id, account_ids),
+                                  resolve_issue_type(target, tasks[index].get('type'), parent_key),
+                                  parent_key=parent_key, project_key=target.project_key,
+                                  prepared=tasks[index].pop('payload', None),
+                                  fields=task_fields(tasks[index], target))
+                    for index, parent_key, target in batch
+                ]
+                futures[executor.submit(create_jira_issues_bulk, issue_fields, batch[0][2])] = batch
+            if not futures:
+                if control and control.paused and scheduler.ready_count:
+                    control.wait_resumed()
+                    continue
+                break
+            
+            timeout = control.wait_timeout() if control else None
+            if timeout == 0:
+                break
+            done, _ = wait(futures, timeout=timeout, return_when=FIRST_COMPLETED)
+            for future in done:
+                batch = futures.pop(future)
+                try:
+                    batch_results = future.result()
+                except Exception as e:
+                    batch_results = [{'error': str(e)} for _ in batch]
+                for (index, _, _), result in zip(batch, batch_results):
+                    scheduler.record(index, result)
+        drain_expired(run, [index for batch in futures.values() for index, _, _ in batch])
+    finally:
+        # Batches still running after the drain deadline are not waited for
+        executor.shutdown(wait=not futures)
+    
+    return run.outcome()
+
+def plan_sync(tasks: List[Dict], client: Optional[JiraClient] = None,
+              log: Callable[[str], None] = print,
+              clients: Optional[JiraClients] = None) -> Dict:
+    """
+    Compare parsed tasks with the issues that already exist in the project
+    
+    Runs one paginated JQL search per project used by the tasks and indexes
+    the issues by (project, parent key, summary). Issues that are not
+    subtasks are also indexed with a parent key of None. Tasks without
+    parent are matched by summary, other tasks by the key of their (matched)
+    parent and their summary, level by level. Identical summaries are
+    matched in order of appearance.
+    
+    Args:
+        tasks: Tasks as returned by parse_tasks_file
+        client: Client used for the search (default: get_default_client())
+        log: Function used to report progress
+        clients: Clients of other sites and projects (default: created from client)
+    
+    Returns:
+        Dictionary with 'existing' (task index -> existing issue key) and
+        'changed' (indexes of matched tasks whose description differs)
+    """
+    client = client or get_default_client()
+    clients = clients or JiraClients(client)
+    targets = clients.for_tasks(tasks)
+    
+    index = {}  # Maps (client, parent key, summary) to the existing issues, oldest first
+    for target in {id(target): target for target in targets}.values():
+        log(f"Searching existing issues in project {target.project_key}...")
+        issues = search_issues(f'project = "{target.project_key}" ORDER BY key ASC', client=target)
+        log(f"  ✓ Found {len(issues)} existing issue(s)")
+        for issue in issues:
+            fields = issue.get('fields') or {}
+            summary = (fields.get('summary') or '').strip()
+            parent_key = (fields.get('parent') or {}).get('key')
+            if parent_key:
+                index.setdefault((id(target), parent_key, summary), []).append(issue)
+            if not (fields.get('issuetype') or {}).get('subtask', False):
+                index.setdefault((id(target), None, summary), []).append(issue)
+    
+    taken = set()  # Keys of matched issues (an issue can be indexed twice)
+    
+    def take(task_index: int, parent_key: Optional[str], summary: str) -> Optional[Dict]:
+        candidates = index.get((id(targets[task_index]), parent_key, summary.strip()))
+        while candidates:
+            issue = candidates.pop(0)
+            if issue['key'] not in taken:
+                taken.add(issue['key'])
+                return issue
+        return None
+    
+    existing = {}
+    changed = []
+    
+    def match(task_index: int, parent_key: Optional[str]) -> Optional[str]:
+        task = tasks[task_index]
+        issue = take(task_index, parent_key, task['summary'])
+        if issue is None:
+            return None
+        existing[task_index] = issue['key']
+        # Compare the text Jira would render, so markdown syntax does not count as a change
+        description = adf_to_text((issue.get('fields') or {}).get('description'))
+        if description.strip() != adf_to_text(text_to_adf(task['description'])).strip():
+            changed.append(task_index)
+        return issue['key']
+    
+    # Parents are matched before their children; children of unmatched parents do not exist yet
+    graph = TaskGraph.from_tasks(tasks)
+    for task_index in graph.order():
+        parent = graph.parents[task_index]
+        if task_index not in graph.references:
+            match(task_index, tasks[task_index].get('parent_key'))
+        elif parent in existing:
+            match(task_index, existing[parent])
+    
+    log(f"  {len(existing)} task(s) already exist ({len(changed)} with a changed description), "
+        f"{len(tasks) - len(existing)} to create\n")
+    return {'existing': existing, 'changed': sorted(changed)}
+
+def update_issue_descriptions(tasks: List[Dict], plan: Dict, max_workers: int = MAX_WORKERS,
+                              log: Callable[[str], None] = print,
+                              client: Optional[JiraClient] = None,
+                              clients: Optional[JiraClients] = None) -> Dict:
+    """
+    Update the description of existing issues that changed in the tasks file
+    
+    Args:
+        tasks: Tasks as returned by parse_tasks_file
+        plan: Dictionary returned by plan_sync
+        max_workers: Maximum number of updates sent at the same time
+        log: Function used to report progress
+        client: Client shared by all worker threads (default: get_default_client())
+        clients: Clients of other sites and projects (default: created from client)
+    
+    Returns:
+        Dictionary with 'updated_issues' and 'failed_updates' (issue keys, in input order)
+    """
+    client = client or get_default_client()
+    clients = clients or JiraClients(client)
+    targets = clients.for_tasks(tasks)
+    changed = plan['changed']
+    updated = {}
+    
+    if changed:
+        log(f"Updating {len(changed)} changed description(s)...")
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+        futures = {}
+        for task_index in changed:
+            task = tasks[task_index]
+            fields = {"description": build_issue_fields(task['summary'], task['description'])["description"]}
+            futures[executor.submit(update_jira_issue, plan['existing'][task_index], fields,
+                                    targets[task_index])] = task_index
+        
+        while futures:
+            done, _ = wait(futures, return_when=FIRST_COMPLETED)
+            for future in done:
+                task_index = futures.pop(future)
+                issue_key = plan['existing'][task_index]
+                try:
+                    result = future.result()
+                except Exception as e:
+                    result = {'error': str(e)}
+                updated[task_index] = 'key' in result
+                if updated[task_index]:
+                    log(f"  ✓ Updated: {issue_key} - {tasks[task_index]['summary']}")
+                else:
+                    log(f"  ✗ Failed to update: {issue_key} - {tasks[task_index]['summary']}")
+                    for line in format_error_lines(result):
+                        log(f"    {line}")
+    
+    return {
+        'updated_issues': [plan['existing'][i] for i in changed if updated.get(i)],
+        'failed_updates': [plan['existing'][i] for i in changed if not updated.get(i)],
+    }
+
+def describe_link(link: Dict) -> str:
+    """Describe a link of RunResults.links, e.g. "PROJECT-1 blocks PROJECT-2\""""
+    return f"{link['key']} {link['type']} {link['target_key'] or link['target']}"
+
+def plan_issue_links(links: List[Dict], link_types: Dict[str, List[Tuple[str, str, str]]],
+                     log: Callable[[str], None] = print) -> Tuple[List[Tuple[Dict, bytes]], List[str]]:
+    """
+    Check the links of a run and encode their requests
+    
+    Args:
+        links: Links returned by RunResults.links
+        link_types: Maps every site of the links to its link types (see read_link_types)
+        log: Function used to report links that cannot be created
+    
+    Returns:
+        (link, request body) pairs to send, and the descriptions of the links that cannot be created
+    """
+    planned = []
+    failed = []
+    for link in links:
+        problem = None
+        resolved = None
+        if link['target_key'] is None:
+            problem = f"linked task {link['target']} was not created"
+        elif link['target_base_url'] != link['base_url']:
+            problem = "issues of different Jira sites cannot be linked"
+        else:
+            resolved = resolve_link_type(link['type'], link_types[link['base_url']])
+            if resolved is None:
+                available = ", ".join(outward for _, outward, _ in link_types[link['base_url']])
+                problem = f"unknown link type '{link['type']}' (available: {available})"
+        if problem:
+            failed.append(describe_link(link))
+            log(f"  ✗ Cannot link {describe_link(link)}: {problem}")
+        else:
+            planned.append((link, link_payload(*resolved, link['key'], link['target_key'])))
+    return planned, failed
+
+def create_issue_links(links: List[Dict], max_workers: int = MAX_WORKERS,
+                       log: Callable[[str], None] = print,
+                       client: Optional[JiraClient] = None,
+                       clients: Optional[JiraClients] = None,
+                       control: Optional[RunControl] = None) -> Dict:
+    """
+    Create the links of the LINK lines of a run, once all its issues exist
+    
+    Jira links one pair of issues per request, so links are sent in
+    parallel: up to max_workers at a time, the next one as soon as a request
+    finishes. Throttled and failed requests are retried (see create_issue_link).
+    The link types of every site are loaded first, so LINK lines may use
+    their names or descriptions.
+    
+    Args:
+        links: Links returned by RunResults.links (outcome['links'])
+        max_workers: Maximum number of links created at the same time
+        log: Function used to report progress
+        client: Client of the run (default: get_default_client())
+        clients: Clients of other sites and projects (default: created from client)
+        control: Pause, resume and cancel requests (see create_issues_concurrently)
+    
+    Returns:
+        Dictionary with 'linked_issues' and 'failed_links' (descriptions such as "PROJECT-1 blocks PROJECT-2")
+    """
+    if not links:
+        return {'linked_issues': [], 'failed_links': []}
+    client = client or get_default_client()
+    clients = clients or JiraClients(client)
+    max_workers = max(1, max_workers)
+    
+    sites = {link['base_url']: link['project_key'] for link in links}
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(sites))) as executor:
+        loaded = executor.map(lambda site: load_link_types(clients.get(*site)), sites.items())
+        link_types = dict(zip(sites, loaded))
+    planned, failed = plan_issue_links(links, link_types, log)
+    linked = []
+    if planned:
+        log(f"Linking {len(planned)} issue pair(s)...")
+    
+    pending = iter(planned)
+    executor = ThreadPoolExecutor(max_workers=max_workers)
+    futures = {}
+    try:
+        while True:
+            while len(futures) < max_workers and (control is None or control.dispatching):
+                item = next(pending, None)
+                if item is None:
+                    break
+                link, payload = item
+                futures[executor.submit(create_issue_link, payload,
+                                        clients.get(link['base_url'], link['project_key']))] = link
+            if not futures:
+                if control and control.paused:
+                    control.wait_resumed()
+                    continue
+                break
+            
+            timeout = control.wait_timeout() if control else None
+            if timeout == 0:
+                break
+            done, _ = wait(futures, timeout=timeout, return_when=FIRST_COMPLETED)
+            for future in done:
+                link = futures.pop(future)
+                try:
+                    result = future.result()
+                except Exception as e:
+                    result = {'error': str(e)}
+                if 'error' in result:
+                    failed.append(describe_link(link))
+                    log(f"  ✗ Failed to link: {describe_link(link)}")
+                    for line in format_error_lines(result):
+                        log(f"    {line}")
+                else:
+                    linked.append(describe_link(link))
+                    log(f"  ✓ Linked: {describe_link(link)}")
+    finally:
+        # Requests still running after the drain deadline are not waited for
+        executor.shutdown(wait=not futures)
+    
+    # Links not sent (or not answered) because the run was cancelled
+    failed.extend(describe_link(link) for link in futures.values())
+    failed.extend(describe_link(link) for link, _ in pending)
+    return {'linked_issues': linked, 'failed_links': failed}
+
+def rollback_levels(issues: List[Dict]) -> List[List[Tuple[str, bool]]]:
+    """
+    Order issues for deletion, from the deepest level of their hierarchy up
+    
+    Jira refuses to delete an issue that still has subtasks, so every issue
+    comes after all listed issues below it (e.g. Sub-tasks, then Stories,
+    then Epics), like the creation order of TaskGraph reversed. Issues without
+    a parent or with listed children are deleted with deleteSubtasks=true, so
+    subtasks that were not listed (e.g. created by hand) never block a rollback.
+    
+    Args:
+        issues: Dictionaries with a 'key' and optionally a 'parent_key'
+    
+    Returns:
+        Levels of (issue key, delete subtasks) pairs, the deepest level first
+    """
+    parents = {issue['key']: issue.get('parent_key') for issue in issues}
+    with_children = {parent for parent in parents.values() if parent in parents}
+    levels = []
+    for key, parent in parents.items():
+        # Depth of the issue among the listed issues (the seen set guards against parent cycles)
+        depth = 0
+        seen = {key}
+        while parent in parents and parent not in seen:
+            seen.add(parent)
+            parent = parents[parent]
+            depth += 1
+        while len(levels) <= depth:
+            levels.append([])
+        levels[depth].append((key, not parents[key] or key in with_children))
+    return levels[::-1]
+
+def rollback_issues(issues: List[Dict], max_workers: int = MAX_WORKERS,
+                    log: Callable[[str], None] = print, client: Optional[JiraClient] = None,
+                    journal: Optional[RunJournal] = None, store: Optional[IssueStore] = None) -> Dict:
+    """
+    Delete issues concurrently, subtasks before their parents
+    
+    Issues are deleted one level of their hierarchy at a time, from the
+    deepest level up (see rollback_levels), the issues of a level in
+    parallel. Issues that no longer exist are counted as deleted.
+    
+    Args:
+        issues: Dictionaries with a 'key' and optionally a 'parent_key'
+        max_workers: Maximum number of issues deleted at the same time
+        log: Function used to report progress
+        client: Client shared by all worker threads (default: get_default_client())
+        journal: Journal in which deleted issues are recorded, so a later run creates them again
+        store: Issue store the deleted issues are removed from
+    
+    Returns:
+        Dictionary with 'deleted' and 'failed' issue keys
+    """
+    client = client or get_default_client()
+    levels = rollback_levels(issues)
+    total = sum(len(level) for level in levels)
+    deleted = set()
+    failed = set()
+    
+    def run_wave(level: List[Tuple[str, bool]]):
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+            futures = {
+                executor.submit(delete_jira_issue, key, client, delete_subtasks, True, log): (key, delete_subtasks)
+                for key, delete_subtasks in level
+            }
+            while futures:
+                done, _ = wait(futures, return_when=FIRST_COMPLETED)
+                for future in done:
+                    key, delete_subtasks = futures.pop(future)
+                    try:
+                        success = future.result()
+                    except Exception as e:
+                        log(f"Error deleting issue {key}: {e}")
+                        success = False
+                    if success:
+                        deleted.add(key)
+                        if journal:
+                            journal.record_deleted(key, client.base_url, client.project_key)
+                        if store:
+                            store.remove(client.base_url, key, subtasks=delete_subtasks)
+                        log(f"[{len(deleted) + len(failed)}/{total}] ✓ Deleted: {key}")
+                    else:
+                        failed.add(key)
+                        log(f"[{len(deleted) + len(failed)}/{total}] ✗ Failed to delete: {key}")
+    
+    for number, level in enumerate(levels, start=1):
+        log(f"Deleting {len(level)} " + ("parent task(s)..." if number == len(levels) else "subtask(s)..."))
+        run_wave(level)
+    
+    ordered = [key for level in levels for key, _ in level]
+    return {
+        'deleted': [key for key in ordered if key in deleted],
+        'failed': [key for key in ordered if key in failed],
+    }
+
+def rollback_targets_from_jql(jql: str, client: Optional[JiraClient] = None) -> List[Dict]:
+    """
+    Find the issues to roll back with a JQL query
+    
+    Args:
+        jql: JQL query selecting the issues to delete
+        client: Client used for the search (default: get_default_client())
+    
+    Returns:
+        List of dictionaries with 'key' and 'parent_key' for rollback_issues
+    """
+    issues = search_issues(jql, fields=["parent"], client=client)
+    return [
+        {'key': issue['key'], 'parent_key': ((issue.get('fields') or {}).get('parent') or {}).get('key')}
+        for issue in issues
+    ]
+
+def rollback_targets_from_journal(journal: RunJournal, clients: JiraClients) -> List[Tuple[JiraClient, List[Dict]]]:
+    """
+    Find the issues to roll back in the run journal of a tasks file
+    
+    Args:
+        journal: Run journal of the tasks file
+        clients: Clients of the run (one per site and project the file created issues in)
+    
+    Returns:
+        (client, issues for rollback_issues) pairs, one per site and project that has issues to delete
+    """
+    targets = [(clients.get(base_url, project_key), journal.created(base_url, project_key))
+               for base_url, project_key in journal.targets()]
+    return [(target, issues) for target, issues in targets if issues]
+
+def rollback_issues_per_target(targets: List[Tuple[JiraClient, List[Dict]]], max_workers: int = MAX_WORKERS,
+                               log: Callable[[str], None] = print, journal: Optional[RunJournal] = None,
+                               store: Optional[IssueStore] = None) -> Dict:
+    """
+    Delete the issues of several sites and projects (see rollback_issues)
+    
+    Every target has its own connection pool and rate limiter, so the
+    targets are rolled back in parallel.
+    
+    Args:
+        targets: (client, issues) pairs, e.g. from rollback_targets_from_journal
+        max_workers: Maximum number of issues deleted at the same time per target
+        log: Function used to report progress
+        journal: Journal in which deleted issues are recorded, so a later run creates them again
+        store: Issue store the deleted issues are removed from
+    
+    Returns:
+        Dictionary with 'deleted' and 'failed' issue keys of all targets
+    """
+    result = {'deleted': [], 'failed': []}
+    if not targets:
+        return result
+    with ThreadPoolExecutor(max_workers=len(targets)) as executor:
+        futures = [executor.submit(rollback_issues, issues, max_workers=max_workers, log=log,
+                                   client=target, journal=journal, store=store)
+                   for target, issues in targets]
+        for future in futures:
+            target_result = future.result()
+            result['deleted'].extend(target_result['deleted'])
+            result['failed'].extend(target_result['failed'])
+    return result
+
+def print_summary(outcome: Dict, log: Callable[[str], None] = print):
+    """
+    Print the summary of a run
+    
+    Args:
+        outcome: Dictionary returned by create_issues_concurrently or create_issues_in_bulk
+        log: Function used to output lines
+    """
+    created_issues = outcome['created_issues']
+    failed_issues = outcome['failed_issues']
+    
+    log("=" * 60)
+    log("SUMMARY")
+    log("=" * 60)
+    log(f"Successfully created: {len(created_issues)} issues")
+    if outcome.get('resumed_issues'):
+        log(f"Already existing (skipped): {len(outcome['resumed_issues'])} issues")
+    if 'updated_issues' in outcome:
+        log(f"Updated descriptions: {len(outcome['updated_issues'])} issues")
+    if outcome.get('linked_issues'):
+        log(f"Linked: {len(outcome['linked_issues'])} issue pair(s)")
+    log(f"  - Parent tasks: {outcome['parent_count']}")
+    log(f"  - Subtasks: {outcome['subtask_count']}")
+    if created_issues:
+        log("\nCreated issues:")
+        for key in created_issues:
+            log(f"  - {key}")
+    
+    if failed_issues:
+        log(f"\nFailed to create: {len(failed_issues)} issues")
+        for summary in failed_issues:
+            log(f"  - {summary}")
+    
+    if outcome.get('cancelled'):
+        log(f"\nCancelled: {len(outcome['cancelled_issues'])} task(s) read but not sent "
+            f"(run again to create the rest)")
+    
+    if outcome.get('failed_updates'):
+        log(f"\nFailed to update: {len(outcome['failed_updates'])} issues")
+        for key in outcome['failed_updates']:
+            log(f"  - {key}")
+    
+    if outcome.get('failed_links'):
+        log(f"\nFailed to link: {len(outcome['failed_links'])} issue pair(s)")
+        for link in outcome['failed_links']:
+            log(f"  - {link}")
+    
+    metrics = outcome.get('metrics')
+    if metrics:
+        log(f"\nFinished in {metrics['elapsed_seconds']:.1f}s - {metrics['requests']} request(s), "
+            f"{metrics['retries']} retried ({metrics['throttled']} throttled by Jira)")
+        for endpoint, stats in metrics['endpoints'].items():
+            if stats['p50_ms'] is not None:
+                log(f"  - {endpoint}: {stats['requests']} request(s), "
+                    f"p50 {stats['p50_ms']:.0f} ms, p95 {stats['p95_ms']:.0f} ms")
+
+def run_rollback(client: JiraClient, jql: Optional[str], max_workers: int, assume_yes: bool = False):
+    """
+    Delete the issues of a previous run (from the run journal) or matching a JQL query
+    
+    A journal rollback covers every site and project the tasks file created
+    issues in (PROJECT: and SITE: directives); a JQL rollback uses client only.
+    
+    Args:
+        client: Client used for all requests
+        jql: JQL query selecting the issues, or None to use the run journal of TASKS_FILE
+        max_workers: Maximum number of issues deleted at the same time
+        assume_yes: Do not ask for confirmation
+    """
+    journal = RunJournal(RunJournal.path_for(TASKS_FILE))
+    store = IssueStore()
+    clients = JiraClients(client)
+    if jql:
+        print(f"Searching issues matching: {jql}")
+        try:
+            targets = [(client, rollback_targets_from_jql(jql, client=client))]
+        except requests.exceptions.RequestException as e:
+            print(f"Error searching issues: {e}")
+            sys.exit(1)
+    else:
+        print(f"Reading created issues from: {journal.path}")
+        targets = rollback_targets_from_journal(journal, clients)
+    targets = [(target, issues) for target, issues in targets if issues]
+    
+    if not targets:
+        print("No issues to delete.")
+        return
+    
+    total = sum(len(issues) for _, issues in targets)
+    for target, issues in targets:
+        print(f"Found {len(issues)} issue(s) to delete in {target.base_url} (project {target.project_key})")
+    if not assume_yes:
+        answer = input(f"Delete {total} issue(s)? This cannot be undone. [y/N] ")
+        if answer.strip().lower() not in ("y", "yes"):
+            print("Rollback cancelled.")
+            return
+    
+    try:
+        with clients:
+            result = rollback_issues_per_target(targets, max_workers, journal=journal, store=store)
+    finally:
+        journal.close()
+        store.close()
+    
+    print()
+    print("=" * 60)
+    print("ROLLBACK SUMMARY")
+    print("=" * 60)
+    print(f"Deleted: {len(result['deleted'])} issues")
+    if result['failed']:
+        print(f"\nFailed to delete: {len(result['failed'])} issues")
+        for key in result['failed']:
+            print(f"  - {key}")
+
+def run_find(text: Optional[str], export_path: Optional[str] = None):
+    """
+    Print (or export) the issues of the local issue store matching a key or summary
+    
+    Args:
+        text: Issue key or summary to look up, or None for every issue
+        export_path: Write the issues to this file (.json or .csv) instead of printing them
+    """
+    with IssueStore(ISSUE_STORE_FILE) as store:
+        issues = store.find(text)
+    if export_path:
+        file_format = export_issues(issues, export_path)
+        print(f"Exported {len(issues)} issue(s) to {export_path} ({file_format.upper()})")
+        return
+    if not issues:
+        print(f"No issues found in {ISSUE_STORE_FILE}" + (f" for: {text}" if text else ""))
+        return
+    for issue in issues:
+        parent = f" (subtask of {issue['parent_key']})" if issue['parent_key'] else ""
+        print(f"{issue['key']} - {issue['summary']}{parent} - {issue['site']}/browse/{issue['key']}")
+    print(f"\n{len(issues)} issue(s) found in {ISSUE_STORE_FILE}")
+
+class ImportConfig:
+    """
+    Settings of one import of a tasks file.
+    
+    Every setting defaults to the configuration of this module (environment
+    variables), which is what the command line uses; the GUI passes the
+    values of its form instead. Jobs with different configs can run in the
+    same process at the same time.
+    """
+    
+    def __init__(self, base_url: Optional[str] = None, email: Optional[str] = None,
+                 api_token: Optional[str] = None, project_key: Optional[str] = None,
+                 tasks_file: Optional[str] = None, workers: int = MAX_WORKERS,
+                 parse_workers: int = PARSE_WORKERS, bulk: bool = False, sync: bool = False,
+                 journal: bool = True, preflight: bool = True, store: bool = True):
+        """
+        Args:
+            base_url: Jira base URL (default: JIRA_BASE_URL)
+            email: Email used for authentication, also the default assignee (default: EMAIL)
+            api_token: API token used for authentication (default: API_TOKEN)
+            project_key: Project in which issues are created (default: PROJECT_KEY)
+            tasks_file: Path to the tasks file (default: TASKS_FILE)
+            workers: Number of issues (or bulk batches) created in parallel
+            parse_workers: Processes parsing the tasks file (see iter_tasks_parallel)
+            bulk: Use Jira's bulk create endpoint
+            sync: Only create issues missing from the project and update changed descriptions
+            journal: Skip and record tasks in the run journal of the tasks file
+            preflight: Check the tasks against the issue types and fields of their projects first
+            store: Add the created issues to the local issue store (see IssueStore)
+        """
+        self.base_url = (base_url or JIRA_BASE_URL).rstrip('/')
+        self.email = email or EMAIL
+        self.api_token = api_token or API_TOKEN
+        self.project_key = project_key or PROJECT_KEY
+        self.tasks_file = tasks_file or TASKS_FILE
+        self.workers = max(1, workers)
+        self.parse_workers = parse_workers
+        self.bulk = bulk
+        self.sync = sync
+        self.journal = journal
+        self.preflight = preflight
+        self.store = store
+    
+    def errors(self) -> List[str]:
+        """Get the settings that are missing"""
+        errors = []
+        
+        if not self.email or self.email == "your-email@example.com":
+            errors.append("EMAIL is not set. Please update it in the script or set JIRA_EMAIL environment variable.")
+        
+        if not self.api_token or self.api_token == "YOUR_API_TOKEN_HERE":
+            errors.append("API_TOKEN is not set. Please update it in the script or set JIRA_API_TOKEN environment variable.")
+        
+        return errors
+
+class ImportJob:
+    """
+    One import of a tasks file, shared by the command line and the GUI.
+    
+    Runs the whole import with the settings of an ImportConfig: checks the
+    parent links and the tasks against their projects, resolves assignees,
+    creates the issues (concurrently or in bulk), in sync mode updates
+    changed descriptions, then links the issues of LINK lines. Nothing is
+    printed; the job reports what it does as (kind, value) events, passed to
+    on_event from the thread running it or yielded by events():
+    
+    - ("log", line): progress line
+    - ("status", text): short description of the current step
+    - ("errors", problems): the tasks file cannot be imported, nothing was created
+    - ("done", outcome): the run is over (see RunResults.outcome; 'cancelled' is set
+      if cancel() was called)
+    
+    pause(), resume() and cancel() may be called from any thread (see
+    RunControl): a cancelled job stops sending issues, waits for the requests
+    already sent (up to the drain deadline), records a snapshot of the run in
+    the journal and finishes with what it created, so the next run of the
+    same file continues where it stopped.
+    """
+    
+    def __init__(self, config: ImportConfig, on_event: Optional[Callable[[str, object], None]] = None,
+                 metrics: Optional[RunMetrics] = None):
+        """
+        Args:
+            config: Settings of the import
+            on_event: Called with every (kind, value) event (default: log lines are printed)
+            metrics: Statistics the requests are reported to (default: a new RunMetrics)
+        """
+        self.config = config
+        self.on_event = on_event or (lambda kind, value: print(value) if kind == "log" else None)
+        self.client = JiraClient(config.base_url, config.email, config.api_token, config.project_key,
+                                 pool_size=max(config.workers, 10), metrics=metrics)
+        self.metrics = self.client.metrics
+        self.errors = []  # Problems of the tasks file, if the job stopped because of them
+        self.outcome = None  # Outcome of the run, once done
+        self.control = RunControl()
+    
+    def log(self, message: str):
+        """Report a progress line"""
+        self.on_event("log", message)
+    
+    def pause(self):
+        """Stop sending issues until resume() (safe to call from any thread)"""
+        if self.control.dispatching:
+            self.control.pause()
+            self.log("⏸ Paused: no new issues are sent, issues already sent are still created")
+            self.on_event("status", "Paused")
+    
+    def resume(self):
+        """Send issues again after pause()"""
+        if self.control.paused:
+            self.control.resume()
+            self.log("▶ Resumed")
+            self.on_event("status", "Creating tasks...")
+    
+    def cancel(self):
+        """Stop sending issues and finish once the issues already sent are created (safe to call from any thread)"""
+        if not self.control.cancelled:
+            self.control.cancel()
+            self.log(f"Cancelling: no new issues are sent, waiting up to {self.control.drain_timeout:.0f}s "
+                     f"for the issues already sent...")
+            self.on_event("status", "Cancelling...")
+    
+    @property
+    def paused(self) -> bool:
+        """Whether the job is paused"""
+        return self.control.paused
+    
+    @property
+    def cancelled(self) -> bool:
+        """Whether cancel() was called"""
+        return self.control.cancelled
+    
+    def events(self) -> Iterator[Tuple[str, object]]:
+        """
+        Run the job on a background thread, yielding its events as they happen
+        
+        Exceptions raised by the job are raised again here. Closing the
+        iterator before the job is done cancels it.
+        """
+        events = queue.Queue()
+        self.on_event = lambda kind, value: events.put((kind, value))
+        
+        def run():
+            try:
+                self.run()
+            except BaseException as e:
+                events.put(("exception", e))
+            events.put((None, None))
+        
+        thread = threading.Thread(target=run, daemon=True)
+        thread.start()
+        try:
+            while True:
+                kind, value = events.get()
+                if kind is None:
+                    return
+                if kind == "exception":
+                    raise value
+                yield kind, value
+        finally:
+            if thread.is_alive():
+                self.cancel()
+    
+    def run(self) -> Optional[Dict]:
+        """
+        Run the import in the calling thread
+        
+        Returns:
+            Outcome of the run (see RunResults.outcome), or None if the tasks file has problems (see errors)
+        
+        Raises:
+            requests.exceptions.RequestException: Existing issues could not be searched (sync mode)
+        """
+        # Tasks with PROJECT: or SITE: directives get a client per target, created on first use
+        with JiraClients(self.client) as clients:
+            outcome = self._run(clients)
+        if outcome is not None:
+            outcome['metrics'] = self.metrics.snapshot()
+            outcome['cancelled'] = self.cancelled
+            self.outcome = outcome
+            self.on_event("done", outcome)
+        return outcome
+    
+    def _run(self, clients: JiraClients) -> Optional[Dict]:
+        config = self.config
+        client = self.client
+        log = self.log
+        
+        # Check the parent links of the whole file and every task against its project before any write
+        self.on_event("status", "Checking tasks file...")
+        # (the file is parsed once for these checks and the assignees, and once more to create the issues)
+        try:
+            graph, check, assignees = read_task_checks(config.tasks_file, config.parse_workers, config.preflight,
+                                                       warn=lambda message: log(f"⚠ {message}"))
+            errors = graph.errors()
+            for warning in graph.warnings():
+                log(f"⚠ {warning}")
+        except TaskFileError as e:
+            graph, check, errors = None, None, [str(e)]
+        if not errors and check:
+            log("Checking tasks against the issue types of their project(s)...")
+            errors = preflight_check(check, graph, clients, cache=MetadataCache(),
+                                     max_workers=config.workers, log=log)
+        if errors:
+            self.errors = errors
+            self.on_event("errors", errors)
+            return None
+        
+        # Resolve the runner and every ASSIGNEE once
+        self.on_event("status", "Resolving assignees...")
+        log(f"Getting account ID for {config.email}" + (f" and {len(assignees)} assignee(s)..." if assignees else "..."))
+        account_ids = resolve_account_ids([config.email] + assignees, client=client, cache=UserCache(),
+                                          max_workers=config.workers, log=log)
+        assignee_account_id = account_ids.get(config.email.strip().lower())
+        if assignee_account_id:
+            log(f"  ✓ Found account ID: {assignee_account_id}")
+        else:
+            log(f"  ⚠ Could not find account ID. Issues will be created without assignment.")
+        for email in assignees:
+            if not account_ids.get(email.lower()):
+                log(f"  ⚠ Could not find account ID for {email}. Its tasks will be created without assignment.")
+        log("")
+        
+        # Parse tasks from file
+        log(f"Reading tasks from: {config.tasks_file}")
+        if config.bulk or config.sync:
+            # Bulk scheduling and the sync diff need every task up front
+            tasks = list(iter_tasks_parallel(config.tasks_file, config.parse_workers))
+            subtask_count = sum(1 for task in tasks if is_subtask(task))
+            if tasks:
+                log(f"Found {len(tasks) - subtask_count} parent task(s) and {subtask_count} subtask(s)")
+        else:
+            # Issues are sent while the rest of the file is still being parsed
+            tasks = iter_tasks_parallel(config.tasks_file, config.parse_workers)
+        log(f"Creating tasks in Jira project {client.project_key} ({config.workers} in parallel)...")
+        log(f"Jira URL: {client.base_url}\n")
+        self.on_event("status", "Creating tasks...")
+        
+        # The journal lets an interrupted run be started again without creating duplicates
+        journal = RunJournal(RunJournal.path_for(config.tasks_file)) if config.journal else None
+        store = IssueStore(source=config.tasks_file) if config.store else None
+        last_run = journal.last_run() if journal else None
+        if last_run and last_run.get('cancelled'):
+            log(f"The previous run was cancelled after {last_run['created']} issue(s), continuing it")
+        try:
+            plan = {'existing': {}, 'changed': []}
+            if config.sync:
+                plan = plan_sync(tasks, client=client, log=log, clients=clients)
+            
+            if config.bulk:
+                outcome = create_issues_in_bulk(tasks, assignee_account_id, max_workers=config.workers,
+                                                log=log, client=client, journal=journal,
+                                                existing=plan['existing'], account_ids=account_ids,
+                                                clients=clients, control=self.control, store=store)
+            else:
+                outcome = create_issues_concurrently(tasks, assignee_account_id, max_workers=config.workers,
+                                                     log=log, client=client, journal=journal,
+                                                     existing=plan['existing'], account_ids=account_ids,
+                                                     clients=clients, priorities=graph.heights(),
+                                                     control=self.control, store=store)
+            
+            if config.sync and not self.cancelled:
+                log("")
+                outcome.update(update_issue_descriptions(tasks, plan, max_workers=config.workers,
+                                                         log=log, client=client, clients=clients))
+            if outcome['links'] and not self.cancelled:
+                # Second pass: every issue exists now, so LINK lines may point at any task of the file
+                log("")
+                self.on_event("status", "Linking issues...")
+                outcome.update(create_issue_links(outcome['links'], max_workers=config.workers, log=log,
+                                                  client=client, clients=clients, control=self.control))
+            if journal:
+                journal.record_run(outcome, self.cancelled)
+        finally:
+            if journal:
+                journal.close()
+            if store:
+                store.close()
+        
+        return outcome
+
+def main():
+    """Create all Jira tasks"""
+    parser = argparse.ArgumentParser(description="Create Jira tasks from a tasks file")
+    parser.add_argument("--workers", type=int, default=MAX_WORKERS,
+                        help=f"Number of issues created in parallel (default: {MAX_WORKERS})")
+    parser.add_argument("--bulk", action="store_true",
+                        help=f"Use Jira's bulk create endpoint ({BULK_BATCH_SIZE} issues per request)")
+    parser.add_argument("--sync", action="store_true",
+                        help="Only create issues missing from the project and update changed descriptions")
+    parser.add_argument("--no-journal", action="store_true",
+                        help=f"Do not skip or record tasks in the run journal (<tasks file>{JOURNAL_SUFFIX})")
+    parser.add_argument("--rollback", action="store_true",
+                        help="Delete the issues created from the tasks file (according to the run journal)")
+    parser.add_argument("--rollback-jql", metavar="JQL",
+                        help="Delete all issues matching a JQL query")
+    parser.add_argument("--yes", action="store_true",
+                        help="Do not ask for confirmation before deleting issues")
+    parser.add_argument("--metrics-json", metavar="FILE",
+                        help="Write request and throughput statistics of the run to FILE as JSON")
+    parser.add_argument("--no-preflight", action="store_true",
+                        help="Do not check the tasks against the issue types and fields of their projects")
+    parser.add_argument("--parse-workers", type=int, default=PARSE_WORKERS,
+                        help=f"Processes parsing the tasks file and encoding payloads, 0 for one per CPU "
+                             f"(default: {PARSE_WORKERS})")
+    parser.add_argument("--no-store", action="store_true",
+                        help=f"Do not add the created issues to the local issue store ({ISSUE_STORE_FILE})")
+    parser.add_argument("--find", nargs="?", const="", metavar="KEY_OR_SUMMARY",
+                        help="Look up created issues in the local issue store by key or summary "
+                             "(no value: every issue), without contacting Jira")
+    parser.add_argument("--export", metavar="FILE",
+                        help="With --find, write the issues found to FILE (.json for JSON, otherwise CSV)")
+    args = parser.parse_args()
+    
+    if args.find is not None or args.export:
+        run_find(args.find or None, args.export)
+        return
+    
+    # Validate configuration
+    config = ImportConfig(workers=args.workers, parse_workers=args.parse_workers, bulk=args.bulk,
+                          sync=args.sync, journal=not args.no_journal, preflight=not args.no_preflight,
+                          store=not args.no_store)
+    validate_config(config)
+    
+    if args.rollback or args.rollback_jql:
+        # One pooled connection shared by every request of the rollback
+        client = JiraClient(pool_size=max(args.workers, 10))
+        run_rollback(client, args.rollback_jql, args.workers, assume_yes=args.yes)
+        return
+    
+    check_tasks_file(config.tasks_file)
+    job = ImportJob(config)
+    
+    def on_stop_signal(signum, frame):
+        # The first Ctrl-C (or SIGTERM) lets the issues already sent finish, a second Ctrl-C stops at once
+        if job.cancelled and signum == signal.SIGINT:
+            raise KeyboardInterrupt
+        job.cancel()
+    
+    signal.signal(signal.SIGINT, on_stop_signal)
+    signal.signal(signal.SIGTERM, on_stop_signal)
+    if hasattr(signal, "SIGUSR1"):
+        signal.signal(signal.SIGUSR1, lambda signum, frame: job.resume() if job.paused else job.pause())
+    
+    try:
+        with StatusLine(job.metrics) as status:
+            job.on_event = lambda kind, value: status.log(value) if kind == "log" else None
+            outcome = job.run()
+    except requests.exceptions.RequestException as e:
+        # Only the sync search is not retried per issue
+        print(f"Error searching existing issues: {e}")
+        sys.exit(1)
+    if outcome is None:
+        report_task_errors(config.tasks_file, job.errors)
+    
+    if args.metrics_json:
+        with open(args.metrics_json, 'w', encoding='utf-8') as f:
+            json.dump(outcome['metrics'], f, indent=2)
+    
+    if not outcome['results'] and not outcome['cancelled']:
+        print("No tasks found in the file. Please add tasks to the file.")
+        sys.exit(1)
+    
+    print()
+    print_summary(outcome)
+    if args.metrics_json:
+        print(f"\nRun statistics written to: {args.metrics_json}")
+    if outcome['cancelled']:
+        sys.exit(130)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,852 @@
+#!/usr/bin/env python3
+"""
+Script to create Jira tasks via REST API with asyncio
+
+Headless alternative to create_jira_tasks.py for CI-driven imports: all
+requests run on one event loop, so a single process can keep hundreds of
+issue creations in flight without a thread per request.
+Requires aiohttp (pip install aiohttp) or httpx (pip install httpx).
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import signal
+import sys
+from typing import Callable, Dict, Iterable, List, Optional, Union
+
+# Optional dependencies: at least one of them is needed (checked in main())
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+from create_jira_tasks import (
+    JIRA_BASE_URL, PROJECT_KEY, EMAIL, API_TOKEN, TASKS_FILE, REQUEST_TIMEOUT, MAX_RETRIES, ISSUE_STORE_FILE,
+    THROTTLE_STATUS_CODES, TRANSIENT_STATUS_CODES, IDEMPOTENT_METHODS, JOURNAL_SUFFIX, PARSE_WORKERS,
+    CONTROL_POLL_INTERVAL, IssueStore, JiraClients, MetadataCache, PreflightCheck, ProjectMetadata, RateLimiter,
+    RunControl, RunJournal, RunMetrics, RunResults,
+    StatusLine, TaskGraph, TaskScheduler, UserCache, get_auth_headers, parse_retry_after, backoff_delay, endpoint_name,
+    TaskFileError, issue_payload, bulk_payload, build_error_details, bulk_create_results, match_user_account_id,
+    check_tasks_file, read_task_checks, createmeta_params, read_project_metadata, report_task_errors,
+    resolve_issue_type, iter_tasks_parallel, task_fields, read_link_types, plan_issue_links, describe_link,
+    format_error_lines, rollback_levels, rollback_targets_from_journal, task_assignee, validate_config, print_summary,
+    drain_expired,
+)
+
+DEFAULT_CONCURRENCY = 64  # Requests in flight at the same time
+BACKENDS = ("aiohttp", "httpx")  # In order of preference
+
+class AsyncRequestError(Exception):
+    """
+    A request failed without a response
+    
+    kind tells whether it may be retried: "connect_timeout" (never reached
+    Jira), "connection" (connection error or read timeout, the request may
+    have been processed) or "other".
+    """
+    
+    def __init__(self, message: str, kind: str = "other"):
+        super().__init__(message)
+        self.kind = kind
+
+class AsyncResponse:
+    """Response of an AsyncJiraClient request, read completely"""
+    
+    def __init__(self, status_code: int, headers, text: str, url: str):
+        self.status_code = status_code
+        self.headers = headers
+        self.text = text
+        self.url = url
+    
+    @property
+    def is_error(self) -> bool:
+        return self.status_code >= 400
+    
+    def json(self):
+        return json.loads(self.text)
+
+class AiohttpTransport:
+    """Sends requests with aiohttp"""
+    
+    def __init__(self, base_url: str, headers: Dict, timeout: float, limit: int):
+        self.base_url = base_url
+        self.session = aiohttp.ClientSession(
+            headers=headers,
+            timeout=aiohttp.ClientTimeout(total=timeout),
+            connector=aiohttp.TCPConnector(limit=limit),
+        )
+    
+    async def send(self, method: str, path: str, params: Optional[Dict] = None,
+                   content: Optional[bytes] = None, headers: Optional[Dict] = None) -> AsyncResponse:
+        url = f"{self.base_url}{path}"
+        try:
+            async with self.session.request(method, url, params=params, data=content, headers=headers) as response:
+                text = await response.text()
+                return AsyncResponse(response.status, response.headers, text, str(response.url))
+        except asyncio.TimeoutError as e:
+            connect_timeout = getattr(aiohttp, "ConnectionTimeoutError", None)
+            kind = "connect_timeout" if connect_timeout and isinstance(e, connect_timeout) else "connection"
+            raise AsyncRequestError(f"Timeout for url: {url}", kind) from e
+        except aiohttp.ClientConnectionError as e:
+            raise AsyncRequestError(f"{e} for url: {url}", "connection") from e
+        except aiohttp.ClientError as e:
+            raise AsyncRequestError(f"{e} for url: {url}") from e
+    
+    async def close(self):
+        await self.session.close()
+
+class HttpxTransport:
+    """Sends requests with httpx"""
+    
+    def __init__(self, base_url: str, headers: Dict, timeout: float, limit: int):
+        self.client = httpx.AsyncClient(
+            base_url=base_url,
+            headers=headers,
+            timeout=timeout,
+            limits=httpx.Limits(max_connections=limit, max_keepalive_connections=limit),
+        )
+    
+    async def send(self, method: str, path: str, params: Optional[Dict] = None,
+                   content: Optional[bytes] = None, headers: Optional[Dict] = None) -> AsyncResponse:
+        try:
+            response = await self.client.request(method, path, params=params, content=content, headers=headers)
+        except httpx.ConnectTimeout as e:
+            raise AsyncRequestError(f"Connect timeout for url: {e.request.url}", "connect_timeout") from e
+        except (httpx.NetworkError, httpx.TimeoutException) as e:
+            raise AsyncRequestError(f"{type(e).__name__} for url: {e.request.url}", "connection") from e
+        except httpx.HTTPError as e:
+            raise AsyncRequestError(str(e) or type(e).__name__) from e
+        return AsyncResponse(response.status_code, response.headers, response.text, str(response.url))
+    
+    async def close(self):
+        await self.client.aclose()
+
+def available_backend(preferred: Optional[str] = None) -> Optional[str]:
+    """
+    Pick the HTTP library used by AsyncJiraClient
+    
+    Args:
+        preferred: "aiohttp" or "httpx" (None: the first one installed)
+    
+    Returns:
+        Name of the backend, or None if the preferred one (or any) is not installed
+    """
+    installed = {"aiohttp": aiohttp is not None, "httpx": httpx is not None}
+    if preferred:
+        return preferred if installed.get(preferred) else None
+    return next((name for name in BACKENDS if installed[name]), None)
+
+class AsyncJiraClient:
+    """
+    Asynchronous connection to a Jira site.
+    
+    At most `concurrency` requests are in flight at a time (semaphore).
+    Requests are retried like JiraClient.request: throttled responses
+    (429/503) for every method, gateway errors and connection failures only
+    for idempotent methods. Requests go through the same RateLimiter as
+    JiraClient: a token bucket sized from the X-RateLimit-* headers, and a
+    limit of requests in flight (at most concurrency) that is halved by every
+    throttled response, which also pauses every request of the client for
+    the Retry-After delay, and grows again with successful requests. aiohttp is used when installed (it
+    sustains far more requests in flight than httpx), httpx otherwise.
+    """
+    
+    def __init__(self, base_url: Optional[str] = None, email: Optional[str] = None,
+                 api_token: Optional[str] = None, project_key: Optional[str] = None,
+                 concurrency: int = DEFAULT_CONCURRENCY, timeout: float = REQUEST_TIMEOUT,
+                 max_retries: int = MAX_RETRIES, metrics: Optional[RunMetrics] = None,
+                 backend: Optional[str] = None):
+        """
+        Args:
+            base_url: Jira base URL (default: JIRA_BASE_URL)
+            email: Email used for authentication (default: EMAIL)
+            api_token: API token used for authentication (default: API_TOKEN)
+            project_key: Project in which issues are created (default: PROJECT_KEY)
+            concurrency: Maximum number of requests in flight (see RateLimiter)
+            timeout: Timeout in seconds for every request
+            max_retries: Number of retries for throttled or transient failures
+            metrics: Statistics the requests are reported to (default: a new RunMetrics)
+            backend: "aiohttp" or "httpx" (default: the first one installed)
+        """
+        self.base_url = (base_url or JIRA_BASE_URL).rstrip('/')
+        self.project_key = project_key or PROJECT_KEY
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.concurrency = max(1, concurrency)
+        self.metrics = metrics or RunMetrics()
+        self.metadata = None  # ProjectMetadata of the project, once loaded by preflight_check_async
+        self._credentials = (email, api_token)
+        self.rate_limiter = RateLimiter(max_concurrency=self.concurrency)
+        self._released = None  # asyncio.Event set whenever a request releases the rate limiter
+        self.backend = available_backend(backend)
+        if self.backend is None:
+            raise RuntimeError(f"{backend or 'aiohttp or httpx'} is not installed")
+        transport = AiohttpTransport if self.backend == "aiohttp" else HttpxTransport
+        self.transport = transport(self.base_url, get_auth_headers(email, api_token), timeout,
+                                   self.concurrency)
+    
+    async def _acquire(self):
+        # Wait until the rate limiter lets a request go, without blocking the event loop
+        if self._released is None:
+            self._released = asyncio.Event()
+        while True:
+            delay = self.rate_limiter.try_acquire()
+            if delay == 0:
+                return
+            self._released.clear()
+            try:
+                await asyncio.wait_for(self._released.wait(), delay)
+            except asyncio.TimeoutError:
+                pass
+    
+    def _release(self, success: bool):
+        self.rate_limiter.release(success=success)
+        self._released.set()
+    
+    async def request(self, method: str, path: str, params: Optional[Dict] = None,
+                      content: Optional[bytes] = None, headers: Optional[Dict] = None,
+                      idempotent: Optional[bool] = None) -> AsyncResponse:
+        """
+        Send a request to the Jira REST API
+        
+        Args:
+            method: HTTP method (GET, POST, PUT, DELETE)
+            path: Path relative to the base URL (e.g., "/rest/api/3/issue")
+            params: Query parameters
+            content: JSON request body
+            headers: Extra request headers
+            idempotent: Whether sending the request twice is harmless (default: depends on the method)
+        
+        Returns:
+            The response (status is not checked)
+        
+        Raises:
+            AsyncRequestError: No response was received (after retries)
+        """
+        if idempotent is None:
+            idempotent = method.upper() in IDEMPOTENT_METHODS
+        endpoint = endpoint_name(method, path)
+        
+        attempt = 0
+        while True:
+            await self._acquire()
+            started = self.metrics.request_started()
+            try:
+                response = await self.transport.send(method, path, params=params, content=content,
+                                                     headers=headers)
+            except AsyncRequestError as e:
+                self.metrics.request_finished(endpoint, started)
+                self._release(False)
+                retryable = e.kind == "connect_timeout" or (idempotent and e.kind == "connection")
+                if not retryable or attempt >= self.max_retries:
+                    raise
+                self.metrics.retried(endpoint)
+                await asyncio.sleep(backoff_delay(attempt))
+                attempt += 1
+                continue
+            except asyncio.CancelledError:
+                self._release(False)
+                raise
+            
+            self.metrics.request_finished(endpoint, started, response.status_code)
+            self.rate_limiter.update_from_headers(response.headers)
+            status = response.status_code
+            retryable = status in THROTTLE_STATUS_CODES or (idempotent and status in TRANSIENT_STATUS_CODES)
+            if not retryable or attempt >= self.max_retries:
+                self._release(status < 400)
+                return response
+            
+            delay = parse_retry_after(response.headers.get("Retry-After"))
+            if delay is None:
+                delay = backoff_delay(attempt)
+            else:
+                # Spread the retries of all waiting requests a little
+                delay += random.uniform(0, min(1.0, delay * 0.1 + 0.05))
+            if status in THROTTLE_STATUS_CODES:
+                self.rate_limiter.throttled(delay)
+            self.metrics.retried(endpoint, throttled=status in THROTTLE_STATUS_CODES)
+            self._release(False)
+            # Wait without holding a slot so other requests are not blocked meanwhile
+            await asyncio.sleep(delay)
+            attempt += 1
+    
+    async def create_issue(self, summary: str, description: str, assignee_account_id: Optional[str] = None,
+                           issue_type: Optional[str] = None, parent_key: Optional[str] = None,
+                           prepared: Optional[bytes] = None, fields: Optional[Dict] = None) -> Dict:
+        """
+        Create a Jira issue (see create_jira_tasks.create_jira_issue)
+        
+        Returns:
+            Created issue ('key', 'id', 'self') or {'error': error details}
+        """
+        issue_type = resolve_issue_type(self, issue_type, parent_key)
+        payload = issue_payload(summary, description, assignee_account_id, issue_type, parent_key,
+                                project_key=self.project_key, prepared=prepared, fields=fields)
+        try:
+            response = await self.request("POST", "/rest/api/3/issue", content=payload)
+        except AsyncRequestError as e:
+            return {'error': build_error_details(str(e))}
+        if response.is_error:
+            return {'error': build_error_details(f"{response.status_code} Error for url: {response.url}",
+                                                 response.status_code, response.text)}
+        return response.json()
+    
+    async def bulk_create(self, issue_fields: List[Union[Dict, bytes]]) -> List[Dict]:
+        """
+        Create up to BULK_BATCH_SIZE issues with one request (see create_jira_tasks.create_jira_issues_bulk)
+        
+        Args:
+            issue_fields: List of fields dictionaries built by build_issue_fields
+                          (or request bodies encoded by issue_payload)
+        
+        Returns:
+            One result per input element, in the same order
+        """
+        try:
+            response = await self.request("POST", "/rest/api/3/issue/bulk", content=bulk_payload(issue_fields))
+        except AsyncRequestError as e:
+            return [{'error': build_error_details(str(e))} for _ in issue_fields]
+        return bulk_create_results(len(issue_fields), response.status_code, response.text, response.url)
+    
+    async def delete_issue(self, issue_key: str, delete_subtasks: bool = False, missing_ok: bool = False) -> bool:
+        """
+        Delete a Jira issue
+        
+        Args:
+            issue_key: Issue key (e.g., PROJECT-123)
+            delete_subtasks: Also delete the subtasks of the issue
+            missing_ok: Consider an issue that does not exist (404) as deleted
+        
+        Returns:
+            True if successful, False otherwise
+        """
+        params = {"deleteSubtasks": "true"} if delete_subtasks else None
+        try:
+            response = await self.request("DELETE", f"/rest/api/3/issue/{issue_key}", params=params)
+        except AsyncRequestError:
+            return False
+        return not response.is_error or (missing_ok and response.status_code == 404)
+    
+    async def link_types(self) -> List[tuple]:
+        """Get the link types of the site (see create_jira_tasks.read_link_types)"""
+        try:
+            response = await self.request("GET", "/rest/api/3/issueLinkType")
+        except AsyncRequestError:
+            return read_link_types(None)
+        return read_link_types(response.status_code, response.text)
+    
+    async def create_link(self, payload: bytes) -> Dict:
+        """
+        Link two issues (see create_jira_tasks.create_issue_link)
+        
+        Returns:
+            {} if successful, {'error': error details} otherwise
+        """
+        try:
+            response = await self.request("POST", "/rest/api/3/issueLink", content=payload, idempotent=True)
+        except AsyncRequestError as e:
+            return {'error': build_error_details(str(e))}
+        if response.is_error:
+            return {'error': build_error_details(f"{response.status_code} Error for url: {response.url}",
+                                                 response.status_code, response.text)}
+        return {}
+    
+    async def search_users(self, query: str) -> List[Dict]:
+        """
+        Search users by email or name
+        
+        Returns:
+            Users returned by Jira (empty if the search failed)
+        """
+        try:
+            response = await self.request("GET", "/rest/api/3/user/search", params={"query": query})
+        except AsyncRequestError:
+            return []
+        if response.is_error:
+            return []
+        return response.json()
+    
+    def for_target(self, base_url: str, project_key: str) -> "AsyncJiraClient":
+        """
+        Create a client for another Jira site or project
+        
+        The new client uses the same credentials, settings, backend and
+        metrics, but has its own connections and concurrency limit.
+        """
+        return AsyncJiraClient(base_url, *self._credentials, project_key=project_key,
+                               concurrency=self.concurrency, timeout=self.timeout,
+                               max_retries=self.max_retries, metrics=self.metrics, backend=self.backend)
+    
+    async def close(self):
+        """Close all pooled connections"""
+        await self.transport.close()
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+async def close_clients(clients: JiraClients):
+    """Close every client of a JiraClients registry holding AsyncJiraClient instances"""
+    await asyncio.gather(*(client.close() for client in clients.all()))
+
+async def resolve_account_ids_async(emails: Iterable[str], client: AsyncJiraClient,
+                                    cache: Optional[UserCache] = None,
+                                    log: Callable[[str], None] = print) -> Dict[str, Optional[str]]:
+    """
+    Resolve the account IDs of several users at once (see create_jira_tasks.resolve_account_ids)
+    
+    Returns:
+        Dictionary mapping lower-case emails to account IDs (None if not found)
+    """
+    account_ids = {}
+    missing = []
+    for email in sorted({email.strip().lower() for email in emails if email and email.strip()}):
+        account_id = cache.get(client.base_url, email) if cache else None
+        if account_id:
+            account_ids[email] = account_id
+        else:
+            missing.append(email)
+    
+    if missing:
+        log(f"Looking up account ID(s) for {len(missing)} user(s)...")
+        found = await asyncio.gather(*(client.search_users(email) for email in missing))
+        for email, users in zip(missing, found):
+            account_id = match_user_account_id(users, email)
+            account_ids[email] = account_id
+            if account_id and cache:
+                cache.set(client.base_url, email, account_id)
+        if cache:
+            cache.save()
+    
+    return account_ids
+
+async def load_project_metadata_async(client: AsyncJiraClient,
+                                      cache: Optional[MetadataCache] = None) -> Optional[ProjectMetadata]:
+    """
+    Get the issue types and fields of the project of a client (see create_jira_tasks.load_project_metadata)
+    
+    Returns:
+        The metadata, or None if it is not available
+    """
+    entry = cache.get(client.base_url, client.project_key) if cache else None
+    if cache and cache.fresh(entry):
+        return ProjectMetadata.from_dict(entry['data'])
+    
+    headers = {"If-None-Match": entry['etag']} if entry and entry.get('etag') else None
+    try:
+        response = await client.request("GET", "/rest/api/3/issue/createmeta",
+                                        params=createmeta_params(client.project_key), headers=headers)
+    except AsyncRequestError:
+        return read_project_metadata(client, cache, entry, None)
+    return read_project_metadata(client, cache, entry, response.status_code, response.headers.get("ETag"),
+                                 response.text)
+
+async def preflight_check_async(tasks: Union[Iterable[Dict], PreflightCheck], graph: TaskGraph, clients: JiraClients,
+                                cache: Optional[MetadataCache] = None,
+                                log: Callable[[str], None] = print) -> List[str]:
+    """
+    Check every task against the metadata of its project (see create_jira_tasks.preflight_check)
+    
+    Returns:
+        Problems found (tasks of projects without metadata are only checked locally)
+    """
+    check = tasks if isinstance(tasks, PreflightCheck) else PreflightCheck(tasks)
+    check.link(graph)
+    targets = [clients.get(site, project) for site, project in check.targets]
+    loaded = await asyncio.gather(*(load_project_metadata_async(client, cache) for client in targets))
+    if cache:
+        cache.save()
+    
+    for client, metadata in zip(targets, loaded):
+        client.metadata = metadata
+        if metadata is None:
+            log(f"⚠ Could not load the issue types of project {client.project_key} ({client.base_url}), "
+                f"its tasks are checked by Jira only")
+    return check.errors(dict(zip(check.targets, loaded)))
+
+async def create_issues_async(tasks: Iterable[Dict], client: AsyncJiraClient,
+                              assignee_account_id: Optional[str] = None,
+                              log: Callable[[str], None] = print,
+                              journal: Optional[RunJournal] = None,
+                              account_ids: Optional[Dict[str, Optional[str]]] = None,
+                              clients: Optional[JiraClients] = None,
+                              priorities: Optional[List[int]] = None,
+                              store: Optional[IssueStore] = None,
+                              control: Optional[RunControl] = None) -> Dict:
+    """
+    Create tasks of any hierarchy depth on the event loop.
+    
+    Same scheduling as create_jira_tasks.create_issues_concurrently (see
+    TaskScheduler): a task is sent as soon as it is read and its parent
+    exists, longest chains first. At most the client concurrency issues are
+    in flight, and parsing pauses while more than four times that many are
+    ready to be sent. Tasks with a PROJECT: or SITE: directive are created
+    with their own client from clients. control pauses or cancels the run
+    like for create_issues_concurrently: once cancelled, creations already
+    sent are waited for until the drain deadline.
+    
+    Args:
+        tasks: Tasks as returned by parse_tasks_file or iter_tasks
+        client: Client used for all requests
+        assignee_account_id: Account ID of the assignee for tasks without ASSIGNEE (optional)
+        log: Function used to report progress
+        journal: Journal used to skip tasks created by a previous run and record new ones
+        account_ids: Account IDs of ASSIGNEE emails (see resolve_account_ids_async)
+        clients: Clients of other sites and projects (default: created from client)
+        priorities: TaskGraph.heights() of the whole file, to create the longest chains first
+        store: Issue store the created issues are added to
+        control: Pause, resume and cancel requests for the run (signal handlers of run)
+    
+    Returns:
+        Dictionary described in RunResults.outcome
+    """
+    clients = clients or JiraClients(client)
+    max_running = client.concurrency
+    max_pending = client.concurrency * 4
+    run = RunResults(None, log, client.base_url, client.project_key, journal, None, client.metrics, store)
+    scheduler = TaskScheduler(run, clients, priorities)
+    pending = {}  # Maps running creations to their task index
+    
+    def submit_ready():
+        # Nothing is sent while paused or cancelled
+        while len(pending) < max_running and (control is None or control.dispatching):
+            batch = scheduler.pop()
+            if not batch:
+                return
+            index, parent_key, target = batch[0]
+            task = run.tasks[index]
+            job = asyncio.ensure_future(target.create_issue(
+                task['summary'], task['description'], task_assignee(task, assignee_account_id, account_ids),
+                task.get('type'), parent_key=parent_key, prepared=task.pop('payload', None),
+                fields=task_fields(task, target)))
+            pending[job] = index
+    
+    def handle(job):
+        index = pending.pop(job)
+        try:
+            result = job.result()
+        except Exception as e:
+            result = {'error': str(e)}
+        scheduler.record(index, result)
+    
+    async def collect() -> bool:
+        # Handle finished creations and refill; False once the drain deadline of a cancelled run passed
+        timeout = control.wait_timeout() if control else None
+        if timeout == 0:
+            return False
+        done, _ = await asyncio.wait(list(pending), timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+        for job in done:
+            handle(job)
+        submit_ready()
+        return True
+    
+    try:
+        for task in tasks:
+            # Nothing is read while paused, but answers of creations already sent are handled
+            while control and control.paused:
+                if not pending:
+                    await asyncio.sleep(CONTROL_POLL_INTERVAL)
+                elif not await collect():
+                    break
+            if control and control.cancelled:
+                break
+            scheduler.add(task)
+            
+            # Let the requests progress while parsing, and wait if too much work is queued
+            await asyncio.sleep(0)
+            for job in [job for job in pending if job.done()]:
+                handle(job)
+            submit_ready()
+            while pending and len(pending) + scheduler.ready_count >= max_pending:
+                if not await collect():
+                    break
+        else:
+            # Tasks pointing at a PARENT-n that does not exist (or at each other) can never be created
+            scheduler.finish()
+        submit_ready()
+        while pending or (control and control.paused and scheduler.ready_count):
+            if not pending:
+                await asyncio.sleep(CONTROL_POLL_INTERVAL)
+                submit_ready()
+            elif not await collect():
+                break
+        drain_expired(run, pending.values())
+    finally:
+        # Requests still running after the drain deadline are not waited for
+        for job in pending:
+            job.cancel()
+    
+    return run.outcome()
+
+async def create_issue_links_async(links: List[Dict], client: AsyncJiraClient,
+                                   log: Callable[[str], None] = print,
+                                   clients: Optional[JiraClients] = None,
+                                   control: Optional[RunControl] = None) -> Dict:
+    """
+    Create the links of the LINK lines of a run (see create_jira_tasks.create_issue_links)
+    
+    At most the client concurrency links are created at the same time. control
+    pauses or cancels the pass (see create_issues_async); links not sent or not
+    answered before the drain deadline are reported as failed.
+    
+    Returns:
+        Dictionary with 'linked_issues' and 'failed_links'
+    """
+    if not links:
+        return {'linked_issues': [], 'failed_links': []}
+    clients = clients or JiraClients(client)
+    sites = {link['base_url']: link['project_key'] for link in links}
+    loaded = await asyncio.gather(*(clients.get(*site).link_types() for site in sites.items()))
+    planned, failed = plan_issue_links(links, dict(zip(sites, loaded)), log)
+    linked = []
+    if planned:
+        log(f"Linking {len(planned)} issue pair(s)...")
+    
+    pending = iter(planned)
+    running = {}  # Maps link creations in flight to their link
+    try:
+        while True:
+            while len(running) < client.concurrency and (control is None or control.dispatching):
+                item = next(pending, None)
+                if item is None:
+                    break
+                link, payload = item
+                target = clients.get(link['base_url'], link['project_key'])
+                running[asyncio.ensure_future(target.create_link(payload))] = link
+            if not running:
+                if control and control.paused:
+                    await asyncio.sleep(CONTROL_POLL_INTERVAL)
+                    continue
+                break
+            
+            timeout = control.wait_timeout() if control else None
+            if timeout == 0:
+                break
+            done, _ = await asyncio.wait(list(running), timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+            for job in done:
+                link = running.pop(job)
+                try:
+                    result = job.result()
+                except Exception as e:
+                    result = {'error': str(e)}
+                if 'error' in result:
+                    failed.append(describe_link(link))
+                    log(f"  ✗ Failed to link: {describe_link(link)}")
+                    for line in format_error_lines(result):
+                        log(f"    {line}")
+                else:
+                    linked.append(describe_link(link))
+                    log(f"  ✓ Linked: {describe_link(link)}")
+    finally:
+        # Requests still running after the drain deadline are not waited for
+        for job in running:
+            job.cancel()
+    
+    # Links not sent (or not answered) because the run was cancelled
+    failed.extend(describe_link(link) for link in running.values())
+    failed.extend(describe_link(link) for link, _ in pending)
+    return {'linked_issues': linked, 'failed_links': failed}
+
+async def rollback_issues_async(issues: List[Dict], client: AsyncJiraClient,
+                                log: Callable[[str], None] = print,
+                                journal: Optional[RunJournal] = None,
+                                store: Optional[IssueStore] = None) -> Dict:
+    """
+    Delete issues, one level of their hierarchy at a time from the deepest up
+    (see create_jira_tasks.rollback_issues)
+    
+    Returns:
+        Dictionary with 'deleted' and 'failed' issue keys
+    """
+    levels = rollback_levels(issues)
+    total = sum(len(level) for level in levels)
+    deleted = []
+    failed = []
+    
+    def forget(key: str, delete_subtasks: bool):
+        # File and database writes, run in a worker thread so they do not block the event loop
+        if journal:
+            journal.record_deleted(key, client.base_url, client.project_key)
+        if store:
+            store.remove(client.base_url, key, subtasks=delete_subtasks)
+    
+    async def delete(key: str, delete_subtasks: bool):
+        if await client.delete_issue(key, delete_subtasks=delete_subtasks, missing_ok=True):
+            deleted.append(key)
+            if journal or store:
+                await asyncio.to_thread(forget, key, delete_subtasks)
+            log(f"[{len(deleted) + len(failed)}/{total}] ✓ Deleted: {key}")
+        else:
+            failed.append(key)
+            log(f"[{len(deleted) + len(failed)}/{total}] ✗ Failed to delete: {key}")
+    
+    for number, level in enumerate(levels, start=1):
+        log(f"Deleting {len(level)} " + ("parent task(s)..." if number == len(levels) else "subtask(s)..."))
+        await asyncio.gather(*(delete(key, delete_subtasks) for key, delete_subtasks in level))
+    
+    ordered = [key for level in levels for key, _ in level]
+    deleted, failed = set(deleted), set(failed)
+    return {
+        'deleted': [key for key in ordered if key in deleted],
+        'failed': [key for key in ordered if key in failed],
+    }
+
+async def run(args) -> int:
+    """Run the import (or rollback) described by the command line arguments"""
+    journal = None if args.no_journal else RunJournal(RunJournal.path_for(TASKS_FILE))
+    store = None if args.no_store else IssueStore(source=TASKS_FILE)
+    client = AsyncJiraClient(concurrency=args.concurrency, backend=args.backend)
+    # Tasks with PROJECT: or SITE: directives get a client per target, created on first use
+    clients = JiraClients(client)
+    try:
+        if args.rollback:
+            targets = rollback_targets_from_journal(journal, clients) if journal else []
+            if not targets:
+                print("No issues to delete.")
+                return 0
+            total = sum(len(issues) for _, issues in targets)
+            for target, issues in targets:
+                print(f"Found {len(issues)} issue(s) to delete in {target.base_url} (project {target.project_key})")
+            if not args.yes:
+                answer = input(f"Delete {total} issue(s)? This cannot be undone. [y/N] ")
+                if answer.strip().lower() not in ("y", "yes"):
+                    print("Rollback cancelled.")
+                    return 0
+            results = await asyncio.gather(*(rollback_issues_async(issues, target, journal=journal, store=store)
+                                             for target, issues in targets))
+            deleted = sum(len(result['deleted']) for result in results)
+            failed = sum(len(result['failed']) for result in results)
+            print(f"\nDeleted: {deleted} issues")
+            if failed:
+                print(f"Failed to delete: {failed} issues")
+            return 1 if failed else 0
+        
+        # The first Ctrl-C (or SIGTERM) lets the issues already sent finish, a second Ctrl-C stops at once;
+        # SIGUSR1 pauses and resumes the run (same as create_jira_tasks.main)
+        control = RunControl()
+        log = print
+        
+        def on_stop_signal(signum, frame):
+            if control.cancelled and signum == signal.SIGINT:
+                raise KeyboardInterrupt
+            control.cancel()
+            log(f"Cancelling: no new issues are sent, waiting up to {control.drain_timeout:.0f}s "
+                f"for the issues already sent...")
+        
+        def on_pause_signal(signum, frame):
+            if control.paused:
+                control.resume()
+                log("▶ Resumed")
+            elif control.dispatching:
+                control.pause()
+                log("⏸ Paused: no new issues are sent, issues already sent are still created")
+        
+        signal.signal(signal.SIGINT, on_stop_signal)
+        signal.signal(signal.SIGTERM, on_stop_signal)
+        if hasattr(signal, "SIGUSR1"):
+            signal.signal(signal.SIGUSR1, on_pause_signal)
+        
+        # The file is parsed once for the checks and the assignees, and once more to create the issues
+        try:
+            graph, check, assignees = read_task_checks(TASKS_FILE, args.parse_workers, not args.no_preflight,
+                                                       warn=lambda message: print(f"⚠ {message}"))
+        except TaskFileError as e:
+            report_task_errors(TASKS_FILE, [str(e)])
+        report_task_errors(TASKS_FILE, graph.errors())
+        for warning in graph.warnings():
+            print(f"⚠ {warning}")
+        if check:
+            report_task_errors(TASKS_FILE, await preflight_check_async(check, graph, clients, cache=MetadataCache()))
+        account_ids = await resolve_account_ids_async([EMAIL] + assignees, client, cache=UserCache())
+        assignee_account_id = account_ids.get(EMAIL.strip().lower())
+        if not assignee_account_id:
+            print(f"⚠ Could not find account ID for {EMAIL}. Issues will be created without assignment.")
+        
+        last_run = journal.last_run() if journal else None
+        if last_run and last_run.get('cancelled'):
+            print(f"The previous run was cancelled after {last_run['created']} issue(s), continuing it")
+        print(f"Creating tasks from {TASKS_FILE} in Jira project {client.project_key} "
+              f"({client.concurrency} requests in flight, using {client.backend})...")
+        print(f"Jira URL: {client.base_url}\n")
+        with StatusLine(client.metrics) as status:
+            log = status.log
+            tasks = iter_tasks_parallel(TASKS_FILE, args.parse_workers)
+            outcome = await create_issues_async(tasks, client, assignee_account_id,
+                                                log=status.log, journal=journal, account_ids=account_ids,
+                                                clients=clients, priorities=graph.heights(), store=store,
+                                                control=control)
+            if outcome['links'] and not control.cancelled:
+                status.log("")
+                outcome.update(await create_issue_links_async(outcome['links'], client, log=status.log,
+                                                              clients=clients, control=control))
+            log = print
+        outcome['metrics'] = client.metrics.snapshot()
+        outcome['cancelled'] = control.cancelled
+        if journal:
+            journal.record_run(outcome, control.cancelled)
+    finally:
+        await close_clients(clients)
+        if journal:
+            journal.close()
+        if store:
+            store.close()
+    
+    if not outcome['results'] and not outcome['cancelled']:
+        print("No tasks found in the file. Please add tasks to the file.")
+        return 1
+    
+    print()
+    print_summary(outcome)
+    if args.metrics_json:
+        with open(args.metrics_json, 'w', encoding='utf-8') as f:
+            json.dump(outcome['metrics'], f, indent=2)
+        print(f"\nRun statistics written to: {args.metrics_json}")
+    if outcome['cancelled']:
+        return 130
+    # Non-zero exit status so a CI job notices partial imports
+    return 1 if outcome['failed_issues'] else 0
+
+def main():
+    """Create all Jira tasks asynchronously"""
+    parser = argparse.ArgumentParser(description="Create Jira tasks from a tasks file (asyncio, for CI)")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY,
+                        help=f"Maximum number of requests in flight (default: {DEFAULT_CONCURRENCY})")
+    parser.add_argument("--no-journal", action="store_true",
+                        help=f"Do not skip or record tasks in the run journal (<tasks file>{JOURNAL_SUFFIX})")
+    parser.add_argument("--no-store", action="store_true",
+                        help=f"Do not add the created issues to the local issue store ({ISSUE_STORE_FILE})")
+    parser.add_argument("--rollback", action="store_true",
+                        help="Delete the issues created from the tasks file (according to the run journal)")
+    parser.add_argument("--yes", action="store_true",
+                        help="Do not ask for confirmation before deleting issues")
+    parser.add_argument("--metrics-json", metavar="FILE",
+                        help="Write request and throughput statistics of the run to FILE as JSON")
+    parser.add_argument("--no-preflight", action="store_true",
+                        help="Do not check the tasks against the issue types and fields of their projects")
+    parser.add_argument("--parse-workers", type=int, default=PARSE_WORKERS,
+                        help=f"Processes parsing the tasks file and encoding payloads, 0 for one per CPU "
+                             f"(default: {PARSE_WORKERS})")
+    parser.add_argument("--backend", choices=BACKENDS,
+                        help="HTTP library to use (default: aiohttp if installed, else httpx)")
+    args = parser.parse_args()
+    
+    if available_backend(args.backend) is None:
+        print(f"Error: create_jira_tasks_async.py requires {args.backend or 'aiohttp or httpx'}. "
+              f"Install it with: pip install {args.backend or 'aiohttp'}")
+        sys.exit(1)
+    
+    validate_config()
+    if not args.rollback:
+        check_tasks_file(TASKS_FILE)
+    sys.exit(asyncio.run(run(args)))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,215 @@
+"""
+Local issue store of create_jira_tasks.py
+
+SQLite database of every issue created by the tool, to look issues up
+(and export them) without searching Jira.
+"""
+
+import csv
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+from jira_task_readers import ISSUE_KEY_PATTERN
+
+ISSUE_STORE_FILE = os.getenv("JIRA_ISSUE_STORE", os.path.join(os.path.expanduser("~"), ".jira_task_creator", "issues.db"))
+STORE_BATCH_SIZE = 200  # Created issues written to the issue store per transaction
+STORE_FLUSH_INTERVAL = 2.0  # Seconds - maximum time a created issue waits before being written to the store
+
+class IssueStore:
+    """
+    Local SQLite database of the issues created by the tool.
+    
+    Answers "which key did this task get" without a JQL search against
+    Jira: issues are indexed by key, project, summary hash and parent key.
+    Created issues are buffered and written in one transaction per
+    STORE_BATCH_SIZE issues (or every STORE_FLUSH_INTERVAL seconds), and
+    close() writes the rest. Issues deleted by a rollback are removed.
+    """
+    
+    COLUMNS = ("site", "project", "key", "summary", "parent_key", "issue_type", "tasks_file", "created")
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS issues (
+            site TEXT NOT NULL,
+            project TEXT NOT NULL,
+            key TEXT NOT NULL,
+            summary TEXT NOT NULL,
+            summary_hash TEXT NOT NULL,
+            parent_key TEXT,
+            issue_type TEXT,
+            tasks_file TEXT,
+            created TEXT NOT NULL,
+            PRIMARY KEY (site, key)
+        );
+        CREATE INDEX IF NOT EXISTS issues_key ON issues (key);
+        CREATE INDEX IF NOT EXISTS issues_project ON issues (site, project);
+        CREATE INDEX IF NOT EXISTS issues_summary ON issues (summary_hash);
+        CREATE INDEX IF NOT EXISTS issues_parent ON issues (parent_key);
+    """
+    
+    def __init__(self, path: str = ISSUE_STORE_FILE, source: Optional[str] = None,
+                 batch_size: int = STORE_BATCH_SIZE, flush_interval: float = STORE_FLUSH_INTERVAL):
+        """
+        Args:
+            path: Path of the database file (created if it does not exist)
+            source: Tasks file the recorded issues come from
+            batch_size: Number of issues written per transaction
+            flush_interval: Maximum number of seconds an issue stays buffered
+        """
+        self.path = path
+        self.source = os.path.abspath(source) if source else None
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval
+        self._lock = threading.Lock()
+        self._conn = None
+        self._pending = []
+        self._last_flush = time.monotonic()
+    
+    @staticmethod
+    def summary_hash(summary: str) -> str:
+        """Hash used to look up a summary (case and surrounding spaces are ignored)"""
+        return hashlib.sha1(summary.strip().lower().encode('utf-8')).hexdigest()[:16]
+    
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")  # Lookups do not wait for a run writing issues
+            self._conn.executescript(self.SCHEMA)
+        return self._conn
+    
+    def record(self, base_url: str, project_key: str, issue_key: str, summary: str,
+               parent_key: Optional[str] = None, issue_type: Optional[str] = None):
+        """
+        Add a created issue (written with the next batch)
+        
+        Args:
+            base_url: Jira base URL the issue was created in
+            project_key: Project of the issue
+            issue_key: Key of the issue
+            summary: Summary of the task
+            parent_key: Key of the parent issue of a subtask
+            issue_type: Issue type given in the tasks file (TYPE:)
+        """
+        row = (base_url, project_key, issue_key, summary, self.summary_hash(summary), parent_key, issue_type,
+               self.source, datetime.now(timezone.utc).isoformat(timespec='seconds'))
+        with self._lock:
+            self._pending.append(row)
+            if (len(self._pending) >= self.batch_size
+                    or time.monotonic() - self._last_flush >= self.flush_interval):
+                self._flush()
+    
+    def _flush(self):
+        if self._pending:
+            with self._connect() as conn:
+                conn.executemany("INSERT OR REPLACE INTO issues (site, project, key, summary, summary_hash, "
+                                 "parent_key, issue_type, tasks_file, created) "
+                                 "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", self._pending)
+            self._pending = []
+        self._last_flush = time.monotonic()
+    
+    def flush(self):
+        """Write the buffered issues"""
+        with self._lock:
+            self._flush()
+    
+    def remove(self, base_url: str, issue_key: str, subtasks: bool = False):
+        """Forget an issue that was deleted (and its subtasks if they were deleted with it)"""
+        query = "DELETE FROM issues WHERE site = ? AND (key = ?" + (" OR parent_key = ?)" if subtasks else ")")
+        values = (base_url, issue_key) + ((issue_key,) if subtasks else ())
+        with self._lock:
+            self._flush()
+            with self._connect() as conn:
+                conn.execute(query, values)
+    
+    def find(self, text: Optional[str] = None, project_key: Optional[str] = None,
+             parent_key: Optional[str] = None, limit: Optional[int] = None) -> List[Dict]:
+        """
+        Look up created issues
+        
+        Args:
+            text: Issue key, or summary (exact match, ignoring case, else any summary containing it);
+                  None for every issue
+            project_key: Only issues of this project
+            parent_key: Only subtasks of this issue
+            limit: Maximum number of issues returned
+        
+        Returns:
+            Issues as dictionaries with the keys of COLUMNS, oldest first
+        """
+        self.flush()
+        filters = []
+        values = []
+        if project_key:
+            filters.append("project = ?")
+            values.append(project_key.upper())
+        if parent_key:
+            filters.append("parent_key = ?")
+            values.append(parent_key.upper())
+        
+        if not text:
+            searches = [(None, ())]
+        elif ISSUE_KEY_PATTERN.match(text.strip()):
+            searches = [("key = ?", (text.strip().upper(),))]
+        else:
+            searches = [("summary_hash = ?", (self.summary_hash(text),)),
+                        ("summary LIKE ? ESCAPE '\\'", ("%" + re.sub(r"([%_\\])", r"\\\1", text.strip()) + "%",))]
+        
+        conn = self._connect()
+        for search, search_values in searches:
+            where = filters + ([search] if search else [])
+            query = f"SELECT {', '.join(self.COLUMNS)} FROM issues"
+            if where:
+                query += " WHERE " + " AND ".join(where)
+            query += " ORDER BY created, rowid"
+            if limit:
+                query += f" LIMIT {int(limit)}"
+            with self._lock:
+                rows = conn.execute(query, values + list(search_values)).fetchall()
+            if rows:
+                return [dict(zip(self.COLUMNS, row)) for row in rows]
+        return []
+    
+    def close(self):
+        """Write the buffered issues and close the database"""
+        with self._lock:
+            if self._pending:
+                self._flush()
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
+
+def export_issues(issues: List[Dict], file_path: str) -> str:
+    """
+    Write issues found in the IssueStore to a file
+    
+    Args:
+        issues: Issues returned by IssueStore.find
+        file_path: Output file; .json writes a JSON list, anything else CSV
+    
+    Returns:
+        Format written ("json" or "csv")
+    """
+    if file_path.lower().endswith(".json"):
+        with open(file_path, 'w', encoding='utf-8') as f:
+            json.dump(issues, f, indent=2, ensure_ascii=False)
+        return "json"
+    with open(file_path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=IssueStore.COLUMNS)
+        writer.writeheader()
+        writer.writerows(issues)
+    return "csv"
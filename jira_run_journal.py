@@ -0,0 +1,282 @@
+"""
+Run journal of create_jira_tasks.py
+
+Records the issues created from a tasks file next to it, keyed by a
+content hash of every task, so an interrupted run can be resumed and
+rolled back.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+from jira_task_scheduler import TaskGraph
+
+JOURNAL_SUFFIX = ".journal"  # Run journal is stored next to the tasks file with this suffix
+JOURNAL_FSYNC_EVERY = 50  # Journal entries written between two fsync calls
+JOURNAL_FSYNC_INTERVAL = 2.0  # Seconds - maximum time between two fsync calls
+
+class TaskFingerprinter:
+    """
+    Computes a stable content hash for every task, one task at a time.
+    
+    The hash covers the summary, description and parent of a task. Tasks
+    pointing at another task of the file (PARENT-n or an ID) include the hash
+    of that task, so editing or reordering parent tasks never matches the
+    wrong child. Identical tasks get different hashes based on how often they
+    occurred before.
+    
+    Tasks can be added while a file is still being parsed: the hash of a
+    task whose parent has not been read yet is filled in once it is.
+    """
+    
+    def __init__(self, graph: Optional[TaskGraph] = None):
+        """
+        Args:
+            graph: Graph the tasks are added to (default: a graph of its own)
+        """
+        self.graph = graph
+        self._own_graph = graph is None
+        if self._own_graph:
+            self.graph = TaskGraph()
+        self.fingerprints = []  # One per task, None until known
+        self._occurrences = {}
+        self._tasks = []
+    
+    def _digest(self, *parts) -> str:
+        content = json.dumps(parts, ensure_ascii=False)
+        base = hashlib.sha256(content.encode('utf-8')).hexdigest()
+        self._occurrences[base] = self._occurrences.get(base, 0) + 1
+        if self._occurrences[base] == 1:
+            return base
+        return hashlib.sha256(f"{base}:{self._occurrences[base]}".encode('ascii')).hexdigest()
+    
+    def add(self, task: Dict) -> int:
+        """Add the next task (after adding it to the graph, if the graph is shared) and return its index"""
+        index = len(self._tasks)
+        self._tasks.append(task)
+        self.fingerprints.append(None)
+        if self._own_graph:
+            self.graph.add(task)
+        
+        if index not in self.graph.references:
+            self._resolve(index, task.get('parent_key'))
+        else:
+            parent = self.graph.parents[index]
+            if parent is not None and self.fingerprints[parent] is not None:
+                self._resolve(index, self.fingerprints[parent])
+        # Tasks added before their parent are resolved in _resolve once the parent hash is known
+        return index
+    
+    def _resolve(self, index: int, parent):
+        # Hash a task, then every child of it that was waiting for this hash
+        stack = [(index, parent)]
+        while stack:
+            index, parent = stack.pop()
+            task = self._tasks[index]
+            self.fingerprints[index] = self._digest(task['summary'], task['description'], parent)
+            for child in reversed(self.graph.children.get(index, ())):
+                if child < len(self._tasks) and self.fingerprints[child] is None:
+                    stack.append((child, self.fingerprints[index]))
+    
+    def finish(self):
+        """Compute the remaining hashes once every task has been added (dangling references and cycles)"""
+        for index, fingerprint in enumerate(self.fingerprints):
+            if fingerprint is None:
+                kind, value = self.graph.references[index]
+                self._resolve(index, f"PARENT-{value}" if kind == 'ref' else f"ID-{value}")
+
+def task_fingerprints(tasks: List[Dict]) -> List[str]:
+    """
+    Compute a stable content hash for every task (see TaskFingerprinter)
+    
+    Args:
+        tasks: Tasks as returned by parse_tasks_file
+    
+    Returns:
+        List of hex digests, one per task, in input order
+    """
+    fingerprinter = TaskFingerprinter()
+    for task in tasks:
+        fingerprinter.add(task)
+    fingerprinter.finish()
+    return fingerprinter.fingerprints
+
+class RunJournal:
+    """
+    Append-only record of the issues created from a tasks file.
+    
+    Every created issue is written as one JSON line holding the task
+    fingerprint and the issue key, so an interrupted run can be started
+    again and skip everything that was already created. Lines are flushed
+    right away (surviving a crash or Ctrl-C); fsync calls are batched every
+    JOURNAL_FSYNC_EVERY entries or JOURNAL_FSYNC_INTERVAL seconds. A run
+    that ends (or is cancelled) appends a snapshot of its counts.
+    """
+    
+    def __init__(self, path: str, fsync_every: int = JOURNAL_FSYNC_EVERY,
+                 fsync_interval: float = JOURNAL_FSYNC_INTERVAL):
+        """
+        Args:
+            path: Path of the journal file (created if it does not exist)
+            fsync_every: Number of entries between two fsync calls
+            fsync_interval: Maximum number of seconds between two fsync calls
+        """
+        self.path = path
+        self.fsync_every = max(1, fsync_every)
+        self.fsync_interval = fsync_interval
+        self._lock = threading.Lock()
+        self._file = None
+        self._pending = 0
+        self._last_sync = time.monotonic()
+    
+    @staticmethod
+    def path_for(tasks_file: str) -> str:
+        """Get the journal path used for a tasks file"""
+        return tasks_file + JOURNAL_SUFFIX
+    
+    def entries(self) -> List[Dict]:
+        """Read all entries from the journal (a truncated last line is ignored)"""
+        if not os.path.exists(self.path):
+            return []
+        entries = []
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entries.append(json.loads(line))
+                except json.JSONDecodeError:
+                    continue
+        return entries
+    
+    def completed(self, base_url: str, project_key: str) -> Dict[str, str]:
+        """
+        Get the issues already created for a Jira site and project
+        
+        Args:
+            base_url: Jira base URL of the run
+            project_key: Project key of the run
+        
+        Returns:
+            Dictionary mapping task fingerprints to issue keys
+        """
+        return {entry['hash']: entry['key'] for entry in self.created(base_url, project_key)}
+    
+    def targets(self) -> List[tuple]:
+        """Get the (Jira base URL, project key) pairs of the journal, in order of first use"""
+        targets = {}
+        for entry in self.entries():
+            if 'key' in entry:
+                targets.setdefault((entry.get('site'), entry.get('project')), True)
+        return list(targets)
+    
+    def last_run(self) -> Optional[Dict]:
+        """Get the snapshot recorded at the end of the last run (see record_run), if any"""
+        runs = [entry['run'] for entry in self.entries() if 'run' in entry]
+        return runs[-1] if runs else None
+    
+    def created(self, base_url: str, project_key: str) -> List[Dict]:
+        """
+        Get the journal entries of issues that still exist (not rolled back)
+        
+        Args:
+            base_url: Jira base URL of the run
+            project_key: Project key of the run
+        
+        Returns:
+            Journal entries in the order the issues were created
+        """
+        created = {}
+        for entry in self.entries():
+            if entry.get('site') != base_url or entry.get('project') != project_key:
+                continue
+            if entry.get('deleted'):
+                created.pop(entry.get('key'), None)
+            else:
+                created[entry['key']] = entry
+        return list(created.values())
+    
+    def record_deleted(self, issue_key: str, base_url: str, project_key: str):
+        """
+        Record that an issue was deleted, so a later run creates its task again
+        
+        Args:
+            issue_key: Key of the deleted issue
+            base_url: Jira base URL of the run
+            project_key: Project key of the run
+        """
+        self._append({
+            'key': issue_key, 'site': base_url, 'project': project_key, 'deleted': True,
+            'time': datetime.now(timezone.utc).isoformat(timespec='seconds')
+        })
+    
+    def record(self, fingerprint: str, issue_key: str, base_url: str, project_key: str,
+               summary: str, parent_ref: Optional[int] = None, parent_key: Optional[str] = None):
+        """
+        Append a created issue to the journal
+        
+        Args:
+            fingerprint: Task fingerprint from task_fingerprints
+            issue_key: Key of the created issue
+            base_url: Jira base URL of the run
+            project_key: Project key of the run
+            summary: Task summary (for humans reading the journal)
+            parent_ref: Position of a parent task (its PARENT-n number)
+            parent_key: Resolved parent issue key of a subtask
+        """
+        entry = {
+            'hash': fingerprint, 'key': issue_key, 'site': base_url, 'project': project_key,
+            'summary': summary, 'parent_ref': parent_ref, 'parent_key': parent_key,
+            'time': datetime.now(timezone.utc).isoformat(timespec='seconds')
+        }
+        self._append(entry)
+    
+    def record_run(self, outcome: Dict, cancelled: bool = False):
+        """
+        Append a snapshot of a finished or cancelled run
+        
+        Args:
+            outcome: Outcome of the run (see RunResults.outcome)
+            cancelled: Whether the run was cancelled before every task was sent
+        """
+        self._append({'run': {
+            'cancelled': cancelled, 'tasks': len(outcome['results']),
+            'created': len(outcome['created_issues']), 'resumed': len(outcome['resumed_issues']),
+            'failed': len(outcome['failed_issues']), 'not_sent': len(outcome.get('cancelled_issues', [])),
+            'time': datetime.now(timezone.utc).isoformat(timespec='seconds')
+        }})
+    
+    def _append(self, entry: Dict):
+        line = json.dumps(entry, ensure_ascii=False) + "\n"
+        with self._lock:
+            if self._file is None:
+                self._file = open(self.path, 'a', encoding='utf-8')
+            self._file.write(line)
+            self._file.flush()
+            self._pending += 1
+            if (self._pending >= self.fsync_every
+                    or time.monotonic() - self._last_sync >= self.fsync_interval):
+                self._sync()
+    
+    def _sync(self):
+        os.fsync(self._file.fileno())
+        self._pending = 0
+        self._last_sync = time.monotonic()
+    
+    def close(self):
+        """Flush pending entries to disk and close the journal"""
+        with self._lock:
+            if self._file is not None:
+                self._file.flush()
+                self._sync()
+                self._file.close()
+                self._file = None
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
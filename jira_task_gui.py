@@ -7,6 +7,7 @@ Built with tkinter for Windows compatibility
 import tkinter as tk
 from tkinter import ttk, scrolledtext, filedialog, messagebox
 import threading
+import queue
 import os
 import sys
 from pathlib import Path
@@ -17,13 +18,25 @@ import json
 import base64
 from typing import List, Dict, Optional
 
-# We'll import from create_jira_tasks.py dynamically when needed
-# to avoid issues with environment variables
+# create_jira_tasks.py is imported when first needed; imports get their
+# settings from an ImportConfig, never from environment variables
 
 # Default credentials (users should update these)
 DEFAULT_EMAIL = "your-email@example.com"
 DEFAULT_API_TOKEN = "YOUR_API_TOKEN_HERE"
 
+# Output log rendering
+LOG_POLL_INTERVAL_MS = 100  # How often queued log messages are written to the widget
+LOG_BATCH_SIZE = 2000  # Maximum messages written per poll, so the UI stays responsive
+LOG_MAX_LINES = 5000  # Oldest lines are dropped beyond this, so memory stays flat on huge runs
+
+# Tasks preview
+PREVIEW_POLL_INTERVAL_MS = 50  # How often the indexing progress is picked up while the file is being read
+PREVIEW_ROW_HEIGHT = 20  # Fallback Treeview row height in pixels (when the theme does not set one)
+
+# Progress panel
+PROGRESS_INTERVAL_MS = 500  # How often the progress bar and run statistics are refreshed
+
 
 class JiraTaskCreatorGUI:
     def __init__(self, root):
@@ -38,9 +51,29 @@ class JiraTaskCreatorGUI:
         self.email = tk.StringVar(value=DEFAULT_EMAIL)
         self.api_token = tk.StringVar(value=DEFAULT_API_TOKEN)
         self.tasks_file = tk.StringVar(value="tasks.txt")
+        self.max_workers = tk.IntVar(value=8)
+        self.use_bulk = tk.BooleanVar(value=False)
+        self.use_journal = tk.BooleanVar(value=True)
+        self.use_sync = tk.BooleanVar(value=False)
         self.is_creating = False
+        # Worker threads never touch Tk: log lines and status updates are queued
+        # here and written by the main loop (see drain_log_queue)
+        self.log_queue = queue.Queue()
+        # Tasks preview: the file is indexed (TaskIndex, or TaskList for CSV, JSON Lines and YAML
+        # files) and only the tasks of the visible window are rendered in the Treeview (see render_preview)
+        self.preview_index = None
+        self.preview_offset = 0
+        self.preview_queue = queue.Queue()
+        self.preview_generation = 0
+        # Statistics of the current run (RunMetrics), shown in the progress panel
+        self.metrics = None
+        # Import running in the background (ImportJob), so it can be cancelled
+        self.job = None
         
         self.create_widgets()
+        self.root.after(LOG_POLL_INTERVAL_MS, self.drain_log_queue)
+        # Closing the window cancels a running import cleanly instead of killing it mid-request
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
         
     def create_widgets(self):
         # Main container
@@ -90,6 +123,19 @@ class JiraTaskCreatorGUI:
                                    command=self.toggle_token_visibility)
         show_token_btn.grid(row=0, column=1, padx=(5, 0))
         
+        # Parallel requests
+        ttk.Label(config_frame, text="Parallel Requests:").grid(row=4, column=0, sticky=tk.W, pady=5)
+        workers_frame = ttk.Frame(config_frame)
+        workers_frame.grid(row=4, column=1, sticky=(tk.W, tk.E), padx=5, pady=5)
+        ttk.Spinbox(workers_frame, from_=1, to=50, textvariable=self.max_workers, width=6).grid(
+            row=0, column=0, sticky=tk.W)
+        ttk.Checkbutton(workers_frame, text="Use bulk create (50 issues per request)",
+                        variable=self.use_bulk).grid(row=0, column=1, sticky=tk.W, padx=(10, 0))
+        ttk.Checkbutton(workers_frame, text="Skip tasks already created (run journal)",
+                        variable=self.use_journal).grid(row=0, column=2, sticky=tk.W, padx=(10, 0))
+        ttk.Checkbutton(workers_frame, text="Sync with existing issues",
+                        variable=self.use_sync).grid(row=1, column=1, columnspan=2, sticky=tk.W, padx=(10, 0))
+        
         # Tasks File Section
         file_frame = ttk.LabelFrame(main_frame, text="Tasks File", padding="10")
         file_frame.grid(row=2, column=0, columnspan=3, sticky=(tk.W, tk.E), pady=(0, 10))
@@ -115,11 +161,29 @@ class JiraTaskCreatorGUI:
         preview_frame.rowconfigure(0, weight=1)
         main_frame.rowconfigure(3, weight=1)
         
-        self.preview_text = scrolledtext.ScrolledText(preview_frame, height=10, wrap=tk.WORD)
-        self.preview_text.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
-        
+        columns = ("number", "summary", "parent", "assignee", "description")
+        self.preview_tree = ttk.Treeview(preview_frame, columns=columns, show="headings",
+                                         height=10, selectmode=tk.BROWSE)
+        for column, heading, width, stretch in (("number", "#", 60, False), ("summary", "Summary", 320, True),
+                                                ("parent", "Parent", 100, False),
+                                                ("assignee", "Assignee", 160, False),
+                                                ("description", "Desc. Length", 90, False)):
+            self.preview_tree.heading(column, text=heading)
+            self.preview_tree.column(column, width=width, stretch=stretch,
+                                     anchor=tk.E if column in ("number", "description") else tk.W)
+        self.preview_tree.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
+        
+        self.preview_scrollbar = ttk.Scrollbar(preview_frame, orient=tk.VERTICAL, command=self.scroll_preview)
+        self.preview_scrollbar.grid(row=0, column=1, sticky=(tk.N, tk.S))
+        self.preview_tree.bind("<Configure>", lambda event: self.render_preview())
+        self.preview_tree.bind("<MouseWheel>", self.on_preview_wheel)
+        self.preview_tree.bind("<Button-4>", self.on_preview_wheel)
+        self.preview_tree.bind("<Button-5>", self.on_preview_wheel)
+        
+        self.preview_message = tk.StringVar()
+        ttk.Label(preview_frame, textvariable=self.preview_message).grid(row=1, column=0, sticky=tk.W, pady=(5, 0))
         ttk.Button(preview_frame, text="Refresh Preview", 
-                  command=self.refresh_preview).grid(row=1, column=0, pady=(5, 0))
+                  command=self.refresh_preview).grid(row=1, column=0, columnspan=2, sticky=tk.E, pady=(5, 0))
         
         # Action Buttons
         button_frame = ttk.Frame(main_frame)
@@ -129,15 +193,41 @@ class JiraTaskCreatorGUI:
                                      command=self.create_tasks, width=20)
         self.create_btn.pack(side=tk.LEFT, padx=5)
         
+        self.rollback_btn = ttk.Button(button_frame, text="Rollback Last Run",
+                                       command=self.rollback_tasks, width=20)
+        self.rollback_btn.pack(side=tk.LEFT, padx=5)
+        
+        self.pause_btn = ttk.Button(button_frame, text="Pause", command=self.toggle_pause,
+                                    width=10, state=tk.DISABLED)
+        self.pause_btn.pack(side=tk.LEFT, padx=5)
+        
+        self.cancel_btn = ttk.Button(button_frame, text="Cancel", command=self.cancel_tasks,
+                                     width=10, state=tk.DISABLED)
+        self.cancel_btn.pack(side=tk.LEFT, padx=5)
+        
+        ttk.Button(button_frame, text="Find Issues", 
+                  command=self.find_issues).pack(side=tk.LEFT, padx=5)
+        
         ttk.Button(button_frame, text="Clear Log", 
                   command=self.clear_log).pack(side=tk.LEFT, padx=5)
         
+        # Progress Section
+        progress_frame = ttk.Frame(main_frame)
+        progress_frame.grid(row=5, column=0, columnspan=3, sticky=(tk.W, tk.E), pady=(0, 10))
+        progress_frame.columnconfigure(0, weight=1)
+        
+        self.progress_bar = ttk.Progressbar(progress_frame, mode="determinate")
+        self.progress_bar.grid(row=0, column=0, sticky=(tk.W, tk.E))
+        self.stats_var = tk.StringVar(value="")
+        ttk.Label(progress_frame, textvariable=self.stats_var, anchor=tk.W).grid(
+            row=1, column=0, sticky=(tk.W, tk.E), pady=(5, 0))
+        
         # Log/Output Section
         log_frame = ttk.LabelFrame(main_frame, text="Output Log", padding="10")
-        log_frame.grid(row=5, column=0, columnspan=3, sticky=(tk.W, tk.E, tk.N, tk.S))
+        log_frame.grid(row=6, column=0, columnspan=3, sticky=(tk.W, tk.E, tk.N, tk.S))
         log_frame.columnconfigure(0, weight=1)
         log_frame.rowconfigure(0, weight=1)
-        main_frame.rowconfigure(5, weight=1)
+        main_frame.rowconfigure(6, weight=1)
         
         self.log_text = scrolledtext.ScrolledText(log_frame, height=8, wrap=tk.WORD,
                                                   state=tk.DISABLED)
@@ -147,7 +237,7 @@ class JiraTaskCreatorGUI:
         self.status_var = tk.StringVar(value="Ready")
         status_bar = ttk.Label(main_frame, textvariable=self.status_var, 
                               relief=tk.SUNKEN, anchor=tk.W)
-        status_bar.grid(row=6, column=0, columnspan=3, sticky=(tk.W, tk.E))
+        status_bar.grid(row=7, column=0, columnspan=3, sticky=(tk.W, tk.E))
         
         # Load initial preview
         self.refresh_preview()
@@ -163,7 +253,9 @@ class JiraTaskCreatorGUI:
         """Browse for tasks file"""
         filename = filedialog.askopenfilename(
             title="Select Tasks File",
-            filetypes=[("Text files", "*.txt"), ("All files", "*.*")]
+            filetypes=[("Tasks files", "*.txt *.csv *.jsonl *.ndjson *.yaml *.yml"), ("Text files", "*.txt"),
+                       ("CSV files", "*.csv"), ("JSON Lines files", "*.jsonl *.ndjson"),
+                       ("YAML files", "*.yaml *.yml"), ("All files", "*.*")]
         )
         if filename:
             self.tasks_file.set(filename)
@@ -189,54 +281,198 @@ class JiraTaskCreatorGUI:
             subprocess.run(["xdg-open", file_path])
     
     def refresh_preview(self):
-        """Refresh tasks preview"""
+        """Index the tasks file in the background and show its tasks in the preview"""
         file_path = self.tasks_file.get()
-        self.preview_text.delete(1.0, tk.END)
+        
+        # Any indexing still running for a previous file is ignored when it finishes
+        self.preview_generation += 1
+        self.preview_index = None
+        self.preview_offset = 0
+        self.render_preview()
         
         if not file_path:
-            self.preview_text.insert(tk.END, "No file selected")
+            self.preview_message.set("No file selected")
             return
         
         if not os.path.exists(file_path):
-            self.preview_text.insert(tk.END, f"File not found: {file_path}")
+            self.preview_message.set(f"File not found: {file_path}")
             return
         
+        self.preview_message.set("Reading tasks...")
+        self.status_var.set("Reading tasks file...")
+        thread = threading.Thread(target=self._preview_thread, args=(file_path, self.preview_generation))
+        thread.daemon = True
+        thread.start()
+        self.root.after(PREVIEW_POLL_INTERVAL_MS, self.drain_preview_queue, self.preview_generation)
+    
+    def _preview_thread(self, file_path, generation):
+        """Load or update the index of the tasks file (only changed parts of a text file are scanned)"""
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-                self.preview_text.insert(tk.END, content)
+            from create_jira_tasks import TaskIndex, open_task_index
             
-            # Try to parse and show task count
+            def progress(done, total):
+                self.preview_queue.put((generation, "progress", done * 100 // max(1, total)))
+            
+            index = open_task_index(file_path, progress=progress)
+            counts = (index.count(TaskIndex.SUBTASK), index.count(TaskIndex.PLACEHOLDER))
+            self.preview_queue.put((generation, "index", (index, counts)))
+        except Exception as e:
+            self.preview_queue.put((generation, "error", e))
+    
+    def drain_preview_queue(self, generation):
+        """Pick up the indexing progress and show the index once ready (runs on the Tk main loop)"""
+        if generation != self.preview_generation:
+            return
+        
+        try:
+            while True:
+                item_generation, kind, payload = self.preview_queue.get_nowait()
+                if item_generation != generation:
+                    continue
+                if kind == "progress":
+                    self.preview_message.set(f"Indexing tasks... {payload}%")
+                elif kind == "error":
+                    self.preview_message.set(f"Error reading file: {payload}")
+                    self.status_var.set("Ready")
+                    return
+                else:
+                    self.preview_index, counts = payload
+                    self.render_preview()
+                    self.show_preview_counts(*counts)
+                    return
+        except queue.Empty:
+            pass
+        self.root.after(PREVIEW_POLL_INTERVAL_MS, self.drain_preview_queue, generation)
+    
+    def show_preview_counts(self, subtask_count, placeholder_count):
+        """Show the task counts of the indexed file in the status bar"""
+        task_count = len(self.preview_index)
+        self.preview_message.set(f"{task_count} task(s)")
+        if task_count > 0:
+            if subtask_count > 0:
+                regular_count = task_count - subtask_count
+                if placeholder_count:
+                    self.status_var.set(f"Ready - {task_count} task(s) found ({regular_count} parents, {subtask_count} subtasks) - Auto-link enabled")
+                else:
+                    self.status_var.set(f"Ready - {task_count} task(s) found ({regular_count} tasks, {subtask_count} subtasks)")
+            else:
+                self.status_var.set(f"Ready - {task_count} task(s) found in file")
+        else:
+            self.status_var.set("Ready - No tasks found (check file format)")
+    
+    def visible_preview_rows(self):
+        """Number of rows that fit in the preview"""
+        row_height = ttk.Style().lookup("Treeview", "rowheight")
+        try:
+            row_height = int(row_height)
+        except (TypeError, ValueError):
+            row_height = PREVIEW_ROW_HEIGHT
+        # One row is taken by the headings
+        return max(1, self.preview_tree.winfo_height() // row_height - 1)
+    
+    def render_preview(self):
+        """Read the tasks of the current window from the file and show them in the Treeview"""
+        index = self.preview_index
+        if index is not None and not index.fresh():
+            # The file was edited since it was indexed
+            return self.refresh_preview()
+        
+        visible = self.visible_preview_rows()
+        total = len(index) if index is not None else 0
+        self.preview_offset = max(0, min(self.preview_offset, total - visible))
+        
+        self.preview_tree.delete(*self.preview_tree.get_children())
+        if total:
             try:
-                # Simple task count by counting separators
-                task_count = content.count('\n---\n') + (1 if content.strip() else 0)
-                parent_lines = [line for line in content.split('\n') if line.strip().upper().startswith('PARENT:')]
-                subtask_count = len(parent_lines)
-                if task_count > 0:
-                    if subtask_count > 0:
-                        regular_count = task_count - subtask_count
-                        # Check for placeholder parents (PARENT-1, PARENT-2, etc.)
-                        placeholder_parents = [line for line in parent_lines if 'PARENT-' in line.upper()]
-                        if placeholder_parents:
-                            self.status_var.set(f"Ready - {task_count} task(s) found ({regular_count} parents, {subtask_count} subtasks) - Auto-link enabled")
-                        else:
-                            self.status_var.set(f"Ready - {task_count} task(s) found ({regular_count} tasks, {subtask_count} subtasks)")
-                    else:
-                        self.status_var.set(f"Ready - {task_count} task(s) found in file")
+                tasks = index.read(self.preview_offset, visible)
+            except (OSError, UnicodeDecodeError) as e:
+                tasks = []
+                self.preview_message.set(f"Error reading file: {e}")
+            for number, task in enumerate(tasks, self.preview_offset + 1):
+                if task["parent_ref"]:
+                    parent = f"PARENT-{task['parent_ref']}"
                 else:
-                    self.status_var.set("Ready - No tasks found (check file format)")
-            except:
-                pass
-        except Exception as e:
-            self.preview_text.insert(tk.END, f"Error reading file: {e}")
+                    parent = task["parent_key"] or task["parent_id"] or ""
+                self.preview_tree.insert("", tk.END, values=(number, task["summary"], parent, task["assignee"] or "",
+                                                             len(task["description"])))
+        
+        if total:
+            self.preview_scrollbar.set(self.preview_offset / total,
+                                       min(1.0, (self.preview_offset + visible) / total))
+        else:
+            self.preview_scrollbar.set(0.0, 1.0)
+    
+    def scroll_preview(self, action, amount, unit=None):
+        """Scrollbar command: move the preview window"""
+        visible = self.visible_preview_rows()
+        if action == "moveto":
+            self.preview_offset = int(float(amount) * (len(self.preview_index) if self.preview_index else 0))
+        elif unit == "pages":
+            self.preview_offset += int(amount) * visible
+        else:
+            self.preview_offset += int(amount)
+        self.render_preview()
+    
+    def on_preview_wheel(self, event):
+        """Scroll the preview with the mouse wheel"""
+        if event.num == 4 or event.delta > 0:
+            self.scroll_preview("scroll", -3, "units")
+        else:
+            self.scroll_preview("scroll", 3, "units")
+        return "break"
     
     def log(self, message):
-        """Add message to log"""
-        self.log_text.config(state=tk.NORMAL)
-        self.log_text.insert(tk.END, message + "\n")
-        self.log_text.see(tk.END)
-        self.log_text.config(state=tk.DISABLED)
-        self.root.update_idletasks()
+        """Add message to log (safe to call from any thread)"""
+        self.log_queue.put(("log", message))
+    
+    def set_status(self, message):
+        """Update the status bar (safe to call from any thread)"""
+        self.log_queue.put(("status", message))
+    
+    def drain_log_queue(self):
+        """Write queued log messages to the widget in one batch (runs on the Tk main loop)"""
+        lines = []
+        status = None
+        try:
+            for _ in range(LOG_BATCH_SIZE):
+                kind, message = self.log_queue.get_nowait()
+                if kind == "status":
+                    status = message
+                else:
+                    lines.append(message)
+        except queue.Empty:
+            pass
+        
+        if lines:
+            # Only follow the output if the user has not scrolled up
+            at_bottom = self.log_text.yview()[1] >= 0.999
+            self.log_text.config(state=tk.NORMAL)
+            self.log_text.insert(tk.END, "\n".join(lines) + "\n")
+            line_count = int(self.log_text.index("end-1c").split(".")[0])
+            if line_count > LOG_MAX_LINES:
+                self.log_text.delete("1.0", f"{line_count - LOG_MAX_LINES + 1}.0")
+            self.log_text.config(state=tk.DISABLED)
+            if at_bottom:
+                self.log_text.see(tk.END)
+        if status is not None:
+            self.status_var.set(status)
+        
+        # Poll again right away while there is a backlog
+        delay = 1 if not self.log_queue.empty() else LOG_POLL_INTERVAL_MS
+        self.root.after(delay, self.drain_log_queue)
+    
+    def update_progress(self):
+        """Refresh the progress bar and run statistics (runs on the Tk main loop)"""
+        if self.metrics is None:
+            return
+        from create_jira_tasks import format_metrics
+        
+        snapshot = self.metrics.snapshot()
+        self.progress_bar.config(maximum=max(1, snapshot['tasks_total']))
+        self.progress_bar["value"] = snapshot['tasks_done']
+        self.stats_var.set(format_metrics(snapshot))
+        if self.is_creating:
+            self.root.after(PROGRESS_INTERVAL_MS, self.update_progress)
     
     def clear_log(self):
         """Clear log output"""
@@ -281,11 +517,18 @@ class JiraTaskCreatorGUI:
         if not self.validate_inputs():
             return
         
-        # Disable button
+        # Disable buttons
         self.create_btn.config(state=tk.DISABLED)
+        self.rollback_btn.config(state=tk.DISABLED)
         self.is_creating = True
         self.status_var.set("Creating tasks...")
         
+        from create_jira_tasks import RunMetrics
+        self.metrics = RunMetrics()
+        self.progress_bar["value"] = 0
+        self.stats_var.set("")
+        self.root.after(PROGRESS_INTERVAL_MS, self.update_progress)
+        
         # Run in separate thread to avoid freezing GUI
         thread = threading.Thread(target=self._create_tasks_thread)
         thread.daemon = True
@@ -294,174 +537,51 @@ class JiraTaskCreatorGUI:
     def _create_tasks_thread(self):
         """Create tasks in background thread"""
         try:
-            # Set environment variables for the imported functions
-            os.environ["JIRA_BASE_URL"] = self.jira_base_url.get()
-            os.environ["JIRA_PROJECT_KEY"] = self.project_key.get()
-            os.environ["JIRA_EMAIL"] = self.email.get()
-            os.environ["JIRA_API_TOKEN"] = self.api_token.get()
-            os.environ["TASKS_FILE"] = self.tasks_file.get()
+            from create_jira_tasks import ImportConfig, ImportJob, print_summary
             
-            # Import here to get updated environment variables
-            # Need to reload module to pick up new env vars
-            import importlib
-            if 'create_jira_tasks' in sys.modules:
-                importlib.reload(sys.modules['create_jira_tasks'])
-            
-            from create_jira_tasks import (
-                JIRA_BASE_URL, PROJECT_KEY, EMAIL, API_TOKEN, TASKS_FILE,
-                get_user_account_id, create_jira_issue, parse_tasks_file
-            )
+            config = ImportConfig(base_url=self.jira_base_url.get(), email=self.email.get(),
+                                  api_token=self.api_token.get(), project_key=self.project_key.get(),
+                                  tasks_file=self.tasks_file.get(), workers=self.max_workers.get(),
+                                  bulk=self.use_bulk.get(), sync=self.use_sync.get(),
+                                  journal=self.use_journal.get())
             
             self.log("=" * 60)
             self.log("Starting task creation...")
-            self.log(f"Jira URL: {JIRA_BASE_URL}")
-            self.log(f"Project: {PROJECT_KEY}")
-            self.log(f"Tasks file: {TASKS_FILE}")
+            self.log(f"Jira URL: {config.base_url}")
+            self.log(f"Project: {config.project_key}")
+            self.log(f"Tasks file: {config.tasks_file}")
             self.log("=" * 60)
             self.log("")
             
-            # Get user account ID
-            self.log(f"Getting account ID for {EMAIL}...")
-            assignee_account_id = get_user_account_id(EMAIL)
-            if assignee_account_id:
-                self.log(f"✓ Found account ID: {assignee_account_id}\n")
-            else:
-                self.log("⚠ Could not find account ID. Issues will be created without assignment.\n")
-            
-            # Parse tasks
-            self.log(f"Reading tasks from: {TASKS_FILE}")
-            tasks = parse_tasks_file(TASKS_FILE)
-            
-            if not tasks:
+            self.job = ImportJob(config, on_event=self.on_job_event, metrics=self.metrics)
+            self.root.after(0, lambda: self.pause_btn.config(state=tk.NORMAL))
+            self.root.after(0, lambda: self.cancel_btn.config(state=tk.NORMAL))
+            outcome = self.job.run()
+            if outcome is None:
+                self.set_status("Error in tasks file")
+                return
+            if not outcome['results']:
                 self.log("❌ No tasks found in the file!")
+                self.set_status("Ready - No tasks found (check file format)")
                 return
             
-            # Separate parent tasks from subtasks
-            parent_tasks = []
-            subtasks = []
-            parent_keys_map = {}  # Maps parent_ref (1, 2, 3...) to actual issue keys
-            
-            for task in tasks:
-                if task.get('parent_ref') is not None:
-                    subtasks.append(task)
-                elif task.get('parent_key'):
-                    subtasks.append(task)
-                else:
-                    parent_tasks.append(task)
-            
-            self.log(f"Found {len(parent_tasks)} parent task(s) and {len(subtasks)} subtask(s) to create\n")
-            
-            # Create tasks
-            created_issues = []
-            failed_issues = []
-            
-            # First, create all parent tasks and store their keys
-            if parent_tasks:
-                self.log("=" * 60)
-                self.log("Creating Parent Tasks")
-                self.log("=" * 60)
-                for i, task in enumerate(parent_tasks, 1):
-                    self.log(f"[{i}/{len(parent_tasks)}] Creating: {task['summary']}")
-                    result = create_jira_issue(task['summary'], task['description'], assignee_account_id)
-                    
-                    if result and 'key' in result:
-                        issue_key = result['key']
-                        issue_url = f"{JIRA_BASE_URL}/browse/{issue_key}"
-                        self.log(f"  ✓ Created: {issue_key} - {issue_url}")
-                        created_issues.append(issue_key)
-                        # Store the parent key by its position (1-based index)
-                        parent_keys_map[i] = issue_key
-                    else:
-                        self.log(f"  ✗ Failed to create issue")
-                        if result and 'error' in result:
-                            error_info = result['error']
-                            if 'error_messages' in error_info:
-                                for msg in error_info['error_messages']:
-                                    self.log(f"    Error: {msg}")
-                            if 'errors' in error_info:
-                                for key, value in error_info['errors'].items():
-                                    self.log(f"    {key}: {value}")
-                        failed_issues.append(task['summary'])
-                    self.log("")
-            
-            # Then, create all subtasks using parent keys
-            if subtasks:
-                self.log("=" * 60)
-                self.log("Creating Subtasks")
-                self.log("=" * 60)
-                for i, task in enumerate(subtasks, 1):
-                    # Determine parent key
-                    parent_key = None
-                    if task.get('parent_ref') is not None:
-                        # Use placeholder reference (PARENT-1, PARENT-2, etc.)
-                        parent_ref = task['parent_ref']
-                        parent_key = parent_keys_map.get(parent_ref)
-                        if not parent_key:
-                            self.log(f"[{i}/{len(subtasks)}] Creating: {task['summary']}")
-                            self.log(f"  ✗ Failed: Parent task #{parent_ref} was not created successfully")
-                            failed_issues.append(task['summary'])
-                            self.log("")
-                            continue
-                    elif task.get('parent_key'):
-                        # Use explicit parent key
-                        parent_key = task['parent_key']
-                    
-                    task_type = "Subtask"
-                    parent_info = f" (Parent: {parent_key})" if parent_key else ""
-                    self.log(f"[{i}/{len(subtasks)}] Creating {task_type}: {task['summary']}{parent_info}")
-                    
-                    result = create_jira_issue(
-                        task['summary'], 
-                        task['description'], 
-                        assignee_account_id,
-                        parent_key=parent_key
-                    )
-                
-                    if result and 'key' in result:
-                        issue_key = result['key']
-                        issue_url = f"{JIRA_BASE_URL}/browse/{issue_key}"
-                        self.log(f"  ✓ Created: {issue_key} - {issue_url}")
-                        created_issues.append(issue_key)
-                    else:
-                        self.log(f"  ✗ Failed to create issue")
-                        if result and 'error' in result:
-                            error_info = result['error']
-                            if 'error_messages' in error_info:
-                                for msg in error_info['error_messages']:
-                                    self.log(f"    Error: {msg}")
-                            if 'errors' in error_info:
-                                for key, value in error_info['errors'].items():
-                                    self.log(f"    {key}: {value}")
-                        failed_issues.append(task['summary'])
-                    self.log("")
-            
-            # Summary
-            self.log("=" * 60)
-            self.log("SUMMARY")
-            self.log("=" * 60)
-            self.log(f"Successfully created: {len(created_issues)} issues")
-            self.log(f"  - Parent tasks: {len(parent_tasks)}")
-            self.log(f"  - Subtasks: {len(subtasks)}")
-            if created_issues:
-                self.log("\nCreated issues:")
-                for key in created_issues:
-                    self.log(f"  - {key}")
-            
-            if failed_issues:
-                self.log(f"\nFailed to create: {len(failed_issues)} issues")
-                for summary in failed_issues:
-                    self.log(f"  - {summary}")
+            created_issues = outcome['created_issues']
+            self.log("")
+            print_summary(outcome, log=self.log)
             
-            total_tasks = len(parent_tasks) + len(subtasks)
-            self.status_var.set(f"Complete - {len(created_issues)}/{total_tasks} tasks created")
+            total_tasks = len(outcome['results'])
+            if outcome['cancelled']:
+                self.set_status(f"Cancelled - {len(created_issues)}/{total_tasks} tasks created")
+                return
+            self.set_status(f"Complete - {len(created_issues)}/{total_tasks} tasks created")
             
             # Show completion message
             self.root.after(0, lambda: messagebox.showinfo(
                 "Complete",
                 f"Task creation complete!\n\n"
                 f"Successfully created: {len(created_issues)}/{total_tasks} tasks\n"
-                f"  - Parent tasks: {len(parent_tasks)}\n"
-                f"  - Subtasks: {len(subtasks)}"
+                f"  - Parent tasks: {outcome['parent_count']}\n"
+                f"  - Subtasks: {outcome['subtask_count']}"
             ))
             
         except Exception as e:
@@ -470,13 +590,214 @@ class JiraTaskCreatorGUI:
             self.log(f"Error type: {type(e).__name__}")
             import traceback
             self.log(traceback.format_exc())
-            self.status_var.set("Error occurred")
+            self.set_status("Error occurred")
             self.root.after(0, lambda: messagebox.showerror("Error", error_msg))
         
         finally:
-            # Re-enable button
+            # Re-enable buttons
             self.root.after(0, lambda: self.create_btn.config(state=tk.NORMAL))
+            self.root.after(0, lambda: self.rollback_btn.config(state=tk.NORMAL))
+            self.root.after(0, lambda: self.pause_btn.config(state=tk.DISABLED, text="Pause"))
+            self.root.after(0, lambda: self.cancel_btn.config(state=tk.DISABLED))
+            self.job = None
             self.is_creating = False
+    
+    def on_job_event(self, kind, value):
+        """Show the events of the running ImportJob (called from its thread)"""
+        if kind == "log":
+            self.log(value)
+        elif kind == "status":
+            self.set_status(value)
+        elif kind == "errors":
+            for error in value:
+                self.log(f"❌ {error}")
+    
+    def toggle_pause(self):
+        """Pause the running import (issues already sent are still created) or resume it"""
+        job = self.job
+        if job is None:
+            return
+        if job.paused:
+            job.resume()
+            self.pause_btn.config(text="Pause")
+        else:
+            job.pause()
+            self.pause_btn.config(text="Resume")
+    
+    def cancel_tasks(self):
+        """Stop the running import once the issues already sent are created"""
+        job = self.job
+        if job is not None:
+            job.cancel()
+            self.pause_btn.config(state=tk.DISABLED, text="Pause")
+            self.cancel_btn.config(state=tk.DISABLED)
+    
+    def on_close(self):
+        """Close the window, cancelling a running import first"""
+        if not self.is_creating:
+            self.root.destroy()
+            return
+        if self.job is None:
+            messagebox.showinfo("Rollback Running", "Please wait for the rollback to finish before closing.")
+            return
+        if not messagebox.askyesno(
+            "Import Running",
+            "An import is running.\n\n"
+            "Cancel it and close the window once the issues already sent are created? "
+            "Running the same tasks file again continues where it stopped."
+        ):
+            return
+        self.cancel_tasks()
+        self.close_when_idle()
+    
+    def close_when_idle(self):
+        """Close the window once the cancelled import has finished"""
+        if self.is_creating:
+            self.root.after(PROGRESS_INTERVAL_MS, self.close_when_idle)
+        else:
+            self.root.destroy()
+
+    def rollback_tasks(self):
+        """Delete the issues created from the tasks file in a separate thread"""
+        if self.is_creating:
+            messagebox.showinfo("Already Running", "Task creation is already in progress")
+            return
+        
+        if not self.validate_inputs():
+            return
+        
+        if not messagebox.askyesno(
+            "Rollback",
+            "Delete all issues created from this tasks file (according to its run journal)?\n\n"
+            "This cannot be undone."
+        ):
+            return
+        
+        self.create_btn.config(state=tk.DISABLED)
+        self.rollback_btn.config(state=tk.DISABLED)
+        self.is_creating = True
+        self.set_status("Deleting issues...")
+        
+        thread = threading.Thread(target=self._rollback_thread)
+        thread.daemon = True
+        thread.start()
+    
+    def _rollback_thread(self):
+        """Delete issues of the last run in background thread"""
+        try:
+            from create_jira_tasks import (IssueStore, JiraClient, JiraClients, RunJournal,
+                                           rollback_issues_per_target, rollback_targets_from_journal)
+            
+            workers = self.max_workers.get()
+            client = JiraClient(self.jira_base_url.get(), self.email.get(), self.api_token.get(),
+                                self.project_key.get(), pool_size=max(workers, 10))
+            journal = RunJournal(RunJournal.path_for(self.tasks_file.get()))
+            store = IssueStore()
+            
+            self.log("=" * 60)
+            self.log("Starting rollback...")
+            self.log(f"Reading created issues from: {journal.path}")
+            self.log("=" * 60)
+            # Issues of every site and project the tasks file used (PROJECT: and SITE: directives)
+            clients = JiraClients(client)
+            targets = rollback_targets_from_journal(journal, clients)
+            issues = [issue for _, target_issues in targets for issue in target_issues]
+            if not issues:
+                self.log("No issues to delete.")
+                self.set_status("Ready - nothing to roll back")
+                return
+            
+            try:
+                with clients:
+                    result = rollback_issues_per_target(targets, workers, log=self.log, journal=journal, store=store)
+            finally:
+                journal.close()
+                store.close()
+            
+            self.log("")
+            self.log(f"Deleted: {len(result['deleted'])} issues")
+            if result['failed']:
+                self.log(f"Failed to delete: {len(result['failed'])} issues")
+                for key in result['failed']:
+                    self.log(f"  - {key}")
+            self.set_status(f"Rollback complete - {len(result['deleted'])}/{len(issues)} issues deleted")
+            
+        except Exception as e:
+            error_msg = f"Error: {str(e)}"
+            self.log(error_msg)
+            self.set_status("Error occurred")
+            self.root.after(0, lambda: messagebox.showerror("Error", error_msg))
+        
+        finally:
+            self.root.after(0, lambda: self.create_btn.config(state=tk.NORMAL))
+            self.root.after(0, lambda: self.rollback_btn.config(state=tk.NORMAL))
+            self.is_creating = False
+    
+    def find_issues(self):
+        """Open a window to look up created issues in the local issue store and export them"""
+        from create_jira_tasks import ISSUE_STORE_FILE, IssueStore, export_issues
+        
+        window = tk.Toplevel(self.root)
+        window.title("Find Issues")
+        window.geometry("800x450")
+        frame = ttk.Frame(window, padding="10")
+        frame.pack(fill=tk.BOTH, expand=True)
+        frame.columnconfigure(1, weight=1)
+        frame.rowconfigure(1, weight=1)
+        
+        query = tk.StringVar()
+        ttk.Label(frame, text="Key or Summary:").grid(row=0, column=0, sticky=tk.W, padx=(0, 5))
+        entry = ttk.Entry(frame, textvariable=query)
+        entry.grid(row=0, column=1, sticky=(tk.W, tk.E))
+        
+        columns = ("key", "summary", "parent", "project", "created")
+        tree = ttk.Treeview(frame, columns=columns, show="headings", selectmode=tk.EXTENDED)
+        for column, heading, width, stretch in (("key", "Key", 100, False), ("summary", "Summary", 340, True),
+                                                ("parent", "Parent", 100, False),
+                                                ("project", "Project", 80, False),
+                                                ("created", "Created", 160, False)):
+            tree.heading(column, text=heading)
+            tree.column(column, width=width, stretch=stretch)
+        tree.grid(row=1, column=0, columnspan=4, sticky=(tk.W, tk.E, tk.N, tk.S), pady=(10, 0))
+        scrollbar = ttk.Scrollbar(frame, orient=tk.VERTICAL, command=tree.yview)
+        scrollbar.grid(row=1, column=4, sticky=(tk.N, tk.S), pady=(10, 0))
+        tree.configure(yscrollcommand=scrollbar.set)
+        
+        message = tk.StringVar()
+        ttk.Label(frame, textvariable=message).grid(row=2, column=0, columnspan=4, sticky=tk.W, pady=(5, 0))
+        found = []
+        
+        def search(event=None):
+            # Lookups only read the local database (indexed), so they run on the UI thread
+            try:
+                with IssueStore(ISSUE_STORE_FILE) as store:
+                    found[:] = store.find(query.get().strip() or None)
+            except Exception as e:
+                messagebox.showerror("Error", f"Cannot read {ISSUE_STORE_FILE}: {e}", parent=window)
+                return
+            tree.delete(*tree.get_children())
+            for issue in found:
+                tree.insert("", tk.END, values=(issue['key'], issue['summary'], issue['parent_key'] or "",
+                                                issue['project'], issue['created']))
+            message.set(f"{len(found)} issue(s) found in {ISSUE_STORE_FILE}")
+        
+        def export():
+            if not found:
+                messagebox.showinfo("Nothing to Export", "No issues found", parent=window)
+                return
+            file_path = filedialog.asksaveasfilename(
+                parent=window, title="Export Issues", defaultextension=".csv",
+                filetypes=[("CSV files", "*.csv"), ("JSON files", "*.json"), ("All files", "*.*")]
+            )
+            if file_path:
+                file_format = export_issues(found, file_path)
+                message.set(f"Exported {len(found)} issue(s) to {file_path} ({file_format.upper()})")
+        
+        ttk.Button(frame, text="Search", command=search).grid(row=0, column=2, padx=5)
+        ttk.Button(frame, text="Export...", command=export).grid(row=0, column=3)
+        entry.bind("<Return>", search)
+        entry.focus_set()
+        search()
 
 
 def main():
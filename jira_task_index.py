@@ -0,0 +1,351 @@
+"""
+Offsets index of tasks files for create_jira_tasks.py
+
+Lets the GUI preview and page through very large tasks files without
+parsing them as a whole (TaskIndex for the text format, TaskList for the
+other formats).
+"""
+
+import hashlib
+import io
+import json
+import mmap
+import os
+import re
+from array import array
+from typing import Callable, Dict, Iterator, List, Optional, Tuple, Union
+
+from jira_task_readers import TextTaskReader, is_subtask, parse_task_lines, read_task_directive, task_reader
+
+INDEX_SUFFIX = ".index"  # Task offsets index is stored next to the tasks file with this suffix
+INDEX_BLOCK_SIZE = 1024 * 1024  # Bytes hashed together to find the part of a tasks file that changed
+_INDEX_LINE = re.compile(rb"\n[ \t\r\f\v]*(?:---[ \t\r\f\v]*(?=\n|\Z)|PARENT:([^\n]*))", re.IGNORECASE)
+_INDEX_TEXT_LINE = re.compile(rb"^[ \t\r\f\v]*[^\s]", re.MULTILINE)
+
+class TaskIndex:
+    """
+    Byte offsets of the tasks of a tasks file, kept in a sidecar file (<file>.index).
+    
+    For every task the index holds where it starts and ends, where its
+    summary and first PARENT line are, and whether it is a subtask (using a
+    PARENT-n placeholder or not). It is built in one pass over an mmap of
+    the file, so a task can then be read on its own (read, summary) without
+    parsing the tasks before it.
+    
+    The file is also hashed in blocks of INDEX_BLOCK_SIZE bytes. When its
+    size or mtime changes, only the tasks from the first changed block on
+    are scanned again (appending to a generated file only rescans the end).
+    """
+    
+    MAGIC = b"JTIDX3\n"
+    SUBTASK = 1  # Flag: the task has a PARENT line
+    PLACEHOLDER = 2  # Flag: its parent is a PARENT-n placeholder
+    
+    def __init__(self, file_path: str, block_size: int = INDEX_BLOCK_SIZE):
+        """
+        Args:
+            file_path: Path to the tasks file
+            block_size: Size of the blocks hashed to detect which part of the file changed
+        """
+        self.file_path = file_path
+        self.path = self.path_for(file_path)
+        self.block_size = block_size
+        self.size = -1
+        self.mtime_ns = -1
+        self._clear()
+    
+    @staticmethod
+    def path_for(tasks_file: str) -> str:
+        """Get the index path used for a tasks file"""
+        return tasks_file + INDEX_SUFFIX
+    
+    def _clear(self):
+        self.digests = []  # Hash of every block of the file
+        self.starts = array('q')  # Offset of the first line of every task
+        self.ends = array('q')  # Offset of the separator after every task (or the end of the file)
+        self.summaries = array('q')  # Offset of the summary line of every task
+        self.parents = array('q')  # Offset of the first PARENT line of every task (-1: none)
+        self.flags = array('B')  # SUBTASK and PLACEHOLDER flags of every task
+    
+    @classmethod
+    def open(cls, file_path: str, progress: Optional[Callable[[int, int], None]] = None) -> "TaskIndex":
+        """
+        Load the index of a tasks file, updating it (and its sidecar file) if the file changed
+        
+        Args:
+            file_path: Path to the tasks file
+            progress: Called with (bytes scanned, bytes to scan) while the index is updated
+        """
+        index = cls(file_path)
+        index.load()
+        if index.update(progress):
+            index.save()
+        return index
+    
+    def __len__(self) -> int:
+        return len(self.starts)
+    
+    def load(self) -> bool:
+        """Read the sidecar file (returns False if it is missing or unreadable)"""
+        try:
+            with open(self.path, 'rb') as f:
+                if f.readline() != self.MAGIC:
+                    return False
+                header = json.loads(f.readline())
+                if header['block_size'] != self.block_size:
+                    return False
+                data = f.read(header['blocks'] * 8)
+                digests = [data[position:position + 8] for position in range(0, len(data), 8)]
+                arrays = [array('q') for _ in range(4)] + [array('B')]
+                for values in arrays:
+                    values.fromfile(f, header['tasks'])
+        except (OSError, ValueError, KeyError, EOFError):
+            return False
+        if len(digests) != header['blocks']:
+            return False
+        self.size, self.mtime_ns = header['size'], header['mtime_ns']
+        self.digests = digests
+        self.starts, self.ends, self.summaries, self.parents, self.flags = arrays
+        return True
+    
+    def save(self):
+        """Write the sidecar file (errors are ignored, the index is then rebuilt next time)"""
+        header = {'size': self.size, 'mtime_ns': self.mtime_ns, 'block_size': self.block_size,
+                  'blocks': len(self.digests), 'tasks': len(self)}
+        temp_path = self.path + ".tmp"
+        try:
+            with open(temp_path, 'wb') as f:
+                f.write(self.MAGIC)
+                f.write(json.dumps(header).encode('utf-8') + b"\n")
+                f.write(b"".join(self.digests))
+                for values in (self.starts, self.ends, self.summaries, self.parents, self.flags):
+                    values.tofile(f)
+            os.replace(temp_path, self.path)
+        except OSError:
+            pass
+    
+    def fresh(self) -> bool:
+        """Check whether the tasks file is unchanged since the index was updated"""
+        try:
+            stat = os.stat(self.file_path)
+        except OSError:
+            return False
+        return stat.st_size == self.size and stat.st_mtime_ns == self.mtime_ns
+    
+    def update(self, progress: Optional[Callable[[int, int], None]] = None) -> bool:
+        """
+        Bring the index up to date with the tasks file
+        
+        Args:
+            progress: Called with (bytes scanned, bytes to scan) while tasks are scanned
+        
+        Returns:
+            True if the index changed
+        """
+        if self.fresh():
+            return False
+        stat = os.stat(self.file_path)
+        if stat.st_size == 0:
+            self._clear()
+        else:
+            with open(self.file_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                with memoryview(mm) as view:
+                    digests = [hashlib.blake2b(view[position:position + self.block_size], digest_size=8).digest()
+                               for position in range(0, len(mm), self.block_size)]
+                changed = next((block for block, (old, new) in enumerate(zip(self.digests, digests)) if old != new),
+                               min(len(self.digests), len(digests)))
+                self._rescan(mm, changed * self.block_size, progress)
+                self.digests = digests
+        self.size, self.mtime_ns = stat.st_size, stat.st_mtime_ns
+        return True
+    
+    @staticmethod
+    def _lines(mm: mmap.mmap, position: int) -> Iterator[Tuple[int, int, Optional[bytes]]]:
+        # Separator and PARENT lines from a line start on, as (line start, line end, PARENT value or None)
+        # The pattern starts with the newline before the line, which makes it much faster to search
+        if position == 0:
+            line_end = mm.find(b"\n")
+            match = _INDEX_LINE.match(b"\n" + mm[:line_end if line_end >= 0 else len(mm)])
+            if match:
+                yield 0, match.end() - 1, match.group(1)
+        for match in _INDEX_LINE.finditer(mm, max(0, position - 1)):
+            yield match.start() + 1, match.end(), match.group(1)
+    
+    def _rescan(self, mm: mmap.mmap, changed: int, progress: Optional[Callable[[int, int], None]]):
+        # Keep the tasks whose bytes and following separator are all before the first change
+        keep = 0
+        while keep + 1 < len(self) and self.starts[keep + 1] <= changed:
+            keep += 1
+        position = self.ends[keep - 1] if keep else 0
+        for values in (self.starts, self.ends, self.summaries, self.parents, self.flags):
+            del values[keep:]
+        
+        first = position
+        size = len(mm)
+        parent = -1
+        flags = 0
+        for line_start, line_end, value in self._lines(mm, position):
+            if value is None:
+                self._add(mm, position, line_start, parent, flags)
+                position = min(size, line_end + 1)
+                parent = -1
+                flags = 0
+                if progress and len(self) % 10000 == 0:
+                    progress(position - first, size - first)
+                continue
+            value = value.decode('utf-8', 'replace').strip()
+            if not value:
+                continue
+            if parent < 0:
+                parent = line_start
+            flags |= self.SUBTASK
+            if value.upper().startswith("PARENT-"):
+                try:
+                    int(value.split('-')[1])
+                    flags |= self.PLACEHOLDER
+                except (ValueError, IndexError):
+                    pass
+        self._add(mm, position, size, parent, flags)
+        if progress:
+            progress(size - first, size - first)
+    
+    def _add(self, mm: mmap.mmap, start: int, end: int, parent: int, flags: int):
+        # The summary is the first line that is neither empty nor a directive (see read_task_directive)
+        for match in _INDEX_TEXT_LINE.finditer(mm, start, end):
+            line_end = mm.find(b"\n", match.start(), end)
+            line = mm[match.start():line_end if line_end >= 0 else end]
+            if read_task_directive(line.decode('utf-8', 'replace').strip()) is None:
+                break
+        else:
+            return
+        self.starts.append(start)
+        self.ends.append(end)
+        self.summaries.append(match.start())
+        self.parents.append(parent)
+        self.flags.append(flags)
+    
+    def count(self, flag: int) -> int:
+        """Number of tasks with a flag (SUBTASK or PLACEHOLDER)"""
+        return sum(1 for flags in self.flags if flags & flag)
+    
+    def _read_line(self, f, offset: int) -> str:
+        f.seek(offset)
+        return f.readline().decode('utf-8').strip()
+    
+    def summary(self, number: int) -> str:
+        """Read the summary of a task (number: position in the file, starting at 0)"""
+        with open(self.file_path, 'rb') as f:
+            return self._read_line(f, self.summaries[number])
+    
+    def read(self, number: int, count: int = 1) -> List[Dict]:
+        """
+        Parse a few consecutive tasks without reading the rest of the file
+        
+        Args:
+            number: Position of the first task in the file (starting at 0)
+            count: Number of tasks to read
+        
+        Returns:
+            Task dictionaries (see iter_tasks)
+        """
+        tasks = []
+        with open(self.file_path, 'rb') as f:
+            for start, end in zip(self.starts[number:number + count], self.ends[number:number + count]):
+                f.seek(start)
+                text = f.read(end - start).decode('utf-8')
+                tasks.extend(parse_task_lines(io.StringIO(text, newline=None)))
+        return tasks
+    
+    def iter_tasks(self, number: int = 0) -> Iterator[Dict]:
+        """Parse the tasks of the file from a task on (see iter_tasks)"""
+        if number >= len(self):
+            return
+        with open(self.file_path, 'rb') as f:
+            f.seek(self.starts[number])
+            yield from parse_task_lines(io.TextIOWrapper(f, encoding='utf-8', newline=None))
+
+class TaskList:
+    """
+    Tasks of a file of another format than text, with the interface of TaskIndex.
+    
+    Byte offsets of tasks only make sense for the text format, so these
+    files are parsed once (see task_reader) and their tasks kept in memory.
+    """
+    
+    SUBTASK = TaskIndex.SUBTASK
+    PLACEHOLDER = TaskIndex.PLACEHOLDER
+    
+    def __init__(self, file_path: str, tasks: List[Dict], size: int = -1, mtime_ns: int = -1):
+        """
+        Args:
+            file_path: Path to the tasks file
+            tasks: Tasks of the file (see iter_tasks)
+            size: Size of the file when it was parsed
+            mtime_ns: Modification time of the file when it was parsed
+        """
+        self.file_path = file_path
+        self.tasks = tasks
+        self.size = size
+        self.mtime_ns = mtime_ns
+    
+    @classmethod
+    def open(cls, file_path: str, progress: Optional[Callable[[int, int], None]] = None) -> "TaskList":
+        """
+        Parse a tasks file
+        
+        Args:
+            file_path: Path to the tasks file
+            progress: Called with (bytes read, bytes to read) while the file is parsed
+        """
+        stat = os.stat(file_path)
+        reader = task_reader(file_path)
+        tasks = []
+        with reader.open(file_path) as f:
+            for task in reader.parse(f):
+                tasks.append(task)
+                if progress and len(tasks) % 10000 == 0:
+                    progress(f.buffer.tell(), stat.st_size)
+        if progress:
+            progress(stat.st_size, stat.st_size)
+        return cls(file_path, tasks, stat.st_size, stat.st_mtime_ns)
+    
+    def __len__(self) -> int:
+        return len(self.tasks)
+    
+    def fresh(self) -> bool:
+        """Check whether the tasks file is unchanged since it was parsed"""
+        try:
+            stat = os.stat(self.file_path)
+        except OSError:
+            return False
+        return stat.st_size == self.size and stat.st_mtime_ns == self.mtime_ns
+    
+    def count(self, flag: int) -> int:
+        """Number of tasks with a flag (SUBTASK or PLACEHOLDER)"""
+        if flag & self.PLACEHOLDER:
+            return sum(1 for task in self.tasks if task["parent_ref"] is not None)
+        return sum(1 for task in self.tasks if is_subtask(task))
+    
+    def summary(self, number: int) -> str:
+        """Get the summary of a task (number: position in the file, starting at 0)"""
+        return self.tasks[number]["summary"]
+    
+    def read(self, number: int, count: int = 1) -> List[Dict]:
+        """Get a few consecutive tasks (see TaskIndex.read)"""
+        return self.tasks[number:number + count]
+    
+    def iter_tasks(self, number: int = 0) -> Iterator[Dict]:
+        """Iterate over the tasks of the file from a task on"""
+        return iter(self.tasks[number:])
+
+def open_task_index(file_path: str, progress: Optional[Callable[[int, int], None]] = None) -> Union[TaskIndex, TaskList]:
+    """
+    Load the TaskIndex of a text tasks file, or a TaskList for the other formats
+    
+    Args:
+        file_path: Path to the tasks file
+        progress: Called with (bytes scanned, bytes to scan) while the file is read
+    """
+    if isinstance(task_reader(file_path), TextTaskReader):
+        return TaskIndex.open(file_path, progress)
+    return TaskList.open(file_path, progress)
@@ -0,0 +1,561 @@
+"""
+Tasks file parsing for create_jira_tasks.py
+
+The text format (parse_task_lines, with its directive lines) and the
+readers of the other formats (CSV, JSON Lines, YAML), all producing the
+same task dictionaries one task at a time.
+"""
+
+import csv
+import itertools
+import json
+import os
+import re
+import sys
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+# Optional dependency: YAML tasks files
+try:
+    import yaml
+except ImportError:
+    yaml = None
+
+DEFAULT_LINK_TYPE = "relates to"  # Link type of LINK lines that only name the linked issue
+DEFAULT_LINK_TYPES = [  # (name, outward, inward) of Jira's default link types, used if a site does not list its own
+    ("Blocks", "blocks", "is blocked by"),
+    ("Cloners", "clones", "is cloned by"),
+    ("Duplicate", "duplicates", "is duplicated by"),
+    ("Relates", "relates to", "relates to"),
+]
+ISSUE_TYPES = {name.strip().lower() for name in os.getenv(  # Issue types TYPE lines accept (other lines are summaries)
+    "JIRA_ISSUE_TYPES", "Task,Sub-task,Subtask,Story,Bug,Epic,Improvement,New Feature,Technical task,Spike").split(",")}
+ISSUE_KEY_PATTERN = re.compile(r"^[A-Za-z][A-Za-z0-9_]*-\d+$")  # PARENT values that are existing issues
+
+def is_subtask(task: Dict) -> bool:
+    """Return True if the task should be created under another issue (it has a PARENT line)"""
+    return task.get('parent_ref') is not None or bool(task.get('parent_key') or task.get('parent_id'))
+
+def new_task() -> Dict:
+    """Create an empty task record as produced by the tasks file parser"""
+    return {"summary": "", "description": "", "parent_key": None, "parent_ref": None, "assignee": None,
+            "project": None, "site": None, "id": None, "parent_id": None, "type": None,
+            "labels": [], "components": [], "sprint": None, "links": []}
+
+def set_task_parent(task: Dict, value: str):
+    """
+    Set the parent of a task from the value of a PARENT directive
+    
+    Args:
+        task: Task dictionary (see new_task)
+        value: "PARENT-n" placeholder, issue key or ID of another task of the file (empty: no parent;
+               an ID that no task of the file has is sent to Jira as an issue key, see TaskGraph.external_parents)
+    """
+    value = value.strip()
+    if not value:
+        return
+    # Check if it's a placeholder (PARENT-1, PARENT-2, etc.)
+    if value.upper().startswith("PARENT-"):
+        try:
+            # Extract number (e.g., "PARENT-1" -> 1)
+            task["parent_ref"] = int(value.split('-')[1])  # Store reference number
+        except (ValueError, IndexError):
+            # Invalid format, treat as actual key
+            task["parent_key"] = value
+    elif ISSUE_KEY_PATTERN.match(value):
+        # Actual issue key
+        task["parent_key"] = value
+    else:
+        # ID of another task of the file
+        task["parent_id"] = value
+
+def add_task_labels(task: Dict, value: str):
+    """Add the labels of a LABELS directive (separated by commas, or spaces in structured files) to a task"""
+    for label in re.split(r"[\s,]+", value.strip()):
+        if label and label not in task["labels"]:
+            task["labels"].append(label)
+
+def add_task_components(task: Dict, value: str):
+    """Add the components of a COMPONENT directive (separated by commas) to a task"""
+    for component in value.split(","):
+        component = component.strip()
+        if component and component not in task["components"]:
+            task["components"].append(component)
+
+def parse_task_link(value: str) -> Optional[List[str]]:
+    """
+    Parse the value of a LINK directive
+    
+    Args:
+        value: "blocks PROJECT-12", "is blocked by PARENT-2", "relates to api-epic" or just the target
+    
+    Returns:
+        [link type, target] (DEFAULT_LINK_TYPE if no type is given), or None if the value is empty
+    """
+    value = value.strip()
+    if not value:
+        return None
+    link_type, _, target = value.rpartition(" ")
+    return [link_type.strip() or DEFAULT_LINK_TYPE, target]
+
+_DIRECTIVE_NAMES = {"LABEL": "LABELS", "COMPONENTS": "COMPONENT"}  # Other spellings of directive names
+_LINK_PHRASES = {phrase.lower() for link_type in DEFAULT_LINK_TYPES for phrase in link_type}
+
+def _is_issue_type(value: str) -> bool:
+    return value.lower() in ISSUE_TYPES
+
+def _is_component_list(value: str) -> bool:
+    # Component names have a few words each, a sentence does not pass for a list of them
+    return value[-1] not in ".!?:" and all(0 < len(name.split()) <= 3 for name in value.split(","))
+
+def _is_link(value: str) -> bool:
+    # "<link type> <target>": a known link type, or an issue key or PARENT-n target (then alone or after any type)
+    link_type, _, target = value.rpartition(" ")
+    if ISSUE_KEY_PATTERN.match(target) or re.match(r"^PARENT-\d+$", target, re.IGNORECASE):
+        return True
+    return link_type.strip().lower() in _LINK_PHRASES
+
+_DIRECTIVE_VALUES = {  # Check of the value of every directive (None: any value)
+    "PARENT": None,
+    "ID": re.compile(r"^\S+$").match,
+    "TYPE": _is_issue_type,
+    "ASSIGNEE": re.compile(r"^[^\s@]+@[^\s@]+\.[^\s@]+$").match,
+    "PROJECT": re.compile(r"^[A-Z][A-Z0-9_]+$").match,
+    "SITE": re.compile(r"^https?://[^\s/]+(/\S*)?$", re.IGNORECASE).match,
+    "LABELS": re.compile(r"^[^\s,]+(\s*,\s*[^\s,]+)*$").match,
+    "COMPONENT": _is_component_list,
+    "SPRINT": re.compile(r"^\d+$").match,
+    "LINK": _is_link,
+}
+
+def read_task_directive(line: str) -> Optional[Tuple[str, str]]:
+    """
+    Recognise a directive line of a tasks file
+    
+    A line is only a directive if the directive accepts its value, so a first
+    line such as "Project: Apollo migration" or "Assignee: whoever is on
+    call" is the summary of its task:
+    - ID: a single word
+    - TYPE: one of ISSUE_TYPES (JIRA_ISSUE_TYPES)
+    - ASSIGNEE: an email
+    - PROJECT: a project key, SITE: an http(s) URL
+    - LABELS: labels separated by commas, COMPONENT: short names separated by commas
+    - SPRINT: a sprint ID
+    - LINK: a known link type and a target, or an issue key or PARENT-n target
+    - PARENT: any value
+    An empty value is accepted (the directive then has no effect).
+    
+    Args:
+        line: Line of the file, stripped
+    
+    Returns:
+        (directive name, value), or None if the line is not a directive
+    """
+    name, colon, value = line.partition(":")
+    name = name.upper()
+    name = _DIRECTIVE_NAMES.get(name, name)
+    if not colon or name not in _DIRECTIVE_VALUES:
+        return None
+    value = value.strip()
+    check = _DIRECTIVE_VALUES[name]
+    if value and check is not None and not check(value):
+        return None
+    return name, value
+
+def apply_task_directive(task: Dict, name: str, value: str):
+    """
+    Set the field of a task given by a directive
+    
+    Args:
+        task: Task dictionary (see new_task)
+        name: Directive name, as returned by read_task_directive
+        value: Value of the directive (empty: no effect)
+    """
+    if not value:
+        return
+    if name == "PARENT":
+        set_task_parent(task, value)
+    elif name == "SITE":
+        task["site"] = value.rstrip('/')
+    elif name == "LABELS":
+        add_task_labels(task, value)
+    elif name == "COMPONENT":
+        add_task_components(task, value)
+    elif name == "LINK":
+        task["links"].append(parse_task_link(value))
+    else:
+        # ID, TYPE, ASSIGNEE, PROJECT and SPRINT
+        task[name.lower()] = value
+
+def iter_tasks(file_path: str, warn: Optional[Callable[[str], None]] = None) -> Iterator[Dict]:
+    """
+    Parse tasks from a tasks file, yielding each task as soon as it is complete.
+    
+    The file is read line by line (row by row for CSV and JSON Lines files,
+    see task_reader) and description lines are joined once per task, so
+    memory use only depends on the size of the largest task. See
+    parse_tasks_file for the text format and task_from_record for the others.
+    
+    Args:
+        file_path: Path to the tasks file
+        warn: Called with a message for every task that is skipped (see TaskReader.parse)
+    
+    Yields:
+        Task dictionaries with 'summary', 'description', 'parent_key', 'parent_ref', 'assignee',
+        'project', 'site', 'id', 'parent_id', 'type', 'labels', 'components', 'sprint' and 'links' keys
+    """
+    reader = task_reader(file_path)
+    with reader.open(file_path) as f:
+        yield from reader.parse(f, warn)
+
+def parse_task_lines(lines: Iterable[str], warn: Optional[Callable[[str], None]] = None) -> Iterator[Dict]:
+    """
+    Parse tasks from the lines of a tasks file (see iter_tasks)
+    
+    Args:
+        lines: Lines of the file, with or without line endings
+        warn: Called with a message for every task skipped because it has directives but no summary
+    
+    Yields:
+        Task dictionaries, as soon as they are complete
+    """
+    current_task = None
+    description_lines = []
+    first_directive = None  # First directive line of the current task
+    
+    def finish_task(task: Dict) -> Optional[Dict]:
+        if not task["summary"]:
+            if first_directive and warn:
+                warn(f"Skipped a task that has directives but no summary (starting with {first_directive[:60]!r})")
+            return None
+        # Clean up description (remove leading/trailing whitespace)
+        task["description"] = "\n".join(description_lines).strip()
+        return task
+    
+    for line in lines:
+        line = line.rstrip('\n\r')
+        stripped = line.strip()
+        
+        # Check if this is a task separator
+        if stripped == "---":
+            # Save previous task if exists
+            if current_task and finish_task(current_task):
+                yield current_task
+            # Start new task
+            current_task = new_task()
+            description_lines = []
+            first_directive = None
+            continue
+        
+        # First non-empty line after separator (or start of file)
+        if current_task is None:
+            current_task = new_task()
+        
+        # Directive lines (only before the summary, so description lines such as "Project: Apollo
+        # migration follow-up" are kept), except PARENT lines which are read anywhere
+        directive = None
+        if not current_task["summary"]:
+            directive = read_task_directive(stripped)
+        elif stripped[:7].upper() == "PARENT:":
+            directive = ("PARENT", stripped[7:].strip())
+        if directive:
+            apply_task_directive(current_task, *directive)
+            first_directive = first_directive or stripped
+            continue
+        
+        if not current_task["summary"] and stripped:
+            # This is the summary line
+            current_task["summary"] = stripped
+        elif current_task["summary"]:
+            # This is part of the description
+            description_lines.append(line)
+    
+    # Don't forget the last task
+    if current_task and finish_task(current_task):
+        yield current_task
+
+class TaskFileError(ValueError):
+    """A tasks file (or one of its records) could not be read"""
+
+_RECORD_KEYS = {"label": "labels", "component": "components", "link": "links", "issue_type": "type", "issuetype": "type"}
+
+def task_from_record(record: Dict) -> Optional[Dict]:
+    """
+    Build a task from a record of a structured tasks file (CSV row, JSON object, YAML mapping)
+    
+    The keys are the directive names of the text format, in any case: summary,
+    description, parent, id, type, assignee, project, site, labels, components,
+    sprint and links (other keys are ignored). Every value is read like the
+    directive, so the task is the one parse_task_lines builds from the same
+    directives. Labels, components and links can also be lists, and a link a
+    [type, target] pair or a {"type": ..., "target": ...} mapping; several
+    links in one string are separated by ";" or line breaks.
+    
+    Args:
+        record: Record of the file
+    
+    Returns:
+        Task dictionary (see new_task), or None if the record has no summary
+    """
+    if not isinstance(record, dict):
+        raise TaskFileError(f"Expected a task record, got {str(record)[:60]!r}")
+    values = {}
+    for key, value in record.items():
+        key = str(key).strip().lower().replace(" ", "_")
+        values[_RECORD_KEYS.get(key, key)] = value
+    
+    def text(name: str) -> str:
+        value = values.get(name)
+        if isinstance(value, (dict, list)):
+            raise TaskFileError(f"'{name}' of task {str(values.get('summary'))[:60]!r} must be a single value")
+        return "" if value is None else str(value).strip()
+    
+    def items(name: str) -> list:
+        value = values.get(name)
+        if value is None or value == "":
+            return []
+        return value if isinstance(value, list) else [value]
+    
+    task = new_task()
+    task["summary"] = text("summary")
+    if not task["summary"]:
+        return None
+    task["description"] = re.sub(r"\r\n?", "\n", text("description"))
+    set_task_parent(task, text("parent"))
+    for name in ("id", "type", "assignee", "sprint"):
+        task[name] = text(name) or None
+    task["project"] = text("project").upper() or None
+    task["site"] = text("site").rstrip('/') or None
+    for label in items("labels"):
+        add_task_labels(task, str(label))
+    for component in items("components"):
+        add_task_components(task, str(component))
+    for link in items("links"):
+        if isinstance(link, dict):
+            link = [link.get("type"), link.get("target")]
+        if isinstance(link, list):
+            if len(link) != 2 or not link[1]:
+                raise TaskFileError(f"Link {str(link)[:60]!r} of task {task['summary'][:60]!r} must be a [type, target] pair")
+            task["links"].append([str(link[0] or "").strip() or DEFAULT_LINK_TYPE, str(link[1]).strip()])
+            continue
+        for value in re.split(r"[;\n]", str(link)):
+            link = parse_task_link(value)
+            if link:
+                task["links"].append(link)
+    return task
+
+class TaskReader:
+    """
+    Reads the tasks of one tasks file format (see task_reader).
+    
+    A reader turns the lines of a file into the task dictionaries built by
+    parse_task_lines, one task at a time, so memory use does not grow with
+    the size of the file. Formats whose files can be cut before some lines
+    and the pieces parsed on their own are splittable: iter_tasks_parallel
+    then spreads the pieces over worker processes.
+    """
+    
+    name = ""  # Name of the format, for messages
+    extensions = ()  # File name extensions of the format (lowercase, with the dot)
+    encoding = 'utf-8'
+    newline = None  # newline argument of open (None: universal newlines)
+    splittable = False  # Files can be cut before the lines accepted by at_boundary
+    
+    def open(self, file_path: str):
+        """Open a file of the format, ready for parse"""
+        return open(file_path, 'r', encoding=self.encoding, newline=self.newline)
+    
+    def parse(self, lines: Iterable[str], warn: Optional[Callable[[str], None]] = None) -> Iterator[Dict]:
+        """
+        Parse tasks from the lines of a file
+        
+        Args:
+            lines: Lines of the file, or of a piece of it starting at a boundary
+            warn: Called with a message for every task skipped because it has fields but no summary
+        
+        Yields:
+            Task dictionaries (see iter_tasks)
+        """
+        raise NotImplementedError
+    
+    @staticmethod
+    def skipped(record, warn: Optional[Callable[[str], None]]):
+        """Report a record without summary that has other values (empty records are skipped silently)"""
+        if warn and isinstance(record, dict) and any(str(value).strip() for value in record.values()
+                                                     if value is not None):
+            warn(f"Skipped a task that has fields but no summary: {str(record)[:60]!r}")
+    
+    def at_boundary(self, line: bytes) -> bool:
+        """Check whether a piece of a file may start with this line (see split_tasks_file)"""
+        return False
+
+class TextTaskReader(TaskReader):
+    """The tasks file format described in parse_tasks_file"""
+    
+    name = "text"
+    extensions = (".txt",)
+    splittable = True
+    
+    def parse(self, lines: Iterable[str], warn: Optional[Callable[[str], None]] = None) -> Iterator[Dict]:
+        return parse_task_lines(lines, warn)
+    
+    def at_boundary(self, line: bytes) -> bool:
+        return line.strip() == b"---"
+
+class CsvTaskReader(TaskReader):
+    """
+    CSV files with a header row naming the fields of the tasks (see task_from_record).
+    
+    Rows are read one at a time. Quoted values can span lines (multi-line
+    descriptions), so files are not split between processes.
+    """
+    
+    name = "CSV"
+    extensions = (".csv",)
+    encoding = 'utf-8-sig'  # Spreadsheets often start CSV exports with a byte order mark
+    newline = ''  # Required by the csv module for line breaks in quoted values
+    
+    def parse(self, lines: Iterable[str], warn: Optional[Callable[[str], None]] = None) -> Iterator[Dict]:
+        rows = csv.DictReader(lines)
+        try:
+            for row in rows:
+                row.pop(None, None)  # Values beyond the last column
+                task = task_from_record(row)
+                if task:
+                    yield task
+                else:
+                    self.skipped(row, warn)
+        except csv.Error as e:
+            raise TaskFileError(f"Invalid CSV on line {rows.line_num}: {e}")
+
+class JsonLinesTaskReader(TaskReader):
+    """JSON Lines files: one JSON object per line with the fields of a task (see task_from_record)"""
+    
+    name = "JSON Lines"
+    extensions = (".jsonl", ".ndjson")
+    encoding = 'utf-8-sig'
+    splittable = True
+    
+    def parse(self, lines: Iterable[str], warn: Optional[Callable[[str], None]] = None) -> Iterator[Dict]:
+        for line in lines:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError as e:
+                raise TaskFileError(f"Invalid JSON Lines record {line[:60]!r}: {e}")
+            task = task_from_record(record)
+            if task:
+                yield task
+            else:
+                self.skipped(record, warn)
+    
+    def at_boundary(self, line: bytes) -> bool:
+        return True
+
+class YamlTaskReader(TaskReader):
+    """
+    YAML files: a list of tasks (or a mapping with a "tasks" list), needs PyYAML.
+    
+    A task can list its own subtasks under "subtasks" (or "children"), to any
+    depth: they get the task as parent, using its ID, or a generated "#n" ID
+    when it has none. The document is loaded as a whole, so unlike the other
+    formats its size is bounded by memory.
+    """
+    
+    name = "YAML"
+    extensions = (".yaml", ".yml")
+    
+    def parse(self, lines: Iterable[str], warn: Optional[Callable[[str], None]] = None) -> Iterator[Dict]:
+        if yaml is None:
+            raise TaskFileError("Reading YAML tasks files requires PyYAML (pip install pyyaml)")
+        try:
+            document = yaml.safe_load(lines if hasattr(lines, 'read') else "".join(lines))
+        except yaml.YAMLError as e:
+            raise TaskFileError(f"Invalid YAML: {e}")
+        if isinstance(document, dict):
+            document = document.get("tasks")
+        if document is None:
+            return
+        if not isinstance(document, list):
+            raise TaskFileError("A YAML tasks file must be a list of tasks or have a 'tasks' list")
+        
+        generated_ids = itertools.count(1)
+        stack = [(record, None) for record in reversed(document)]  # Depth first, in file order
+        while stack:
+            record, parent_id = stack.pop()
+            task = task_from_record(record)
+            children = next((value for key, value in record.items()
+                             if str(key).strip().lower() in ("subtasks", "children")), None)
+            if task is None:
+                if children:
+                    raise TaskFileError(f"A task with subtasks has no summary: {str(record)[:60]!r}")
+                self.skipped(record, warn)
+                continue
+            if parent_id and not is_subtask(task):
+                task["parent_id"] = parent_id
+            if children:
+                if not isinstance(children, list):
+                    raise TaskFileError(f"Subtasks of task {task['summary'][:60]!r} must be a list")
+                task["id"] = task["id"] or f"#{next(generated_ids)}"
+                stack.extend((child, task["id"]) for child in reversed(children))
+            yield task
+
+TASK_READERS: List[TaskReader] = [TextTaskReader(), CsvTaskReader(), JsonLinesTaskReader(), YamlTaskReader()]
+
+def register_task_reader(reader: TaskReader):
+    """Add a reader for another tasks file format (it takes precedence for its extensions)"""
+    TASK_READERS.insert(0, reader)
+
+def task_reader(file_path: str) -> TaskReader:
+    """Get the reader of a tasks file from its extension (the text format if no reader claims it)"""
+    extension = os.path.splitext(file_path)[1].lower()
+    for reader in TASK_READERS:
+        if extension in reader.extensions:
+            return reader
+    return TextTaskReader()
+
+def check_tasks_file(file_path: str):
+    """Exit with an error message if the tasks file does not exist"""
+    if not os.path.exists(file_path):
+        print(f"Error: Tasks file '{file_path}' not found.")
+        print(f"Please create a tasks.txt file with your tasks.")
+        sys.exit(1)
+
+def parse_tasks_file(file_path: str) -> List[Dict[str, str]]:
+    """
+    Parse tasks from a text file.
+    
+    Format:
+    - Tasks are separated by "---" on its own line
+    - First line of each task is the summary
+    - Following lines until the next "---" are the description
+    - To create a subtask, add "PARENT: ISSUE-KEY" line before the summary
+      - Use actual issue key: "PARENT: PROJECT-123"
+      - Use placeholder for auto-link: "PARENT: PARENT-1" (refers to 1st parent task)
+      - Use placeholder: "PARENT: PARENT-2" (refers to 2nd parent task), etc.
+      - Use the ID of another task: "PARENT: api-epic" (refers to the task with "ID: api-epic",
+        so hierarchies can have any depth, e.g. Epic -> Story -> Sub-task)
+    - To name a task, add "ID: some-name" before the summary (IDs must not look like issue keys)
+    - To choose the issue type, add "TYPE: Epic" before the summary (default: Task, or
+      Sub-task for tasks with a PARENT line)
+    - To assign a task to someone else than the runner, add "ASSIGNEE: user@example.com" before the summary
+    - To create a task in another project or Jira site, add "PROJECT: KEY" and/or
+      "SITE: https://other.atlassian.net" before the summary (subtasks of a PARENT-n task
+      follow their parent)
+    - To set labels, components or the sprint, add "LABELS: backend, urgent",
+      "COMPONENT: API" (comma-separated, repeatable) or "SPRINT: 42" (sprint ID) before the summary
+    - To link the issue to another one once everything is created, add "LINK: blocks PROJECT-12",
+      "LINK: is blocked by PARENT-2" or "LINK: relates to api-epic" (any link type name or
+      description of the site; the target is an issue key, a PARENT-n placeholder or an ID)
+    - Empty lines separate paragraphs in descriptions (see text_to_adf for the markdown subset)
+    
+    Args:
+        file_path: Path to the tasks file
+    
+    Returns:
+        List of task dictionaries with 'summary', 'description', and optionally 'parent_key', 'parent_ref',
+        'assignee', 'project', 'site', 'id', 'parent_id', 'type', 'labels', 'components', 'sprint' or 'links' keys
+    """
+    check_tasks_file(file_path)
+    return list(iter_tasks(file_path))
@@ -0,0 +1,347 @@
+"""
+Parent links and scheduling of the tasks of a run for create_jira_tasks.py
+
+TaskGraph resolves the PARENT lines of a tasks file (placeholders and IDs),
+TaskScheduler decides when each task can be sent to Jira.
+"""
+
+import heapq
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional
+
+from jira_task_readers import ISSUE_KEY_PATTERN, is_subtask
+
+if TYPE_CHECKING:
+    from create_jira_tasks import JiraClients, RunResults
+
+class TaskGraph:
+    """
+    Parent links between the tasks of a file, built one task at a time.
+    
+    A task points at another task of the file with "PARENT: PARENT-n" (the
+    n-th task without PARENT line) or "PARENT: <id>" (the task with that ID,
+    before or after it in the file). A PARENT line with an issue key points
+    outside the file. A reference to a task that has not been added yet is
+    linked as soon as that task is added.
+    
+    LINK lines use the same references; they do not affect the order in
+    which tasks are created, but must name a task of the file.
+    """
+    
+    def __init__(self):
+        self.parents = []  # In-file parent index of every task (None: no parent in the file, or not linked yet)
+        self.children = {}  # Maps task indexes to the indexes of the tasks pointing at them
+        self.references = {}  # Maps task indexes to their parent reference, e.g. ('ref', 1) or ('id', 'api-epic')
+        self.numbers = {}  # Maps the index of every task without PARENT line to its PARENT-n number
+        self.names = {}  # Maps references to the index of the task they name
+        self.duplicates = []  # IDs used by more than one task
+        self.links = []  # (task index, reference) of every LINK line pointing at a task of the file
+        self._waiting = {}  # Maps references to tasks not added yet to the indexes pointing at them
+    
+    @classmethod
+    def from_tasks(cls, tasks: Iterable[Dict]) -> "TaskGraph":
+        """Build the graph of a list of tasks"""
+        graph = cls()
+        for task in tasks:
+            graph.add(task)
+        return graph
+    
+    @staticmethod
+    def reference(task: Dict) -> Optional[tuple]:
+        """Get the reference of a task to its parent in the file, if any"""
+        if task.get('parent_id'):
+            return ('id', task['parent_id'])
+        if task.get('parent_ref') is not None:
+            return ('ref', task['parent_ref'])
+        return None
+    
+    @staticmethod
+    def link_reference(target: str) -> Optional[tuple]:
+        """Get the reference of a LINK target to a task of the file (None for an issue key)"""
+        if target.upper().startswith("PARENT-") and target[7:].isdigit():
+            return ('ref', int(target[7:]))
+        if ISSUE_KEY_PATTERN.match(target):
+            return None
+        return ('id', target)
+    
+    @staticmethod
+    def describe(reference: tuple) -> str:
+        """Describe a parent reference for messages ("#2" or "'api-epic'")"""
+        kind, value = reference
+        return f"#{value}" if kind == 'ref' else f"'{value}'"
+    
+    def add(self, task: Dict) -> List[int]:
+        """
+        Add the next task
+        
+        Returns:
+            Indexes of tasks added before it whose parent it is
+        """
+        index = len(self.parents)
+        self.parents.append(None)
+        reference = self.reference(task)
+        if reference is not None:
+            self.references[index] = reference
+            parent = self.names.get(reference)
+            if parent is None:
+                self._waiting.setdefault(reference, []).append(index)
+            else:
+                self._link(index, parent)
+        for _, target in task.get('links') or ():
+            link_reference = self.link_reference(target)
+            if link_reference is not None:
+                self.links.append((index, link_reference))
+        
+        names = []
+        if not is_subtask(task):
+            self.numbers[index] = len(self.numbers) + 1
+            names.append(('ref', self.numbers[index]))
+        if task.get('id'):
+            if ('id', task['id']) in self.names:
+                self.duplicates.append(task['id'])
+            else:
+                names.append(('id', task['id']))
+        
+        adopted = []
+        for name in names:
+            self.names[name] = index
+            for child in self._waiting.pop(name, []):
+                self._link(child, index)
+                adopted.append(child)
+        return adopted
+    
+    def _link(self, child: int, parent: int):
+        self.parents[child] = parent
+        self.children.setdefault(parent, []).append(child)
+    
+    def dangling(self) -> Dict[tuple, List[int]]:
+        """Get the references to tasks that do not exist (so far), with the indexes using them"""
+        return {reference: list(indexes) for reference, indexes in self._waiting.items()}
+    
+    def order(self) -> List[int]:
+        """Get the linked task indexes, every parent before its children (tasks in cycles are left out)"""
+        order = [index for index, parent in enumerate(self.parents) if parent is None]
+        position = 0
+        while position < len(order):
+            order.extend(self.children.get(order[position], ()))
+            position += 1
+        return order
+    
+    def cycles(self) -> List[List[int]]:
+        """Get the groups of tasks whose parents point at each other"""
+        reachable = set(self.order())
+        cycles = []
+        seen = set()
+        for start in range(len(self.parents)):
+            if start in reachable or start in seen:
+                continue
+            path = []
+            index = start
+            while index not in seen and index not in reachable:
+                seen.add(index)
+                path.append(index)
+                index = self.parents[index]
+            if index in path:
+                cycles.append(path[path.index(index):])
+        return cycles
+    
+    def heights(self) -> List[int]:
+        """
+        Get the length of the longest chain of descendants of every task
+        
+        Used as scheduling priority: creating the tasks with the most levels
+        below them first keeps deep hierarchies from finishing last.
+        """
+        heights = [0] * len(self.parents)
+        for index in reversed(self.order()):
+            parent = self.parents[index]
+            if parent is not None and heights[index] + 1 > heights[parent]:
+                heights[parent] = heights[index] + 1
+        return heights
+    
+    def external_parents(self) -> Dict[int, str]:
+        """
+        Get the tasks whose PARENT is neither a PARENT-n placeholder nor the ID of a task of the file
+        
+        Such a value (e.g. "ABC-12a", which ISSUE_KEY_PATTERN does not accept) is
+        taken as the key of an existing issue once every task has been added.
+        
+        Returns:
+            Maps task indexes to the PARENT value used as their parent key
+        """
+        return {index: value for (kind, value), indexes in self._waiting.items() if kind == 'id' for index in indexes}
+    
+    def warnings(self) -> List[str]:
+        """Describe the PARENT values that may have been meant as IDs but are sent to Jira as issue keys"""
+        warnings = []
+        for (kind, value), indexes in self._waiting.items():
+            if kind == 'id':
+                positions = ", ".join(f"#{index + 1}" for index in indexes)
+                warnings.append(f"No task has ID '{value}', it is used as the key of an existing parent issue "
+                                f"(by task(s) {positions})")
+        return warnings
+    
+    def errors(self) -> List[str]:
+        """Describe the problems that keep tasks from being created (dangling references, cycles, bad IDs, bad LINK lines)"""
+        errors = [f"ID '{task_id}' is used by more than one task" for task_id in self.duplicates]
+        errors.extend(f"ID '{value}' looks like a Jira issue key, PARENT lines could not point at it"
+                      for kind, value in self.names if kind == 'id' and ISSUE_KEY_PATTERN.match(value))
+        for reference, indexes in self.dangling().items():
+            if reference[0] == 'id':
+                continue  # See warnings()
+            positions = ", ".join(f"#{index + 1}" for index in indexes)
+            errors.append(f"Parent task {self.describe(reference)} does not exist in the tasks file "
+                          f"(used by task(s) {positions})")
+        for cycle in self.cycles():
+            positions = " -> ".join(f"#{index + 1}" for index in cycle)
+            errors.append(f"Tasks {positions} are each other's parents (cycle)")
+        missing = {}
+        for index, reference in self.links:
+            if reference not in self.names:
+                missing.setdefault(reference, []).append(index)
+        for reference, indexes in missing.items():
+            positions = ", ".join(f"#{index + 1}" for index in indexes)
+            errors.append(f"Linked task {self.describe(reference)} does not exist in the tasks file "
+                          f"(used by task(s) {positions})")
+        return errors
+
+class TaskScheduler:
+    """
+    Decides when each task of a run can be sent to Jira.
+    
+    A task is ready once it has no parent in the file or its parent issue
+    exists (created, resumed from the journal or found by sync), so every
+    level of a hierarchy starts as soon as the level above it is there.
+    Ready tasks are handed out per client, most levels below them first
+    (critical path, see TaskGraph.heights), then in file order. When a task
+    fails, every task below it fails too while other branches go on.
+    
+    Tasks can be added while the file is still being parsed; finish() fails
+    the tasks whose PARENT-n placeholder never appeared or that are part of a
+    cycle, and starts those whose PARENT value is not the ID of any task
+    under that value as an issue key (see TaskGraph.external_parents).
+    """
+    
+    def __init__(self, run: "RunResults", clients: "JiraClients", priorities: Optional[List[int]] = None):
+        """
+        Args:
+            run: Results of the run (tasks are added to it)
+            clients: Clients of the run, one per site and project
+            priorities: Priority of every task, e.g. TaskGraph.heights() of the whole file (default: file order)
+        """
+        self.run = run
+        self.graph = run.graph
+        self.clients = clients
+        self.priorities = priorities
+        self.keys = {}  # Maps task indexes to the key of their issue
+        self.failed = set()  # Indexes of tasks that were not created
+        self.targets = {}  # Maps started task indexes to the client they are created with
+        self.parent_keys = {}  # Maps ready or running task indexes to the key of their parent issue
+        self.ready_count = 0
+        self._ready = {}  # Maps id(client) to a heap of (-priority, index) of tasks ready for that client
+    
+    def add(self, task: Dict) -> int:
+        """Add the next task of the run, starting it if it does not wait for a parent, and return its index"""
+        index = self.run.add(task)
+        if index not in self.graph.references:
+            issue_key = self._start(index, task.get('parent_key'), self.clients.for_task(task))
+            if issue_key:
+                self._finished(index, issue_key)
+            return index
+        
+        parent = self.graph.parents[index]
+        if parent in self.keys:
+            issue_key = self._start(index, self.keys[parent], self.targets[parent])
+            if issue_key:
+                self._finished(index, issue_key)
+        elif parent in self.failed:
+            self.run.fail(index, self._parent_failed(index))
+            self._finished(index, None)
+        # Otherwise the parent is running or not read yet: _finished() starts the task later
+        return index
+    
+    def _parent_failed(self, index: int) -> str:
+        return f"Parent task {TaskGraph.describe(self.graph.references[index])} was not created successfully"
+    
+    def _start(self, index: int, parent_key: Optional[str], target) -> Optional[str]:
+        # Queue a task whose parent exists; returns its key instead if it already exists in Jira
+        self.targets[index] = target
+        issue_key = self.run.resumed_key(index, target)
+        if issue_key:
+            self.run.skip(index, issue_key, target)
+            return issue_key
+        self.parent_keys[index] = parent_key
+        priority = self.priorities[index] if self.priorities and index < len(self.priorities) else 0
+        heapq.heappush(self._ready.setdefault(id(target), []), (-priority, index))
+        self.ready_count += 1
+        return None
+    
+    def _finished(self, index: int, issue_key: Optional[str]):
+        # Start (or fail) the tasks below a finished task, level after level
+        stack = [(index, issue_key)]
+        while stack:
+            index, issue_key = stack.pop()
+            if issue_key:
+                self.keys[index] = issue_key
+                if index in self.graph.numbers:
+                    self.run.parent_keys_map[self.graph.numbers[index]] = issue_key
+            else:
+                self.failed.add(index)
+            for child in self.graph.children.get(index, ()):
+                if child in self.targets or child in self.failed:
+                    continue
+                if issue_key:
+                    child_key = self._start(child, issue_key, self.targets[index])
+                    if child_key:
+                        stack.append((child, child_key))
+                else:
+                    self.run.fail(child, self._parent_failed(child))
+                    stack.append((child, None))
+    
+    def pop(self, limit: int = 1) -> List[tuple]:
+        """
+        Take the most important ready tasks, all of them for the same client
+        
+        Args:
+            limit: Maximum number of tasks to take
+        
+        Returns:
+            (task index, parent key, client) tuples, empty if no task is ready
+        """
+        heaps = [heap for heap in self._ready.values() if heap]
+        if not heaps:
+            return []
+        heap = min(heaps, key=lambda heap: heap[0])
+        batch = []
+        while heap and len(batch) < limit:
+            _, index = heapq.heappop(heap)
+            batch.append((index, self.parent_keys[index], self.targets[index]))
+        self.ready_count -= len(batch)
+        return batch
+    
+    def record(self, index: int, result: Optional[Dict]) -> Optional[str]:
+        """Store the result of a task taken with pop(), start the tasks below it and return its key"""
+        issue_key = self.run.record(index, result, parent_ref=self.graph.numbers.get(index),
+                                    parent_key=self.parent_keys.pop(index, None), target=self.targets[index])
+        self._finished(index, issue_key)
+        return issue_key
+    
+    def finish(self):
+        """Signal that every task has been added; fails tasks whose parent is missing or part of a cycle"""
+        self.run.finish_adding()
+        for index, parent_key in self.graph.external_parents().items():
+            issue_key = self._start(index, parent_key, self.clients.for_task(self.run.tasks[index]))
+            if issue_key:
+                self._finished(index, issue_key)
+        for reference, indexes in self.graph.dangling().items():
+            if reference[0] == 'id':
+                continue
+            for index in indexes:
+                if index not in self.failed:
+                    self.run.fail(index, f"Parent task {TaskGraph.describe(reference)} does not exist "
+                                         f"in the tasks file")
+                    self._finished(index, None)
+        for cycle in self.graph.cycles():
+            for index in cycle:
+                if index not in self.failed:
+                    self.run.fail(index, "Task is part of a parent cycle (tasks are each other's parents)")
+                    self._finished(index, None)
@@ -0,0 +1,304 @@
+"""Tests of the tasks file parsing, task graph, rollback order and Jira response handling"""
+
+import json
+import os
+
+import pytest
+
+from create_jira_tasks import (
+    TaskGraph, TaskIndex, bulk_create_results, iter_tasks, parse_task_lines, rollback_levels, text_to_adf,
+)
+from jira_task_readers import yaml
+
+def graph_of(text: str) -> TaskGraph:
+    return TaskGraph.from_tasks(parse_task_lines(text.splitlines()))
+
+def write(path, text: str) -> str:
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        f.write(text)
+    return str(path)
+
+# Parser
+
+def test_directives_before_summary():
+    tasks = list(parse_task_lines("""ID: api
+TYPE: Epic
+PROJECT: OPS
+SITE: https://other.atlassian.net/
+ASSIGNEE: dev@example.com
+LABELS: backend, urgent
+COMPONENT: API
+SPRINT: 42
+LINK: blocks PROJECT-12
+Build the API
+First line
+---
+PARENT: api
+Write endpoints
+""".splitlines()))
+    assert len(tasks) == 2
+    epic, story = tasks
+    assert epic["summary"] == "Build the API"
+    assert epic["description"] == "First line"
+    assert (epic["id"], epic["type"], epic["project"], epic["assignee"]) == ("api", "Epic", "OPS", "dev@example.com")
+    assert epic["site"] == "https://other.atlassian.net"
+    assert epic["labels"] == ["backend", "urgent"]
+    assert epic["components"] == ["API"]
+    assert epic["sprint"] == "42"
+    assert epic["links"] == [["blocks", "PROJECT-12"]]
+    assert story["parent_id"] == "api"
+
+@pytest.mark.parametrize("line", [
+    "Project: migrate the DB",
+    "Type: check the printer",
+    "Assignee: find someone for the on-call rotation",
+    "Site: clean up the staging pages",
+    "Sprint: plan the next one",
+    "Link: the login page to the docs",
+    "Component: Move the billing code out of the monolith.",
+])
+def test_summaries_that_look_like_directives(line):
+    tasks = list(parse_task_lines([line, "Some description"]))
+    assert [task["summary"] for task in tasks] == [line]
+    assert tasks[0]["description"] == "Some description"
+
+def test_directives_after_summary_are_description():
+    task, = parse_task_lines(["Migrate the DB", "Project: Apollo migration follow-up", "TYPE: Bug"])
+    assert task["project"] is None and task["type"] is None
+    assert task["description"] == "Project: Apollo migration follow-up\nTYPE: Bug"
+
+def test_parent_line_anywhere():
+    task, = parse_task_lines(["Write endpoints", "Some description", "PARENT: PARENT-1"])
+    assert task["parent_ref"] == 1
+    assert task["description"] == "Some description"
+
+def test_directive_only_block_is_skipped_with_warning():
+    warnings = []
+    tasks = list(parse_task_lines(["PROJECT: OPS", "---", "A real bug"], warnings.append))
+    assert [task["summary"] for task in tasks] == ["A real bug"]
+    assert warnings == ["Skipped a task that has directives but no summary (starting with 'PROJECT: OPS')"]
+
+# Structured readers
+
+EXPECTED_TASKS = [
+    {"summary": "Build API", "description": "Line one\n\nLine two", "id": "epic", "type": "Epic",
+     "labels": ["backend", "urgent"], "components": ["API"], "sprint": "42"},
+    {"summary": "Write endpoints", "description": "Details", "parent_id": "epic", "type": "Story",
+     "assignee": "a@example.com", "links": [["blocks", "PROJECT-12"], ["is blocked by", "PARENT-1"]]},
+    {"summary": "Deploy", "parent_ref": 1, "project": "OPS", "site": "https://other.atlassian.net"},
+]
+
+def check_tasks(tasks):
+    assert len(tasks) == len(EXPECTED_TASKS)
+    for task, expected in zip(tasks, EXPECTED_TASKS):
+        assert {key: task[key] for key in expected} == expected
+
+def test_csv_reader(tmp_path):
+    path = write(tmp_path / "tasks.csv", """﻿Summary,Description,ID,Type,Labels,Component,Sprint,Parent,Assignee,Links,Project,Site
+Build API,"Line one
+
+Line two",epic,Epic,"backend, urgent",API,42,,,,,
+Write endpoints,Details,,Story,,,,epic,a@example.com,blocks PROJECT-12; is blocked by PARENT-1,,
+Deploy,,,,,,,PARENT-1,,,ops,https://other.atlassian.net/
+,,,Bug,,,,,,,,
+""")
+    warnings = []
+    check_tasks(list(iter_tasks(path, warnings.append)))
+    assert len(warnings) == 1
+
+def test_jsonl_reader(tmp_path):
+    records = [
+        {"summary": "Build API", "description": "Line one\n\nLine two", "id": "epic", "type": "Epic",
+         "labels": ["backend", "urgent"], "components": ["API"], "sprint": 42},
+        {"summary": "Write endpoints", "description": "Details", "type": "Story", "parent": "epic",
+         "assignee": "a@example.com", "links": ["blocks PROJECT-12", {"type": "is blocked by", "target": "PARENT-1"}]},
+        {"summary": "Deploy", "parent": "PARENT-1", "project": "ops", "site": "https://other.atlassian.net/"},
+    ]
+    path = write(tmp_path / "tasks.jsonl", "\n".join(json.dumps(record) for record in records) + "\n\n")
+    check_tasks(list(iter_tasks(path)))
+
+@pytest.mark.skipif(yaml is None, reason="PyYAML is not installed")
+def test_yaml_reader(tmp_path):
+    path = write(tmp_path / "tasks.yaml", """tasks:
+  - summary: Build API
+    id: epic
+    type: Epic
+    labels: [backend, urgent]
+    component: API
+    sprint: 42
+    description: |
+      Line one
+
+      Line two
+    subtasks:
+      - summary: Write endpoints
+        type: Story
+        description: Details
+        assignee: a@example.com
+        links:
+          - blocks PROJECT-12
+          - [is blocked by, PARENT-1]
+  - summary: Deploy
+    parent: PARENT-1
+    project: ops
+    site: https://other.atlassian.net/
+""")
+    check_tasks(list(iter_tasks(path)))
+
+# Task graph
+
+def test_graph_orders_parents_first():
+    graph = graph_of("""PARENT: story
+Sub-task
+---
+ID: story
+PARENT: epic
+Story
+---
+ID: epic
+Epic
+""")
+    assert graph.errors() == []
+    order = graph.order()
+    assert order.index(2) < order.index(1) < order.index(0)
+    assert graph.heights() == [0, 1, 2]
+
+def test_graph_cycle():
+    graph = graph_of("""ID: a
+PARENT: b
+Task A
+---
+ID: b
+PARENT: a
+Task B
+---
+Task C
+""")
+    assert graph.cycles() == [[0, 1]]
+    assert graph.order() == [2]
+    assert graph.errors() == ["Tasks #1 -> #2 are each other's parents (cycle)"]
+
+def test_graph_dangling_placeholder_is_an_error():
+    graph = graph_of("Task\n---\nPARENT: PARENT-3\nSubtask\n")
+    assert graph.errors() == ["Parent task #3 does not exist in the tasks file (used by task(s) #2)"]
+    assert graph.external_parents() == {}
+
+def test_graph_unknown_id_is_an_external_parent():
+    graph = graph_of("Task\n---\nPARENT: ABC-12a\nSubtask\n")
+    assert graph.errors() == []
+    assert graph.external_parents() == {1: "ABC-12a"}
+    assert graph.warnings() == [
+        "No task has ID 'ABC-12a', it is used as the key of an existing parent issue (by task(s) #2)"]
+
+def test_graph_duplicate_id_and_missing_link():
+    graph = graph_of("ID: a\nTask A\n---\nID: a\nTask B\n---\nLINK: blocks PARENT-5\nTask C\n")
+    assert graph.errors() == ["ID 'a' is used by more than one task",
+                              "Linked task #5 does not exist in the tasks file (used by task(s) #3)"]
+
+# Rollback
+
+def test_rollback_levels_deepest_first():
+    levels = rollback_levels([
+        {'key': 'A-1'},
+        {'key': 'A-2', 'parent_key': 'A-1'},
+        {'key': 'A-3', 'parent_key': 'A-2'},
+        {'key': 'A-4', 'parent_key': 'X-9'},
+    ])
+    # Issues without a parent or with listed children also delete subtasks that are not listed
+    assert levels == [[('A-3', False)], [('A-2', True)], [('A-1', True), ('A-4', False)]]
+
+def test_rollback_levels_parent_cycle():
+    levels = rollback_levels([{'key': 'A-1', 'parent_key': 'A-2'}, {'key': 'A-2', 'parent_key': 'A-1'}])
+    assert sorted(key for level in levels for key, _ in level) == ['A-1', 'A-2']
+
+# Jira responses
+
+def bulk_error(number: int, field: str, message: str) -> dict:
+    return {"status": 400, "elementErrors": {"errorMessages": [], "errors": {field: message}},
+            "failedElementNumber": number}
+
+def test_bulk_create_results_maps_errors_to_their_issue():
+    response = {"issues": [{"id": "1", "key": "A-1"}, {"id": "3", "key": "A-3"}],
+                "errors": [bulk_error(1, "issuetype", "Bad type")]}
+    results = bulk_create_results(3, 201, json.dumps(response), "https://jira/bulk")
+    assert results[0]["key"] == "A-1"
+    assert results[1]["error"]["errors"] == {"issuetype": "Bad type"}
+    assert results[1]["error"]["status_code"] == 400
+    assert results[2]["key"] == "A-3"
+
+def test_bulk_create_results_all_failed():
+    response = {"issues": [], "errors": [bulk_error(0, "summary", "Required"), bulk_error(1, "summary", "Required")]}
+    results = bulk_create_results(2, 400, json.dumps(response), "https://jira/bulk")
+    assert [result["error"]["errors"] for result in results] == [{"summary": "Required"}] * 2
+
+def test_bulk_create_results_unexpected_response():
+    results = bulk_create_results(2, 500, "Internal error", "https://jira/bulk")
+    assert len(results) == 2
+    assert all(result["error"]["status_code"] == 500 for result in results)
+
+def test_bulk_create_results_fewer_issues():
+    results = bulk_create_results(2, 201, json.dumps({"issues": [{"key": "A-1"}], "errors": []}), "url")
+    assert results[0] == {"key": "A-1"}
+    assert results[1]["error"]["error"] == "Bulk create returned fewer issues than requested"
+
+def test_text_to_adf():
+    document = text_to_adf("Intro\nline two\n\n- a\n* b\n\n1. x\n2) y\n\n```py\ncode\n\n```")
+    assert document["type"] == "doc"
+    paragraph, bullets, ordered, code = document["content"]
+    assert paragraph == {"type": "paragraph", "content": [
+        {"type": "text", "text": "Intro"}, {"type": "hardBreak"}, {"type": "text", "text": "line two"}]}
+    assert bullets["type"] == "bulletList" and len(bullets["content"]) == 2
+    assert ordered["type"] == "orderedList" and len(ordered["content"]) == 2
+    assert bullets["content"][1]["content"][0]["content"] == [{"type": "text", "text": "b"}]
+    assert code == {"type": "codeBlock", "attrs": {"language": "py"}, "content": [{"type": "text", "text": "code\n"}]}
+
+def test_text_to_adf_empty():
+    assert text_to_adf("")["content"] == []
+
+# Task index
+
+def task_text(first: int, count: int) -> str:
+    return "".join(f"PARENT: PARENT-1\nTask {number}\nDescription {number}\n---\n" if number % 3
+                   else f"ID: t{number}\nTask {number}\n---\n" for number in range(first, first + count))
+
+def test_task_index_matches_parser(tmp_path):
+    path = write(tmp_path / "tasks.txt", task_text(0, 50))
+    index = TaskIndex.open(path)
+    tasks = list(iter_tasks(path))
+    assert len(index) == len(tasks) == 50
+    assert [index.summary(number) for number in range(50)] == [task["summary"] for task in tasks]
+    assert index.read(10, 3) == tasks[10:13]
+    assert list(index.iter_tasks(45)) == tasks[45:]
+    assert index.count(TaskIndex.PLACEHOLDER) == sum(1 for task in tasks if task["parent_ref"])
+    assert os.path.exists(TaskIndex.path_for(path))
+
+def test_task_index_rescans_only_the_end(tmp_path):
+    path = write(tmp_path / "tasks.txt", task_text(0, 200))
+    index = TaskIndex(path, block_size=256)
+    assert index.update()
+    index.save()
+    starts = list(index.starts)
+    
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write(task_text(200, 20))
+    size = os.path.getsize(path)
+    scanned = []
+    index = TaskIndex(path, block_size=256)
+    assert index.load()
+    assert index.update(lambda done, total: scanned.append(total))
+    assert len(index) == 220
+    assert list(index.starts[:200]) == starts
+    assert scanned[-1] < size / 4  # Only the tasks from the last unchanged block on were scanned
+    assert [task["summary"] for task in index.read(195, 25)] == [f"Task {number}" for number in range(195, 220)]
+    assert not index.update()
+
+def test_task_index_rescans_after_an_edit(tmp_path):
+    path = write(tmp_path / "tasks.txt", task_text(0, 100))
+    index = TaskIndex(path, block_size=256)
+    index.update()
+    text = task_text(0, 100).replace("Task 50\n", "PROJECT: OPS\nTask fifty\n")
+    write(tmp_path / "tasks.txt", text)
+    os.utime(path, ns=(index.mtime_ns + 10 ** 9, index.mtime_ns + 10 ** 9))
+    assert index.update()
+    assert [index.summary(number) for number in range(len(index))] == [
+        task["summary"] for task in parse_task_lines(text.splitlines())]